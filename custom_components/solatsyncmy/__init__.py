@@ -1,24 +1,27 @@
 """Waktu Solat Malaysia integration for Home Assistant."""
+import filecmp
 import logging
 import os
-import shutil
 import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.helpers import device_registry as dr
-import voluptuous as vol
+from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
     DOMAIN,
     AZAN_FILE_FAJR,
     AZAN_FILE_NORMAL,
-    CONF_MEDIA_PLAYER,
-    CONF_AZAN_VOLUME,
+    CONF_ZONE_TRACKER,
     LOCAL_AUDIO_PATHS,
     SERVICE_PLAY_AZAN,
     SERVICE_TEST_AUDIO,
+    SERVICE_EXPORT_TIMETABLE,
     PRAYER_NAMES,
     CONF_AUDIO_SOURCE,
     AUDIO_SOURCE_BUNDLED,
@@ -27,8 +30,16 @@ from .const import (
     AUDIO_SOURCE_MIXED,
     CONF_REMOTE_FAJR_URL,
     CONF_REMOTE_AZAN_URL,
+    EVENT_AZAN_LATENCY,
+    PLAYBACK_CONFIRM_TIMEOUT,
+    PLAYBACK_LOADING_STATES,
+    PLAYBACK_ERROR_STATES,
+    PLAYBACK_PRIORITY_MANUAL,
+    PLAYBACK_PRIORITY_TEST,
+    AZAN_FADE_START_VOLUME,
 )
-from .coordinator import WaktuSolatCoordinator
+from .coordinator import WaktuSolatCoordinator, timetable_store
+from .telemetry import PlaybackTrace, SetupTimings, async_get_playback_traces
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,24 +50,59 @@ PLATFORMS: list[Platform] = [
 
 # Services are defined in services.yaml for UI integration
 
+# Start of the placeholder files earlier versions wrote for missing bundled audio
+_PLACEHOLDER_PREFIX = b"# Placeholder"
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Waktu Solat Malaysia from a config entry."""
-    # Setup audio files (bundled and detect local)
-    await _setup_audio_files(hass, entry)
+    timings = SetupTimings()
     
     # Create coordinator
     coordinator = WaktuSolatCoordinator(hass, entry)
+    coordinator.setup_timings = timings
     
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Audio files are only needed at the first azan, so they are prepared in the background
+    entry.async_create_background_task(
+        hass,
+        timings.async_measure("audio_setup", _setup_audio_files(hass, entry)),
+        f"{DOMAIN} audio setup {entry.entry_id}",
+    )
+
+    # Bring entities up from the stored timetable (or the bundled pack on a fresh install)
+    # and revalidate it from the API alongside; otherwise wait for the first network refresh
+    with timings.phase("cache_load"):
+        cached = await coordinator.async_load_cache()
+        if not cached:
+            cached = await coordinator.async_load_pack()
+    with timings.phase("first_refresh"):
+        if cached:
+            await coordinator.async_refresh()
+        if not cached or not coordinator.last_update_success:
+            await coordinator.async_config_entry_first_refresh()
+        else:
+            entry.async_create_background_task(
+                hass,
+                timings.async_measure("revalidate", coordinator.async_revalidate_cache()),
+                f"{DOMAIN} revalidate {entry.entry_id}",
+            )
     
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
-    # Setup platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Setup platforms and the location follower concurrently
+    await asyncio.gather(
+        timings.async_measure(
+            "platforms", hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        ),
+        timings.async_measure("zone_tracker", _async_setup_zone_tracker(hass, entry)),
+    )
+
+    # Start the shared scheduler for all tracked zones
+    coordinator.scheduler.async_start()
+    # Reminder entries on the timeline follow the reminder option
+    entry.async_on_unload(entry.add_update_listener(_async_reschedule))
     
     # Register device
     device_registry = dr.async_get(hass)
@@ -71,13 +117,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Register services
     await _register_services(hass)
-
     
+    _LOGGER.info(
+        "🚀 Solat Sync MY ready in %.0f ms (%s)",
+        timings.finish(), "cached timetable" if cached else "network refresh",
+    )
     return True
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Solat Sync MY component."""
+    from .audio_view import AzanAudioView
+
+    # Azan audio is served from where it lives instead of being copied into www/
+    hass.http.register_view(AzanAudioView())
     return True
 
 
@@ -85,24 +138,96 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.scheduler.async_stop()
         
         # Unregister services if this is the last entry
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, SERVICE_PLAY_AZAN)
             hass.services.async_remove(DOMAIN, SERVICE_TEST_AUDIO)
+            hass.services.async_remove(DOMAIN, SERVICE_EXPORT_TIMETABLE)
     
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored timetable of a removed entry."""
+    await timetable_store(hass, entry.entry_id).async_remove()
+
+
+async def _async_setup_zone_tracker(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Re-resolve the entry's zone whenever the configured tracker entity moves."""
+    tracker = None
+
+    async def _async_follow() -> None:
+        """Follow the configured entity, loading the zone locator on first use."""
+        nonlocal tracker
+        if tracker is None:
+            if not entry.options.get(CONF_ZONE_TRACKER):
+                return
+            from .geo import ZoneTracker, async_get_zone_locator
+
+            tracker = ZoneTracker(hass, entry, await async_get_zone_locator(hass))
+            entry.async_on_unload(tracker.async_stop)
+        tracker.async_update_subscription()
+
+    await _async_follow()
+
+    async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Follow a newly selected tracker entity."""
+        await _async_follow()
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+
+async def _async_reschedule(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Rebuild the entry's timeline after an options change."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is not None:
+        coordinator.scheduler.async_rebuild()
+
+
 async def _setup_audio_files(hass: HomeAssistant, entry: ConfigEntry = None) -> None:
     """Set up audio files for azan playback based on audio source configuration."""
+    # Get audio source configuration
+    audio_source = AUDIO_SOURCE_BUNDLED  # Default
+    if entry and entry.options:
+        audio_source = entry.options.get(CONF_AUDIO_SOURCE, AUDIO_SOURCE_BUNDLED)
+
+    # Copying, writing and walking directories block, so they run in the executor
+    await hass.async_add_executor_job(_setup_audio_files_sync, hass, audio_source)
+
+    # Normalized variants of the local files are prepared once and cached by content hash
+    if audio_source != AUDIO_SOURCE_REMOTE:
+        from .audio_variants import async_get_variant_cache
+
+        sources = await hass.async_add_executor_job(_local_audio_sources, hass)
+        await (await async_get_variant_cache(hass)).async_prepare(sources)
+
+
+def _local_audio_sources(hass: HomeAssistant) -> list:
+    """Return the user and bundled azan files that playback may use. Runs in the executor."""
+    from .audio_view import BUNDLED_AUDIO_DIR
+
+    names = [AZAN_FILE_NORMAL, AZAN_FILE_FAJR]
+    for prayer, malay_name in PRAYER_NAMES.items():
+        names += [f"azan_{prayer}.mp3", f"adhan_{prayer}.mp3", f"{malay_name.lower()}.mp3"]
+
+    sources = []
+    for name in dict.fromkeys(names):
+        path = hass.config.path("www", "solatsyncmy", name)
+        if os.path.isfile(path) and os.path.getsize(path) > 1024:
+            sources.append(path)
+    for name in (AZAN_FILE_NORMAL, AZAN_FILE_FAJR):
+        path = os.path.join(BUNDLED_AUDIO_DIR, name)
+        if os.path.isfile(path) and os.path.getsize(path) > 1024:
+            sources.append(path)
+    return sources
+
+
+def _setup_audio_files_sync(hass: HomeAssistant, audio_source: str) -> None:
+    """Copy bundled audio and scan for local files. Runs in the executor."""
     try:
-        # Get audio source configuration
-        audio_source = AUDIO_SOURCE_BUNDLED  # Default
-        if entry and entry.options:
-            audio_source = entry.options.get(CONF_AUDIO_SOURCE, AUDIO_SOURCE_BUNDLED)
-        
         _LOGGER.info("🎵 Setting up audio files with source: %s", audio_source)
         
         # Create www/solatsyncmy directory
@@ -118,40 +243,35 @@ async def _setup_audio_files(hass: HomeAssistant, entry: ConfigEntry = None) ->
             
         elif audio_source == AUDIO_SOURCE_LOCAL_ONLY:
             # Local files only - just scan for existing files
-            await _scan_local_audio_files(hass, audio_dir)
+            _scan_local_audio_files(hass, audio_dir)
             _LOGGER.info("📁 Local-only audio source configured")
             return
             
         elif audio_source in [AUDIO_SOURCE_BUNDLED, AUDIO_SOURCE_MIXED]:
-            # Bundled files (with override) or mixed fallback
-            integration_dir = os.path.dirname(__file__)
-            audio_source_dir = os.path.join(integration_dir, "audio")
+            # Bundled files are served from the integration directory (see audio_view.py);
+            # files of the same name in www/solatsyncmy/ still override them
+            from .audio_view import BUNDLED_AUDIO_DIR
             
-            bundled_files = [AZAN_FILE_NORMAL, AZAN_FILE_FAJR]
             local_files_detected = []
-            
-            for audio_file in bundled_files:
+            for audio_file in [AZAN_FILE_NORMAL, AZAN_FILE_FAJR]:
                 target_path = os.path.join(audio_dir, audio_file)
-                source_path = os.path.join(audio_source_dir, audio_file)
-                
-                # Check if local file already exists (user manually placed)
-                if os.path.exists(target_path):
-                    local_files_detected.append(audio_file)
-                    _LOGGER.info("🎵 Local audio file detected: %s", audio_file)
+                source_path = os.path.join(BUNDLED_AUDIO_DIR, audio_file)
+                if not os.path.exists(target_path):
+                    if not os.path.exists(source_path):
+                        _LOGGER.warning("⚠️  No bundled or local audio file: %s", audio_file)
                     continue
                 
-                # Copy bundled file if available
-                if os.path.exists(source_path):
-                    shutil.copy2(source_path, target_path)
-                    _LOGGER.info("📁 Copied bundled audio file: %s", audio_file)
-                else:
-                    # Create placeholder file
-                    with open(target_path, 'w') as f:
-                        f.write("# Placeholder - Replace with your azan file\n")
-                    _LOGGER.warning("⚠️  Created placeholder for missing audio file: %s", audio_file)
+                # Copies and placeholders written by earlier versions are no longer needed
+                if _is_stale_copy(target_path, source_path):
+                    os.remove(target_path)
+                    _LOGGER.info("🧹 Removed old copy of bundled audio file: %s", audio_file)
+                    continue
+
+                local_files_detected.append(audio_file)
+                _LOGGER.info("🎵 Local audio file detected: %s", audio_file)
             
             # Scan for additional local audio files
-            await _scan_local_audio_files(hass, audio_dir)
+            _scan_local_audio_files(hass, audio_dir)
             
             if local_files_detected:
                 _LOGGER.info("🔊 Audio setup complete! Detected %d custom files", len(local_files_detected))
@@ -160,8 +280,16 @@ async def _setup_audio_files(hass: HomeAssistant, entry: ConfigEntry = None) ->
         _LOGGER.error("Failed to setup audio files: %s", err)
 
 
-async def _scan_local_audio_files(hass: HomeAssistant, audio_dir: str) -> None:
-    """Scan for additional local audio files."""
+def _is_stale_copy(target_path: str, source_path: str) -> bool:
+    """Return True for a placeholder or an unchanged copy of a bundled file. Runs in the executor."""
+    with open(target_path, "rb") as handle:
+        if handle.read(len(_PLACEHOLDER_PREFIX)) == _PLACEHOLDER_PREFIX:
+            return True
+    return os.path.exists(source_path) and filecmp.cmp(target_path, source_path, shallow=False)
+
+
+def _scan_local_audio_files(hass: HomeAssistant, audio_dir: str) -> None:
+    """Scan for additional local audio files. Runs in the executor."""
     try:
         # Check common audio file locations
         audio_extensions = ['.mp3', '.wav', '.m4a', '.ogg']
@@ -215,158 +343,275 @@ async def _scan_local_audio_files(hass: HomeAssistant, audio_dir: str) -> None:
 
 async def _register_services(hass: HomeAssistant) -> None:
     """Register services for the integration."""
+    # The service layer (schemas, export) is only imported once an entry is set up
+    from .services import async_register_services
     
-    def get_config_entry():
-        """Get the first config entry for this integration."""
-        entries = hass.config_entries.async_entries(DOMAIN)
-        return entries[0] if entries else None
-    
-    async def play_azan_service(call: ServiceCall) -> None:
-        """Service to play azan for a specific prayer."""
-        prayer = call.data.get("prayer")
-        media_player = call.data.get("media_player")
-        volume = call.data.get("volume", 0.7)
-        
-        if not prayer:
-            _LOGGER.error("Prayer parameter is required")
-            return
-        
-        if not media_player:
-            _LOGGER.error("Media player parameter is required")
-            return
-        
-        entry = get_config_entry()
-        await _play_azan_file(hass, prayer, media_player, volume, entry)
-    
-    async def test_audio_service(call: ServiceCall) -> None:
-        """Service to test audio playback with detailed diagnostics."""
-        media_player = call.data.get("media_player")
-        audio_file = call.data.get("audio_file", AZAN_FILE_NORMAL)
-        volume = call.data.get("volume", 0.5)
-        
-        if not media_player:
-            _LOGGER.error("Media player parameter is required")
-            return
-        
-        entry = get_config_entry()
-        await _test_audio_playback(hass, media_player, audio_file, volume, entry)
-    
-    # Register services
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_PLAY_AZAN,
-        play_azan_service,
-        schema=vol.Schema({
-            vol.Required("prayer"): str,
-            vol.Required("media_player"): str,
-            vol.Optional("volume", default=0.7): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1.0)),
-        }),
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_TEST_AUDIO,
-        test_audio_service,
-        schema=vol.Schema({
-            vol.Required("media_player"): str,
-            vol.Optional("audio_file", default=AZAN_FILE_NORMAL): str,
-            vol.Optional("volume", default=0.5): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1.0)),
-        }),
-    )
+    async_register_services(hass)
+
 
+async def _get_audio_urls(
+    hass: HomeAssistant,
+    prayer: str,
+    audio_source: str,
+    entry: ConfigEntry = None,
+    media_player: Optional[str] = None,
+    audio_file: Optional[str] = None,
+) -> list:
+    """Get audio URLs based on the configured audio source.
 
-async def _get_audio_urls(hass: HomeAssistant, prayer: str, audio_source: str, entry: ConfigEntry = None) -> list:
-    """Get audio URLs based on the configured audio source."""
+    A routing rule's audio file replaces the source's choice when it can be found.
+    With a target media player, its preferred normalized variant of each local file comes first.
+    """
     audio_urls = []
-    
+
     try:
-        if audio_source == AUDIO_SOURCE_REMOTE:
+        variant = None
+        if media_player and audio_source != AUDIO_SOURCE_REMOTE:
+            from .audio_variants import select_variant
+
+            variant = select_variant(hass, media_player)
+
+        # Finding files and versioning their URLs stats the disk, so it runs in one executor job
+        if audio_file or audio_source != AUDIO_SOURCE_REMOTE:
+            audio_urls = await hass.async_add_executor_job(
+                _get_file_audio_urls, hass, prayer, audio_source, audio_file, variant
+            )
+
+        if not audio_urls and audio_source == AUDIO_SOURCE_REMOTE:
             # Remote URLs from configuration
             if entry and entry.options:
                 if prayer == "fajr":
                     remote_url = entry.options.get(CONF_REMOTE_FAJR_URL, "").strip()
                 else:
                     remote_url = entry.options.get(CONF_REMOTE_AZAN_URL, "").strip()
-                
+
                 if remote_url:
                     audio_urls.append(remote_url)
                     _LOGGER.debug("🌐 Using remote URL: %s", remote_url)
                 else:
                     _LOGGER.warning("⚠️  No remote URL configured for %s", prayer)
-        
-        elif audio_source == AUDIO_SOURCE_LOCAL_ONLY:
-            # Local files only - no bundled fallback
-            audio_urls = await _get_local_audio_urls(hass, prayer)
-            
-        elif audio_source == AUDIO_SOURCE_MIXED:
-            # Local preferred, bundled fallback
-            audio_urls = await _get_local_audio_urls(hass, prayer)
-            if not audio_urls:
-                # Fallback to bundled files
-                audio_urls = await _get_bundled_audio_urls(hass, prayer)
-                
-        else:  # AUDIO_SOURCE_BUNDLED (default)
-            # Bundled with user override
-            audio_urls = await _get_bundled_audio_urls(hass, prayer)
-            
+
     except Exception as err:
         _LOGGER.error("Error getting audio URLs: %s", err)
-    
+
     return audio_urls
 
 
-async def _get_local_audio_urls(hass: HomeAssistant, prayer: str) -> list:
-    """Get local audio file URLs."""
+def _get_file_audio_urls(
+    hass: HomeAssistant, prayer: str, audio_source: str, audio_file: Optional[str], variant: Optional[str]
+) -> list:
+    """Get the URLs of a routed or local azan file, preceded by its cached copies. Runs in the executor."""
+    audio_urls = _get_routed_audio_urls(hass, audio_file) if audio_file else []
+
+    if audio_urls:
+        _LOGGER.debug("🧭 Using routed audio file: %s", audio_file)
+    elif audio_source == AUDIO_SOURCE_LOCAL_ONLY:
+        # Local files only - no bundled fallback
+        audio_urls = _get_local_audio_urls(hass, prayer)
+    elif audio_source == AUDIO_SOURCE_MIXED:
+        # Local preferred, bundled fallback
+        audio_urls = _get_local_audio_urls(hass, prayer) or _get_bundled_audio_urls(hass, prayer)
+    elif audio_source != AUDIO_SOURCE_REMOTE:  # AUDIO_SOURCE_BUNDLED (default)
+        # Bundled with user override
+        audio_urls = _get_bundled_audio_urls(hass, prayer)
+
+    if variant is not None:
+        from .audio_variants import apply_variants
+
+        audio_urls = apply_variants(hass, audio_urls, variant)
+    return audio_urls
+
+
+def _get_routed_audio_urls(hass: HomeAssistant, audio_file: str) -> list:
+    """Get the URL of a routing rule's audio file: a user file, a bundled file or a URL.
+
+    URLs served by the integration (e.g. rendered reminders) are used as they are.
+    Runs in the executor.
+    """
+    from .audio_view import BUNDLED_AUDIO_DIR, audio_path, audio_url
+
+    if audio_file.startswith(("http://", "https://")) or audio_path(hass, audio_file) is not None:
+        return [audio_file]
+    for directory in (hass.config.path("www", "solatsyncmy"), BUNDLED_AUDIO_DIR):
+        path = os.path.join(directory, audio_file)
+        if os.path.isfile(path) and (url := audio_url(hass, path)) is not None:
+            return [url]
+    _LOGGER.warning("⚠️  Routed audio file %s not found, using the configured audio source", audio_file)
+    return []
+
+
+def _get_local_audio_urls(hass: HomeAssistant, prayer: str) -> list:
+    """Get local audio file URLs. Runs in the executor."""
+    from .audio_view import audio_url
+
     audio_urls = []
-    
+
     # Check if user has custom named files first
     custom_files = [
         f"azan_{prayer}.mp3",
-        f"adhan_{prayer}.mp3", 
+        f"adhan_{prayer}.mp3",
         f"{PRAYER_NAMES.get(prayer, prayer).lower()}.mp3"
     ]
-    
+
     for custom_file in custom_files:
         custom_path = hass.config.path("www", "solatsyncmy", custom_file)
         if os.path.exists(custom_path) and os.path.getsize(custom_path) > 1024:
-            audio_urls.append(f"/local/solatsyncmy/{custom_file}")
-            _LOGGER.debug("✅ Found custom audio file: %s", custom_path)
-            break
-    
+            # None if the file disappeared since the check
+            if (url := audio_url(hass, custom_path)) is not None:
+                audio_urls.append(url)
+                _LOGGER.debug("✅ Found custom audio file: %s", custom_path)
+                break
+
     return audio_urls
 
 
-async def _get_bundled_audio_urls(hass: HomeAssistant, prayer: str) -> list:
-    """Get bundled audio file URLs (with user override)."""
+def _get_bundled_audio_urls(hass: HomeAssistant, prayer: str) -> list:
+    """Get bundled audio file URLs (with user override). Runs in the executor."""
+    from .audio_view import BUNDLED_AUDIO_DIR, audio_url
+
     audio_urls = []
-    
+
     # Determine which azan file to use
     audio_file = AZAN_FILE_FAJR if prayer == "fajr" else AZAN_FILE_NORMAL
-    
+
     # 1. Check for user override first
     user_override_path = hass.config.path("www", "solatsyncmy", audio_file)
     if os.path.exists(user_override_path) and os.path.getsize(user_override_path) > 1024:
-        audio_urls.append(f"/local/solatsyncmy/{audio_file}")
-        _LOGGER.debug("✅ Found user override file: %s", user_override_path)
-    
+        if (url := audio_url(hass, user_override_path)) is not None:
+            audio_urls.append(url)
+            _LOGGER.debug("✅ Found user override file: %s", user_override_path)
+
     # 2. Check if user has custom named files
     if not audio_urls:
-        local_urls = await _get_local_audio_urls(hass, prayer)
-        audio_urls.extend(local_urls)
-    
-    # 3. Fallback to standard bundled file location
+        audio_urls.extend(_get_local_audio_urls(hass, prayer))
+
+    # 3. Fallback to the file bundled with the integration
     if not audio_urls:
-        www_path = f"/local/solatsyncmy/{audio_file}"
-        local_file_path = hass.config.path("www", "solatsyncmy", audio_file)
-        if os.path.exists(local_file_path):
-            audio_urls.append(www_path)
-            _LOGGER.debug("✅ Found bundled audio file: %s", local_file_path)
-    
+        bundled_path = os.path.join(BUNDLED_AUDIO_DIR, audio_file)
+        if os.path.exists(bundled_path) and (url := audio_url(hass, bundled_path)) is not None:
+            audio_urls.append(url)
+            _LOGGER.debug("✅ Found bundled audio file: %s", bundled_path)
+
     return audio_urls
 
 
-async def _play_azan_file(hass: HomeAssistant, prayer: str, media_player: str, volume: float, entry: ConfigEntry = None) -> None:
-    """Play azan file with enhanced error handling and multiple audio source support."""
+def _is_playing(state: Optional[State], url: Optional[str]) -> bool:
+    """Return True if a state shows the URL playing (or playing something, if it reports no content)."""
+    if state is None or state.state != "playing":
+        return False
+    content_id = state.attributes.get("media_content_id")
+    return not (url and content_id) or url in content_id or content_id in url
+
+
+async def _async_wait_for_playing(
+    hass: HomeAssistant,
+    media_player: str,
+    timeout: float,
+    url: Optional[str] = None,
+    dispatch: Optional[Callable[[], Awaitable[None]]] = None,
+) -> bool:
+    """Wait until a media player reports playing, returning as soon as it does.
+
+    With a URL, music that was already playing does not count. A dispatch
+    coroutine (the play_media call) runs after the listener is attached, within
+    the timeout. Gives up early when the player drops from loading to an error
+    state, i.e. it rejected the URL.
+    """
+    playing = hass.loop.create_future()
+
+    @callback
+    def _state_changed(event: Event) -> None:
+        new_state = event.data.get("new_state")
+        old_state = event.data.get("old_state")
+        if playing.done() or new_state is None:
+            return
+        if _is_playing(new_state, url):
+            playing.set_result(True)
+        elif new_state.state == "unavailable" or (
+            new_state.state in PLAYBACK_ERROR_STATES
+            and old_state is not None and old_state.state in PLAYBACK_LOADING_STATES
+        ):
+            _LOGGER.debug("📉 %s went %s while loading", media_player, new_state.state)
+            playing.set_result(False)
+
+    unsub = async_track_state_change_event(hass, [media_player], _state_changed)
+    try:
+        async with asyncio.timeout(timeout):
+            if dispatch is not None:
+                await dispatch()
+            if not playing.done() and _is_playing(hass.states.get(media_player), url):
+                return True
+            return await playing
+    except TimeoutError:
+        return False
+    finally:
+        unsub()
+
+
+@callback
+def _async_report_latency(hass: HomeAssistant, trace: PlaybackTrace) -> None:
+    """Add a scheduled playback's latencies to the entry statistics and fire an event."""
+    coordinator = hass.data.get(DOMAIN, {}).get(trace.entry_id)
+    if coordinator is not None:
+        coordinator.azan_latency.record(trace)
+
+    hass.bus.async_fire(
+        EVENT_AZAN_LATENCY,
+        {
+            "entry_id": trace.entry_id,
+            "prayer": trace.prayer,
+            "media_player": trace.media_player,
+            "scheduled": trace.scheduled.isoformat(),
+            "result": trace.result,
+            **{f"{stage}_ms": latency for stage, latency in trace.latency_ms.items()},
+        },
+    )
+    if "playing" in trace.latency_ms:
+        _LOGGER.info(
+            "⏱️ %s azan audible %.0f ms after prayer time",
+            PRAYER_NAMES.get(trace.prayer, trace.prayer), trace.latency_ms["playing"],
+        )
+
+
+async def _async_prevalidate_audio(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Check the candidate URLs of every routed media player ahead of prayer time."""
+    from .audio_candidates import async_get_candidate_ranker
+
+    audio_source = entry.options.get(CONF_AUDIO_SOURCE, AUDIO_SOURCE_BUNDLED)
+    targets = {
+        (media_player, route.audio_file)
+        for route in hass.data[DOMAIN][entry.entry_id].routing.routes
+        for media_player in route.media_players
+    }
+    urls = []
+    for media_player, audio_file in targets:
+        # Fajr has its own file and every other prayer shares one, unless a rule names the file
+        for prayer in ("fajr", "dhuhr") if audio_file is None else ("dhuhr",):
+            urls.extend(await _get_audio_urls(hass, prayer, audio_source, entry, media_player, audio_file))
+    ranker = await async_get_candidate_ranker(hass)
+    await ranker.async_validate(urls)
+
+
+async def _play_azan_file(
+    hass: HomeAssistant,
+    prayer: str,
+    media_player: str,
+    volume: float,
+    entry: ConfigEntry = None,
+    scheduled: Optional[datetime] = None,
+    fired: Optional[datetime] = None,
+    audio_file: Optional[str] = None,
+    fade_in: float = 0,
+) -> PlaybackTrace:
+    """Play azan file with enhanced error handling and multiple audio source support.
+
+    Scheduled playbacks pass the prayer time and timer fire time for latency telemetry,
+    and routed playbacks the audio file and fade-in time of their routing rule.
+    Returns the playback's trace; its result is "playing" once the azan is audible.
+    """
+    # Per-stage timings are kept for diagnostics
+    trace = PlaybackTrace(prayer, media_player, entry.entry_id if entry else None, scheduled, fired)
+    async_get_playback_traces(hass).append(trace)
     try:
         _LOGGER.info("🕌 Playing %s azan on %s (volume: %.1f)", PRAYER_NAMES.get(prayer, prayer), media_player, volume)
         
@@ -374,72 +619,195 @@ async def _play_azan_file(hass: HomeAssistant, prayer: str, media_player: str, v
         state = hass.states.get(media_player)
         if not state:
             _LOGGER.error("❌ Media player not found: %s", media_player)
-            return
+            trace.finish("media_player_not_found")
+            return trace
+
+        # Probed once per player; unsupported steps are skipped below
+        from .capabilities import async_get_capabilities
+
+        capabilities = async_get_capabilities(hass).get(media_player)
+        if not capabilities.can_play_media:
+            _LOGGER.error("❌ Media player %s cannot play media", media_player)
+            trace.finish("play_media_unsupported")
+            return trace
         
         # Get audio source configuration
         audio_source = AUDIO_SOURCE_BUNDLED  # Default
         if entry and entry.options:
             audio_source = entry.options.get(CONF_AUDIO_SOURCE, AUDIO_SOURCE_BUNDLED)
+        trace.audio_source = audio_source
         
         # Get audio URLs based on source configuration
-        audio_urls = await _get_audio_urls(hass, prayer, audio_source, entry)
+        audio_urls = await _get_audio_urls(hass, prayer, audio_source, entry, media_player, audio_file)
+        trace.mark("urls_resolved")
         
         if not audio_urls:
             _LOGGER.error("❌ No audio source found for %s with source: %s", prayer, audio_source)
-            return
+            trace.finish("no_audio_source")
+            return trace
+
+        # Formats the player's integration cannot decode are dropped, unless nothing else is left
+        compatible_urls = [url for url in audio_urls if capabilities.accepts(url)]
+        if compatible_urls:
+            audio_urls = compatible_urls
         
         # Get current media player state
         current_state = state.state
         _LOGGER.debug("📱 Media player %s current state: %s", media_player, current_state)
         
         # Step 1: Turn on media player if it's off
-        if current_state in ["off", "standby"]:
+        if current_state in ["off", "standby"] and capabilities.can_turn_on:
             _LOGGER.info("🔌 Turning on media player...")
             await hass.services.async_call(
                 "media_player", "turn_on", {"entity_id": media_player}
             )
             await asyncio.sleep(3)  # Wait for power on
+            trace.mark("turned_on")
         
-        # Step 2: Set volume
-        _LOGGER.info("🔊 Setting volume to %.1f", volume)
-        await hass.services.async_call(
-            "media_player",
-            "volume_set",
-            {"entity_id": media_player, "volume_level": volume}
-        )
-        await asyncio.sleep(1)  # Wait for volume change
+        # Step 2: Set volume; a fade-in starts low and ramps up once the azan is audible
+        fade = bool(fade_in) and capabilities.can_set_volume and volume > AZAN_FADE_START_VOLUME
+        initial_volume = AZAN_FADE_START_VOLUME if fade else volume
+        if capabilities.can_set_volume:
+            _LOGGER.info("🔊 Setting volume to %.1f", initial_volume)
+            await hass.services.async_call(
+                "media_player",
+                "volume_set",
+                {"entity_id": media_player, "volume_level": initial_volume}
+            )
+            await asyncio.sleep(1)  # Wait for volume change
+            trace.mark("volume_set")
+        else:
+            _LOGGER.debug("🔇 %s has no volume control; playing at its current level", media_player)
         
-        # Step 3: Play audio file (try each URL until one works)
-        for audio_url in audio_urls:
+        # Step 3: Play audio file, trying candidates in order of expected start time
+        from .audio_candidates import async_get_candidate_ranker
+
+        ranker = await async_get_candidate_ranker(hass)
+        for audio_url in ranker.rank(audio_urls):
+            attempt_start = time.monotonic()
             try:
                 _LOGGER.info("▶️  Attempting to play: %s", audio_url)
-                await hass.services.async_call(
-                    "media_player",
-                    "play_media",
-                    {
-                        "entity_id": media_player,
-                        "media_content_id": audio_url,
-                        "media_content_type": "music",
-                    }
-                )
+                trace.url = audio_url
                 
-                # Wait and check if playback started
-                await asyncio.sleep(2)
-                new_state = hass.states.get(media_player)
-                if new_state and new_state.state == "playing":
+                async def _dispatch(url: str = audio_url) -> None:
+                    # Blocking, so a player that rejects the URL fails here instead of after the timeout
+                    await hass.services.async_call(
+                        "media_player",
+                        "play_media",
+                        {
+                            "entity_id": media_player,
+                            "media_content_id": url,
+                            "media_content_type": capabilities.content_type(url),
+                        },
+                        blocking=True,
+                    )
+                    trace.mark("dispatched")
+
+                # Wait and check if playback started, moving on as soon as the player reports an error
+                if await _async_wait_for_playing(
+                    hass, media_player, PLAYBACK_CONFIRM_TIMEOUT, audio_url, _dispatch
+                ):
                     _LOGGER.info("🎵 SUCCESS! Audio is playing")
-                    return
+                    ranker.record(audio_url, True, (time.monotonic() - attempt_start) * 1000)
+                    trace.mark("playing")
+                    if fade:
+                        from .fade import async_get_fader
+
+                        async_get_fader(hass).start(media_player, initial_volume, volume, fade_in)
+                    trace.finish("playing")
+                    return trace
                 else:
                     _LOGGER.warning("⚠️  Media player not in playing state after command")
                     
             except Exception as err:
                 _LOGGER.warning("❌ Failed to play %s: %s", audio_url, err)
-                continue
+
+            ranker.record(audio_url, False)
         
         _LOGGER.error("❌ All audio URLs failed to play")
+        trace.finish("not_playing")
         
+    except asyncio.CancelledError:
+        # Interrupted by a higher-priority azan on the same player
+        trace.finish("superseded")
+        raise
+
     except Exception as err:
         _LOGGER.error("❌ Error playing azan: %s", err)
+        trace.finish(f"error: {err}")
+
+    finally:
+        if scheduled is not None:
+            _async_report_latency(hass, trace)
+
+    return trace
+
+
+async def _async_play_and_restore(
+    hass: HomeAssistant,
+    prayer: str,
+    media_player: str,
+    volume: float,
+    entry: ConfigEntry = None,
+    scheduled: Optional[datetime] = None,
+    fired: Optional[datetime] = None,
+    audio_file: Optional[str] = None,
+    fade_in: float = 0,
+) -> None:
+    """Play azan, wait for it to finish and restore what the media player was doing."""
+    from .fade import async_get_fader
+    from .media_state import async_get_media_state
+    from .playback import async_get_arbiter
+
+    media_state = async_get_media_state(hass)
+    media_state.capture(media_player)
+    try:
+        trace = await _play_azan_file(
+            hass, prayer, media_player, volume, entry, scheduled, fired, audio_file, fade_in
+        )
+        if trace.result == "playing":
+            completion = await media_state.async_wait_for_completion(media_player, trace.url)
+            trace.mark("completed")
+            _LOGGER.debug("🏁 Azan on %s finished (%s)", media_player, completion)
+    finally:
+        # A ramp still running must not override the next azan or the restored volume
+        async_get_fader(hass).cancel(media_player)
+
+    # The next queued azan reuses the snapshot, so restore only after the last one
+    if async_get_arbiter(hass).queue_depth(media_player) > 1:
+        return
+    if await media_state.async_restore(media_player) is not None:
+        trace.mark("restored")
+
+
+async def _async_queue_azan(
+    hass: HomeAssistant,
+    prayer: str,
+    media_player: str,
+    volume: float,
+    entry: ConfigEntry = None,
+    scheduled: Optional[datetime] = None,
+    fired: Optional[datetime] = None,
+    priority: int = PLAYBACK_PRIORITY_MANUAL,
+    audio_file: Optional[str] = None,
+    fade_in: float = 0,
+) -> bool:
+    """Play azan through the media player's playback queue.
+
+    Identical requests (same prayer, prayer time and priority) share one playback.
+    Returns False if the playback was superseded or failed.
+    """
+    from .playback import async_get_arbiter
+
+    key = (prayer, scheduled.isoformat() if scheduled else None)
+    return await async_get_arbiter(hass).async_play(
+        media_player,
+        key,
+        priority,
+        lambda: _async_play_and_restore(
+            hass, prayer, media_player, volume, entry, scheduled, fired, audio_file, fade_in
+        ),
+    )
 
 
 async def _test_audio_playback(hass: HomeAssistant, media_player: str, audio_file: str, volume: float, entry: ConfigEntry = None) -> None:
@@ -456,8 +824,12 @@ async def _test_audio_playback(hass: HomeAssistant, media_player: str, audio_fil
         
         _LOGGER.info("✅ Media player found: %s (state: %s)", media_player, state.state)
         
-        # Step 2: Check audio file exists
+        # Step 2: Check audio file exists (user file, else bundled)
+        from .audio_view import BUNDLED_AUDIO_DIR
+
         local_file_path = hass.config.path("www", "solatsyncmy", audio_file)
+        if not os.path.exists(local_file_path):
+            local_file_path = os.path.join(BUNDLED_AUDIO_DIR, audio_file)
         if not os.path.exists(local_file_path):
             _LOGGER.error("❌ TEST FAILED: Audio file not found: %s", local_file_path)
             return
@@ -469,7 +841,7 @@ async def _test_audio_playback(hass: HomeAssistant, media_player: str, audio_fil
             _LOGGER.warning("⚠️  Audio file seems too small (%.1f KB) - might be placeholder", file_size/1024)
         
         # Step 3: Test playback
-        await _play_azan_file(hass, "test", media_player, volume, entry)
+        await _async_queue_azan(hass, "test", media_player, volume, entry, priority=PLAYBACK_PRIORITY_TEST)
         
         _LOGGER.info("🏁 AUDIO TEST COMPLETED")
         
@@ -0,0 +1,155 @@
+"""Pre-validation and ranking of azan audio URLs.
+
+Before prayer time the configured player's candidate URLs (variants,
+prepared copies, originals or remote URLs) are checked: files served by
+the integration on disk, remote URLs with a HEAD request over Home
+Assistant's shared HTTP session. Every playback attempt records whether the URL started and how
+long it took, and candidates are tried in order of expected time to
+audible azan, so a URL that keeps failing stops costing a confirmation
+timeout at prayer time.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .audio_view import audio_path
+from .const import (
+    DOMAIN,
+    DATA_AUDIO_CANDIDATES,
+    AUDIO_CANDIDATES_STORAGE_VERSION,
+    AUDIO_VALIDATION_TIMEOUT,
+    AUDIO_LATENCY_SMOOTHING,
+    PLAYBACK_CONFIRM_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Start latency assumed for a URL that has never played, in ms
+_UNTRIED_LATENCY_MS = PLAYBACK_CONFIRM_TIMEOUT * 500
+# Statuses of servers that do not implement HEAD; the URL may still play
+_HEAD_UNSUPPORTED = (405, 501)
+
+
+class AudioCandidateRanker:
+    """Playback history and validation results of audio URLs."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize with no history."""
+        self.hass = hass
+        self._store = Store(hass, AUDIO_CANDIDATES_STORAGE_VERSION, f"{DOMAIN}.audio_candidates")
+        # URL -> {"successes", "failures", "latency_ms", "valid", "checked"}
+        self._urls: Dict[str, Dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored history."""
+        self._urls = (await self._store.async_load() or {}).get("urls", {})
+
+    def _entry(self, url: str) -> Dict[str, Any]:
+        """Return a URL's record, creating it on first use."""
+        return self._urls.setdefault(
+            url, {"successes": 0, "failures": 0, "latency_ms": None, "valid": None, "checked": None}
+        )
+
+    def _save(self) -> None:
+        """Persist the history shortly, batching bursts of updates."""
+        self._store.async_delay_save(lambda: {"urls": self._urls}, 10)
+
+    def expected_ms(self, url: str) -> float:
+        """Return the expected time until a URL is audible, counting a failed attempt as a timeout."""
+        entry = self._urls.get(url)
+        if entry is None:
+            return 0.5 * _UNTRIED_LATENCY_MS + 0.5 * PLAYBACK_CONFIRM_TIMEOUT * 1000
+        # Laplace-smoothed success rate keeps one early result from dominating
+        rate = (entry["successes"] + 1) / (entry["successes"] + entry["failures"] + 2)
+        latency = entry["latency_ms"] if entry["latency_ms"] is not None else _UNTRIED_LATENCY_MS
+        return rate * latency + (1 - rate) * PLAYBACK_CONFIRM_TIMEOUT * 1000
+
+    def rank(self, urls: List[str]) -> List[str]:
+        """Order candidates by expected start time; URLs that failed validation go last.
+
+        Ties keep the resolver's order (variant, prepared copy, original).
+        """
+        return sorted(
+            urls, key=lambda url: (self._urls.get(url, {}).get("valid") is False, self.expected_ms(url))
+        )
+
+    def record(self, url: str, started: bool, latency_ms: Optional[float] = None) -> None:
+        """Record the outcome of one playback attempt."""
+        entry = self._entry(url)
+        if started:
+            entry["successes"] += 1
+            entry["valid"] = True
+            if latency_ms is not None:
+                previous = entry["latency_ms"]
+                entry["latency_ms"] = round(
+                    latency_ms if previous is None
+                    else AUDIO_LATENCY_SMOOTHING * latency_ms + (1 - AUDIO_LATENCY_SMOOTHING) * previous,
+                    1,
+                )
+        else:
+            entry["failures"] += 1
+        self._save()
+
+    async def async_validate(self, urls: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Check that candidates are reachable; None means it could not be told."""
+        pending = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self._async_check(url) for url in pending))
+        checked = time.time()
+        for url, valid in zip(pending, results):
+            entry = self._entry(url)
+            entry["valid"] = valid
+            entry["checked"] = checked
+            if valid is False:
+                _LOGGER.warning("⚠️ Azan audio URL is unreachable and will be tried last: %s", _describe(url))
+        self._save()
+        return dict(zip(pending, results))
+
+    async def _async_check(self, url: str) -> Optional[bool]:
+        """Check one URL."""
+        path = audio_path(self.hass, url)
+        if path is not None:
+            return await self.hass.async_add_executor_job(os.path.isfile, path)
+        if not url.startswith(("http://", "https://")):
+            return None
+
+        import aiohttp
+        from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+        session = async_get_clientsession(self.hass)
+        try:
+            async with asyncio.timeout(AUDIO_VALIDATION_TIMEOUT):
+                async with session.head(url, allow_redirects=True) as response:
+                    if response.status in _HEAD_UNSUPPORTED:
+                        return None
+                    return response.status < 400
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("HEAD %s failed: %s", _describe(url), err)
+            return False
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return every URL's record with its expected start time, for diagnostics."""
+        return [
+            {"url": url, **entry, "expected_ms": round(self.expected_ms(url), 1)}
+            for url, entry in sorted(self._urls.items())
+        ]
+
+
+def _describe(url: str) -> str:
+    """Return a URL for logs without query strings that may hold tokens."""
+    return url.split("?", 1)[0]
+
+
+async def async_get_candidate_ranker(hass: HomeAssistant) -> AudioCandidateRanker:
+    """Return the shared ranker, loading its history on first use."""
+    ranker = hass.data.get(DATA_AUDIO_CANDIDATES)
+    if ranker is None:
+        ranker = AudioCandidateRanker(hass)
+        await ranker.async_load()
+        # Another caller may have loaded it while this one waited
+        ranker = hass.data.setdefault(DATA_AUDIO_CANDIDATES, ranker)
+    return ranker
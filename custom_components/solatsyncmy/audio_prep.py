@@ -0,0 +1,197 @@
+"""Leading-silence trimming and fast-start preparation of azan files.
+
+A prepared copy of each original is cached by content hash next to the
+audio variants (www/solatsyncmy/variants/<hash>.prepared.mp3) with leading
+silence cut and the container laid out so playback can start from the
+first bytes: embedded tags and cover art are dropped and MP4 indexes are
+moved to the front. ffmpeg is used when available; without it, 16-bit PCM
+WAV files are trimmed and MP3 ID3v2 tags are stripped in Python. Both
+write through a .partial file, so an interrupted run never leaves a
+truncated copy behind.
+"""
+import asyncio
+import logging
+import os
+import re
+import wave
+from array import array
+from typing import NamedTuple, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    AUDIO_SILENCE_THRESHOLD_DB,
+    AUDIO_SILENCE_PAD_MS,
+    AUDIO_TRANSCODE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PREPARED_SUFFIX = ".prepared"
+
+# ffmpeg muxer per extension (stream copy keeps the codec)
+_FORMATS = {".mp3": "mp3", ".m4a": "ipod", ".mp4": "mp4", ".aac": "adts", ".ogg": "ogg", ".flac": "flac", ".wav": "wav"}
+_SILENCE_END = re.compile(r"silence_end: ([\d.]+)")
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+
+
+class PreparedAudio(NamedTuple):
+    """Outcome of preparing one file."""
+
+    path: str
+    silence_ms: int  # Leading silence removed
+    header_bytes: int  # Tag/cover art bytes no longer sent before the audio
+
+    def as_dict(self) -> dict:
+        """Return the result for diagnostics and storage."""
+        return {"prepared": os.path.basename(self.path), "saved_ms": self.silence_ms, "header_bytes": self.header_bytes}
+
+
+def prepared_path(directory: str, digest: str, source: str) -> str:
+    """Return where the prepared copy of a file with the given content hash is stored."""
+    return os.path.join(directory, f"{digest}{PREPARED_SUFFIX}{os.path.splitext(source)[1].lower()}")
+
+
+def _id3v2_size(header: bytes) -> int:
+    """Return the size of an ID3v2 tag at the start of a file, or 0."""
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _leading_silence_frames(samples: array, channels: int, threshold: int) -> int:
+    """Return the number of leading frames whose samples stay under the threshold."""
+    for index, sample in enumerate(samples):
+        if sample > threshold or sample < -threshold:
+            return index // channels
+    return len(samples) // channels
+
+
+def _trim_wav(source: str, target: str) -> Optional[int]:
+    """Copy a 16-bit PCM WAV without its leading silence. Returns the ms removed."""
+    with wave.open(source, "rb") as reader:
+        if reader.getsampwidth() != 2:
+            return None
+        params = reader.getparams()
+        frames = reader.readframes(reader.getnframes())
+    samples = array("h", frames)
+    threshold = int(32767 * 10 ** (AUDIO_SILENCE_THRESHOLD_DB / 20))
+    silent = _leading_silence_frames(samples, params.nchannels, threshold)
+    keep_from = max(0, silent - params.framerate * AUDIO_SILENCE_PAD_MS // 1000)
+    with wave.open(target, "wb") as writer:
+        writer.setparams(params)
+        writer.writeframes(frames[keep_from * params.nchannels * 2:])
+    return keep_from * 1000 // params.framerate
+
+
+def remove_quietly(path: str) -> None:
+    """Remove a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _strip_id3(source: str, target: str, tag_size: int) -> None:
+    """Copy an MP3 without its leading ID3v2 tag."""
+    with open(source, "rb") as handle:
+        handle.seek(tag_size)
+        audio = handle.read()
+    with open(target, "wb") as handle:
+        handle.write(audio)
+
+
+def prepare_without_ffmpeg(source: str, target: str) -> Optional[PreparedAudio]:
+    """Prepare a file in Python, writing through a temporary file. Runs in the executor."""
+    with open(source, "rb") as handle:
+        header = handle.read(12)
+    is_wav = header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+    tag_size = 0 if is_wav else _id3v2_size(header[:10])
+    if not is_wav and not tag_size:
+        return None
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    partial = f"{target}.partial"
+    try:
+        if is_wav:
+            silence_ms = _trim_wav(source, partial)
+            if silence_ms is None:
+                return None
+        else:
+            _strip_id3(source, partial, tag_size)
+            silence_ms = 0
+    except (wave.Error, EOFError) as err:
+        _LOGGER.debug("Cannot trim %s: %s", source, err)
+        remove_quietly(partial)
+        return None
+    except OSError:
+        remove_quietly(partial)
+        raise
+    os.replace(partial, target)
+    return PreparedAudio(target, silence_ms, tag_size)
+
+
+async def _async_run(ffmpeg: str, *args: str) -> Tuple[int, str]:
+    """Run ffmpeg and return its exit code and stderr."""
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg, "-nostdin", "-hide_banner", *args,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        async with asyncio.timeout(AUDIO_TRANSCODE_TIMEOUT):
+            _, stderr = await process.communicate()
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+        return -1, "timed out"
+    return process.returncode, stderr.decode(errors="replace")
+
+
+async def async_detect_leading_silence(ffmpeg: str, source: str) -> float:
+    """Return the seconds of silence at the start of a file."""
+    code, output = await _async_run(
+        ffmpeg, "-i", source, "-map", "0:a:0",
+        "-af", f"silencedetect=noise={AUDIO_SILENCE_THRESHOLD_DB}dB:d=0.1", "-f", "null", "-",
+    )
+    start = _SILENCE_START.search(output)
+    end = _SILENCE_END.search(output)
+    if code != 0 or not start or not end or float(start.group(1)) > 0.01:
+        return 0.0
+    return float(end.group(1))
+
+
+def read_header_bytes(source: str) -> int:
+    """Return the size of a leading ID3v2 tag. Runs in the executor."""
+    with open(source, "rb") as handle:
+        return _id3v2_size(handle.read(10))
+
+
+async def async_prepare_with_ffmpeg(
+    hass: HomeAssistant, ffmpeg: str, source: str, target: str, header_bytes: int
+) -> Optional[PreparedAudio]:
+    """Trim leading silence and rewrite the container for fast start, without re-encoding."""
+    extension = os.path.splitext(source)[1].lower()
+    muxer = _FORMATS.get(extension)
+    if muxer is None:
+        return None
+    silence = await async_detect_leading_silence(ffmpeg, source)
+    trim = max(0.0, silence - AUDIO_SILENCE_PAD_MS / 1000)
+    await hass.async_add_executor_job(lambda: os.makedirs(os.path.dirname(target), exist_ok=True))
+    partial = f"{target}.partial"
+    args = ["-loglevel", "error", "-y"]
+    if trim:
+        args += ["-ss", f"{trim:.3f}"]
+    args += ["-i", source, "-map", "0:a:0", "-map_metadata", "-1", "-c:a", "copy"]
+    if muxer in ("mp4", "ipod"):
+        args += ["-movflags", "+faststart"]
+    code, output = await _async_run(ffmpeg, *args, "-f", muxer, partial)
+    if code != 0:
+        _LOGGER.warning("⚠️ Could not prepare %s for fast start: %s", os.path.basename(source), output.strip())
+        await hass.async_add_executor_job(remove_quietly, partial)
+        return None
+    await hass.async_add_executor_job(os.replace, partial, target)
+    return PreparedAudio(target, round(trim * 1000), header_bytes)
@@ -0,0 +1,249 @@
+"""Loudness-normalized audio variants for Waktu Solat Malaysia.
+
+Each local azan file is first prepared (leading silence trimmed, fast-start
+layout; see audio_prep.py), then transcoded once per variant with ffmpeg
+(when it is installed). Both are cached under www/solatsyncmy/variants/ by
+content hash and served as /api/solatsyncmy/audio/cache/, so an edited file
+gets new copies and unchanged files are never re-encoded. Playback prefers
+the variant suited to the target media player, then the prepared copy, and
+keeps the original file as a fallback.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .audio_view import audio_path, audio_url
+from .audio_prep import (
+    PreparedAudio,
+    remove_quietly,
+    async_prepare_with_ffmpeg,
+    prepare_without_ffmpeg,
+    prepared_path,
+    read_header_bytes,
+)
+from .const import (
+    DOMAIN,
+    DATA_AUDIO_VARIANTS,
+    AUDIO_PREPARATION_STORAGE_VERSION,
+    AUDIO_VARIANTS,
+    AUDIO_VARIANTS_DIR,
+    AUDIO_VARIANT_DEFAULT,
+    AUDIO_PIPELINE_VERSION,
+    AUDIO_LOUDNESS_FILTER,
+    AUDIO_TRANSCODE_CONCURRENCY,
+    AUDIO_TRANSCODE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def _file_digest(path: str) -> Tuple[float, int, str]:
+    """Return a file's mtime, size and content hash. Runs in the executor."""
+    stat = os.stat(path)
+    digest = hashlib.sha256(f"v{AUDIO_PIPELINE_VERSION}:".encode())
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return stat.st_mtime, stat.st_size, digest.hexdigest()[:16]
+
+
+def select_variant(hass: HomeAssistant, media_player: Optional[str]) -> str:
+    """Return the variant best suited to a media player's integration and formats."""
+    if media_player:
+        from .capabilities import async_get_capabilities
+
+        return async_get_capabilities(hass).get(media_player).variant
+    return AUDIO_VARIANT_DEFAULT
+
+
+class AudioVariantCache:
+    """Content-addressed cache of transcoded azan files."""
+
+    def __init__(self, hass: HomeAssistant, ffmpeg: Optional[str]) -> None:
+        """Initialize the cache; without ffmpeg only existing variants are used."""
+        self.hass = hass
+        self.ffmpeg = ffmpeg
+        self.directory = hass.config.path(*AUDIO_VARIANTS_DIR)
+        # Source path -> (mtime, size, digest), so unchanged files are not re-hashed
+        self._digests: Dict[str, Tuple[float, int, str]] = {}
+        # (source path, variant) -> variant path
+        self._variants: Dict[Tuple[str, str], str] = {}
+        # Source path -> prepared copy; preparation results are kept per content hash
+        self.prepared: Dict[str, PreparedAudio] = {}
+        self._store = Store(hass, AUDIO_PREPARATION_STORAGE_VERSION, f"{DOMAIN}.audio_preparation")
+        self._preparation: Optional[Dict[str, Dict[str, Any]]] = None
+        self._semaphore = asyncio.Semaphore(AUDIO_TRANSCODE_CONCURRENCY)
+        self.stats = {"transcoded": 0, "cached": 0, "failed": 0}
+
+    def target_path(self, digest: str, variant: str) -> str:
+        """Return where a source's variant is cached."""
+        return os.path.join(self.directory, f"{digest}-{variant}.{AUDIO_VARIANTS[variant]['extension']}")
+
+    async def _async_digest(self, source: str) -> str:
+        """Return a source's content hash, reusing it while mtime and size are unchanged."""
+        stat = await self.hass.async_add_executor_job(os.stat, source)
+        known = self._digests.get(source)
+        if known is None or known[:2] != (stat.st_mtime, stat.st_size):
+            known = self._digests[source] = await self.hass.async_add_executor_job(_file_digest, source)
+        return known[2]
+
+    async def async_prepare(self, sources: Iterable[str]) -> None:
+        """Prepare every source and make sure all of its variants exist."""
+        for source in sources:
+            prepared = await self.async_prepare_source(source)
+            for variant in AUDIO_VARIANTS:
+                await self.async_ensure(source, variant, prepared.path if prepared else None)
+
+    async def async_prepare_source(self, source: str) -> Optional[PreparedAudio]:
+        """Write the trimmed, fast-start copy of a source unless it is up to date."""
+        if self._preparation is None:
+            self._preparation = (await self._store.async_load() or {}).get("files", {})
+        try:
+            digest = await self._async_digest(source)
+        except OSError as err:
+            _LOGGER.debug("Cannot read audio file %s: %s", source, err)
+            return None
+
+        known = self._preparation.get(digest)
+        if known is not None:
+            if known.get("prepared") is None:
+                return None
+            path = os.path.join(self.directory, known["prepared"])
+            if await self.hass.async_add_executor_job(os.path.exists, path):
+                prepared = self.prepared[source] = PreparedAudio(path, known["saved_ms"], known["header_bytes"])
+                return prepared
+
+        target = prepared_path(self.directory, digest, source)
+        try:
+            if self.ffmpeg is not None:
+                header_bytes = await self.hass.async_add_executor_job(read_header_bytes, source)
+                async with self._semaphore:
+                    prepared = await async_prepare_with_ffmpeg(self.hass, self.ffmpeg, source, target, header_bytes)
+            else:
+                prepared = await self.hass.async_add_executor_job(prepare_without_ffmpeg, source, target)
+        except OSError as err:
+            _LOGGER.warning("⚠️ Could not prepare %s: %s", os.path.basename(source), err)
+            return None
+
+        self._preparation[digest] = prepared.as_dict() if prepared else {"prepared": None}
+        self._store.async_delay_save(lambda: {"files": self._preparation}, 1)
+        if prepared is None:
+            self.prepared.pop(source, None)
+            return None
+        self.prepared[source] = prepared
+        _LOGGER.info(
+            "✂️ Prepared %s: %d ms leading silence and %d header bytes removed",
+            os.path.basename(source), prepared.silence_ms, prepared.header_bytes,
+        )
+        return prepared
+
+    async def async_ensure(self, source: str, variant: str, input_path: Optional[str] = None) -> Optional[str]:
+        """Return the cached variant of a source, transcoding it (or its prepared copy) if needed."""
+        try:
+            digest = await self._async_digest(source)
+        except OSError as err:
+            _LOGGER.debug("Cannot read audio file %s: %s", source, err)
+            return None
+        target = self.target_path(digest, variant)
+        if await self.hass.async_add_executor_job(os.path.exists, target):
+            self._variants[(source, variant)] = target
+            self.stats["cached"] += 1
+            return target
+        if self.ffmpeg is None:
+            return None
+
+        async with self._semaphore:
+            if await self._async_transcode(input_path or source, target, variant):
+                self._variants[(source, variant)] = target
+                self.stats["transcoded"] += 1
+                return target
+        self.stats["failed"] += 1
+        return None
+
+    async def _async_transcode(self, source: str, target: str, variant: str) -> bool:
+        """Run ffmpeg for one variant, writing through a temporary file."""
+        await self.hass.async_add_executor_job(lambda: os.makedirs(self.directory, exist_ok=True))
+        partial = f"{target}.partial"
+        command = [
+            self.ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", source, "-map", "0:a:0", "-map_metadata", "-1",
+            "-af", AUDIO_LOUDNESS_FILTER, *AUDIO_VARIANTS[variant]["args"],
+            "-f", AUDIO_VARIANTS[variant]["extension"], partial,
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            async with asyncio.timeout(AUDIO_TRANSCODE_TIMEOUT):
+                _, stderr = await process.communicate()
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            stderr = b"timed out"
+        if process.returncode != 0:
+            _LOGGER.warning(
+                "⚠️ Could not create %s audio variant of %s: %s",
+                variant, os.path.basename(source), stderr.decode(errors="replace").strip(),
+            )
+            await self.hass.async_add_executor_job(remove_quietly, partial)
+            return False
+        await self.hass.async_add_executor_job(os.replace, partial, target)
+        _LOGGER.info("🎚️ Created %s audio variant of %s", variant, os.path.basename(source))
+        return True
+
+    def variant_path(self, source: str, variant: str) -> Optional[str]:
+        """Return a prepared variant of a source, if one is known."""
+        return self._variants.get((source, variant))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the cache for diagnostics."""
+        return {
+            "ffmpeg": self.ffmpeg is not None,
+            "variants": {
+                f"{os.path.basename(source)}:{variant}": os.path.basename(path)
+                for (source, variant), path in sorted(self._variants.items())
+            },
+            "preparation": {
+                os.path.basename(source): prepared.as_dict()
+                for source, prepared in sorted(self.prepared.items())
+            },
+            **self.stats,
+        }
+
+
+async def async_get_variant_cache(hass: HomeAssistant) -> AudioVariantCache:
+    """Return the shared variant cache, locating ffmpeg on first use."""
+    cache = hass.data.get(DATA_AUDIO_VARIANTS)
+    if cache is None:
+        # Prefer the binary configured for Home Assistant's ffmpeg integration
+        ffmpeg = getattr(hass.data.get("ffmpeg"), "binary", None)
+        ffmpeg = await hass.async_add_executor_job(shutil.which, ffmpeg or "ffmpeg")
+        if ffmpeg is None:
+            _LOGGER.info("ffmpeg not found; azan files are played without normalized variants")
+        cache = hass.data[DATA_AUDIO_VARIANTS] = AudioVariantCache(hass, ffmpeg)
+    return cache
+
+
+def apply_variants(hass: HomeAssistant, audio_urls: List[str], variant: str) -> List[str]:
+    """Put a variant, then the prepared copy, ahead of each local URL. Runs in the executor."""
+    cache: Optional[AudioVariantCache] = hass.data.get(DATA_AUDIO_VARIANTS)
+    if cache is None:
+        return audio_urls
+    urls = []
+    for url in audio_urls:
+        source = audio_path(hass, url)
+        if source is not None:
+            prepared = cache.prepared.get(source)
+            for path in (cache.variant_path(source, variant), prepared.path if prepared else None):
+                if path is not None and (served := audio_url(hass, path)) is not None:
+                    urls.append(served)
+        urls.append(url)
+    return urls
@@ -0,0 +1,123 @@
+"""HTTP view serving azan audio for Waktu Solat Malaysia.
+
+Files are served from where they live rather than copied into www/:
+
+    /api/solatsyncmy/audio/bundled/<file>  files shipped in the integration's audio/
+    /api/solatsyncmy/audio/user/<file>     user files in www/solatsyncmy/
+    /api/solatsyncmy/audio/cache/<file>    normalized variants and prepared copies in www/solatsyncmy/variants/
+    /api/solatsyncmy/audio/tts/<file>      reminders rendered ahead of time in www/solatsyncmy/tts/
+
+Responses use sendfile, honour Range requests and carry aiohttp's strong
+ETag (modification time and size). URLs built here include the same
+version in ?v=, so a matching request is cacheable for a year and an
+edited file gets a new URL. Media players can keep the azan between plays.
+"""
+import logging
+import os
+import re
+from http import HTTPStatus
+from typing import Dict, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import AUDIO_URL_PATH, AUDIO_CACHE_MAX_AGE, AUDIO_VARIANTS_DIR, REMINDER_AUDIO_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+BUNDLED_AUDIO_DIR = os.path.join(os.path.dirname(__file__), "audio")
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".mp4", ".aac", ".ogg", ".flac", ".wav")
+# Plain file names only; anything with a path separator or leading dot is refused
+_SAFE_NAME = re.compile(r"^[\w][\w.\-]*$")
+
+
+def audio_directories(hass: HomeAssistant) -> Dict[str, str]:
+    """Return the directory served under each URL kind."""
+    return {
+        "bundled": BUNDLED_AUDIO_DIR,
+        "user": hass.config.path("www", "solatsyncmy"),
+        "cache": hass.config.path(*AUDIO_VARIANTS_DIR),
+        "tts": hass.config.path(*REMINDER_AUDIO_DIR),
+    }
+
+
+def file_version(stat: os.stat_result) -> str:
+    """Return a file's version: aiohttp's ETag value for it."""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def _resolve(hass: HomeAssistant, kind: str, name: str) -> Optional[str]:
+    """Return the file a URL kind and name refer to, or None if not allowed."""
+    directory = audio_directories(hass).get(kind)
+    if (
+        directory is None
+        or not _SAFE_NAME.match(name)
+        or not name.lower().endswith(AUDIO_EXTENSIONS)
+    ):
+        return None
+    return os.path.join(directory, name)
+
+
+def audio_url(hass: HomeAssistant, path: str) -> Optional[str]:
+    """Return the versioned URL serving a file, or None if it is outside the served directories.
+
+    The version comes from the file's stat, so this runs in the executor.
+    """
+    directory, name = os.path.split(path)
+    for kind, served in audio_directories(hass).items():
+        if os.path.normpath(directory) == os.path.normpath(served) and _resolve(hass, kind, name):
+            try:
+                version = file_version(os.stat(path))
+            except OSError:
+                return None
+            return f"{AUDIO_URL_PATH}/{kind}/{quote(name)}?v={version}"
+    return None
+
+
+def audio_path(hass: HomeAssistant, url: str) -> Optional[str]:
+    """Return the file behind a URL built by audio_url(), or None for other URLs."""
+    parts = urlsplit(url)
+    if parts.scheme or not parts.path.startswith(f"{AUDIO_URL_PATH}/"):
+        return None
+    kind, _, name = parts.path[len(AUDIO_URL_PATH) + 1:].partition("/")
+    return _resolve(hass, kind, unquote(name))
+
+
+def _stat_file(path: str) -> Optional[os.stat_result]:
+    """Return a regular file's stat, or None. Runs in the executor."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat if os.path.isfile(path) else None
+
+
+class AzanAudioView(HomeAssistantView):
+    """Serve azan files to media players."""
+
+    url = AUDIO_URL_PATH + "/{kind}/{name}"
+    name = "api:solatsyncmy:audio"
+    # Media players fetch the URL themselves, as they do for /local/
+    requires_auth = False
+
+    async def get(self, request: web.Request, kind: str, name: str) -> web.StreamResponse:
+        """Return an audio file, honouring Range and conditional requests."""
+        hass: HomeAssistant = request.app["hass"]
+        path = _resolve(hass, kind, name)
+        stat = await hass.async_add_executor_job(_stat_file, path) if path else None
+        if stat is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        if request.query.get("v") == file_version(stat):
+            cache_control = f"public, max-age={AUDIO_CACHE_MAX_AGE}, immutable"
+        else:
+            # Unversioned or stale URL: cache but revalidate with the ETag
+            cache_control = "public, no-cache"
+        return web.FileResponse(path, headers={hdrs.CACHE_CONTROL: cache_control})
+
+    async def head(self, request: web.Request, kind: str, name: str) -> web.StreamResponse:
+        """Return the headers of an audio file."""
+        return await self.get(request, kind, name)
@@ -0,0 +1,156 @@
+"""Media player capabilities for Waktu Solat Malaysia playback.
+
+Each target player is probed once for its supported features (from its
+state, else the entity registry), its integration and the audio formats
+that integration is known to play. The result is cached until the entity
+registry reports a change to the entity or its supported features change,
+so playback can skip steps the player does not support (turn on, volume)
+and their settling sleeps, and choose a variant the player can decode.
+"""
+import logging
+import mimetypes
+import os
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    DATA_PLAYER_CAPABILITIES,
+    AUDIO_VARIANTS,
+    AUDIO_VARIANT_DEFAULT,
+    AUDIO_PLAYER_VARIANTS,
+    AUDIO_PLAYER_FORMATS,
+    AUDIO_PLAYER_MIME_TYPES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Extensions any player is assumed to decode when its integration is not listed
+_DEFAULT_FORMATS = ("mp3", "m4a", "mp4", "aac", "ogg", "flac", "wav")
+
+
+class PlayerCapabilities(NamedTuple):
+    """What a media player supports, as far as azan playback is concerned."""
+
+    platform: Optional[str]
+    # None when the player does not report its features; every step is then attempted
+    supported_features: Optional[int]
+    formats: Tuple[str, ...]
+    variant: str
+    mime_types: bool = False  # Send the file's MIME type instead of "music"
+
+    def supports(self, feature: MediaPlayerEntityFeature) -> bool:
+        """Return True if the player supports a feature or does not say."""
+        return self.supported_features is None or bool(self.supported_features & feature)
+
+    @property
+    def can_turn_on(self) -> bool:
+        """Return True if the player can be switched on."""
+        return self.supports(MediaPlayerEntityFeature.TURN_ON)
+
+    @property
+    def can_set_volume(self) -> bool:
+        """Return True if the player's volume can be set."""
+        return self.supports(MediaPlayerEntityFeature.VOLUME_SET)
+
+    @property
+    def can_play_media(self) -> bool:
+        """Return True if the player can play a URL."""
+        return self.supports(MediaPlayerEntityFeature.PLAY_MEDIA)
+
+    def accepts(self, url: str) -> bool:
+        """Return True if the player is expected to decode the file behind a URL."""
+        extension = os.path.splitext(urlsplit(url).path)[1].lstrip(".").lower()
+        return not extension or extension in self.formats
+
+    def content_type(self, url: str) -> str:
+        """Return the media_content_type to send with a URL."""
+        if self.mime_types:
+            mime_type, _ = mimetypes.guess_type(urlsplit(url).path)
+            if mime_type:
+                return mime_type
+        return "music"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the capabilities for diagnostics."""
+        return {
+            "platform": self.platform,
+            "supported_features": self.supported_features,
+            "turn_on": self.can_turn_on,
+            "volume_set": self.can_set_volume,
+            "play_media": self.can_play_media,
+            "formats": list(self.formats),
+            "variant": self.variant,
+        }
+
+
+class PlayerCapabilityCache:
+    """Probed media player capabilities, dropped when the entity registry changes."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache and follow entity registry updates."""
+        self.hass = hass
+        self._players: Dict[str, PlayerCapabilities] = {}
+        self.stats = {"hits": 0, "probes": 0, "invalidations": 0}
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated)
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Forget an entity whose registry entry changed, under its old and new IDs."""
+        for entity_id in (event.data.get("entity_id"), event.data.get("old_entity_id")):
+            if self._players.pop(entity_id, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def get(self, media_player: str) -> PlayerCapabilities:
+        """Return a player's capabilities, probing it on first use."""
+        state = self.hass.states.get(media_player)
+        features = state.attributes.get("supported_features") if state else None
+        cached = self._players.get(media_player)
+        # Some players (e.g. Cast) change their features with the running app
+        if cached is not None and (features is None or features == cached.supported_features):
+            self.stats["hits"] += 1
+            return cached
+
+        self.stats["probes"] += 1
+        capabilities = self._probe(media_player, features)
+        # Players that are unavailable report no features; probe them again next time
+        if capabilities.supported_features is not None:
+            self._players[media_player] = capabilities
+        _LOGGER.debug("🔎 Media player %s capabilities: %s", media_player, capabilities.as_dict())
+        return capabilities
+
+    def _probe(self, media_player: str, features: Optional[int]) -> PlayerCapabilities:
+        """Read a player's capabilities from its state and registry entry."""
+        entry = er.async_get(self.hass).async_get(media_player)
+        platform = entry.platform if entry else None
+        if features is None and entry is not None and entry.supported_features:
+            features = entry.supported_features
+        formats = AUDIO_PLAYER_FORMATS.get(platform, _DEFAULT_FORMATS)
+        variant = AUDIO_PLAYER_VARIANTS.get(platform, AUDIO_VARIANT_DEFAULT)
+        if AUDIO_VARIANTS[variant]["extension"] not in formats:
+            # Fall back to the first variant the player can decode
+            variant = next(
+                (name for name, spec in AUDIO_VARIANTS.items() if spec["extension"] in formats),
+                AUDIO_VARIANT_DEFAULT,
+            )
+        return PlayerCapabilities(
+            platform, features, formats, variant, platform in AUDIO_PLAYER_MIME_TYPES
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe cached players and cache statistics for diagnostics."""
+        return {
+            "players": {player: capabilities.as_dict() for player, capabilities in sorted(self._players.items())},
+            **self.stats,
+        }
+
+
+def async_get_capabilities(hass: HomeAssistant) -> PlayerCapabilityCache:
+    """Return the capability cache shared by every entry."""
+    cache = hass.data.get(DATA_PLAYER_CAPABILITIES)
+    if cache is None:
+        cache = hass.data[DATA_PLAYER_CAPABILITIES] = PlayerCapabilityCache(hass)
+    return cache
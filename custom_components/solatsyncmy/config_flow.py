@@ -1,19 +1,24 @@
 """Config flow for Waktu Solat Malaysia integration."""
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
-import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN,
     DEFAULT_ZONE,
     CONF_ZONE,
+    CONF_ZONES,
+    CONF_ZONE_TRACKER,
+    CONF_ROUTING_RULES,
+    CONF_REMINDER_MINUTES,
+    CONF_REMINDER_TTS_ENGINE,
+    CONF_API_BASE_URL,
     CONF_AZAN_ENABLED,
     CONF_AZAN_SUBUH_ENABLED,
     CONF_AZAN_ZOHOR_ENABLED,
@@ -22,6 +27,7 @@ from .const import (
     CONF_AZAN_ISYAK_ENABLED,
     CONF_MEDIA_PLAYER,
     CONF_AZAN_VOLUME,
+    CONF_AZAN_FADE_IN,
     CONF_AUDIO_SOURCE,
     CONF_REMOTE_AZAN_URL,
     CONF_REMOTE_FAJR_URL,
@@ -29,72 +35,24 @@ from .const import (
     AUDIO_SOURCE_OPTIONS,
     AUDIO_SOURCE_DESCRIPTIONS,
 )
-from .coordinator import WaktuSolatCoordinator
+from .zones import ZoneCatalogue, async_get_zone_catalogue
 
 _LOGGER = logging.getLogger(__name__)
 
-# Malaysian zones (simplified list - in production you'd fetch from API)
-ZONES = [
-    ("JHR01", "Johor - Pulau Aur dan Pulau Pemanggil"),
-    ("JHR02", "Johor - Johor Bahru, Kota Tinggi, Mersing, Kulai"),
-    ("JHR03", "Johor - Kluang, Pontian"),
-    ("JHR04", "Johor - Batu Pahat, Muar, Segamat, Gemas Johor, Tangkak"),
-    ("KDH01", "Kedah - Kota Setar, Kubang Pasu, Pokok Sena"),
-    ("KDH02", "Kedah - Kuala Muda, Yan, Pendang"),
-    ("KDH03", "Kedah - Padang Terap, Sik"),
-    ("KDH04", "Kedah - Baling"),
-    ("KDH05", "Kedah - Bandar Baharu, Kulim"),
-    ("KDH06", "Kedah - Langkawi"),
-    ("KDH07", "Kedah - Puncak Gunung Jerai"),
-    ("KTN01", "Kelantan - Bachok, Kota Bharu, Machang, Pasir Mas, Pasir Puteh, Tanah Merah, Tumpat, Kuala Krai, Mukim Chiku"),
-    ("KTN02", "Kelantan - Gua Musang, Jeli, Jajahan Kecil Lojing"),
-    ("MLK01", "Melaka - Seluruh Negeri Melaka"),
-    ("NGS01", "Negeri Sembilan - Tampin, Jempol"),
-    ("NGS02", "Negeri Sembilan - Jelebu, Kuala Pilah, Rembau"),
-    ("NGS03", "Negeri Sembilan - Port Dickson, Seremban"),
-    ("PHG01", "Pahang - Pulau Tioman"),
-    ("PHG02", "Pahang - Kuantan, Pekan, Muadzam Shah"),
-    ("PHG03", "Pahang - Jerantut, Temerloh, Maran, Bera, Chenor, Jengka"),
-    ("PHG04", "Pahang - Bentong, Lipis, Raub"),
-    ("PHG05", "Pahang - Genting Sempah, Janda Baik, Bukit Tinggi"),
-    ("PHG06", "Pahang - Cameron Highlands, Genting Higlands, Bukit Fraser"),
-    ("PRK01", "Perak - Tapah, Slim River, Tanjung Malim"),
-    ("PRK02", "Perak - Kuala Kangsar, Sg. Siput, Ipoh, Batu Gajah, Kampar"),
-    ("PRK03", "Perak - Lenggong, Pengkalan Hulu, Grik"),
-    ("PRK04", "Perak - Temengor, Belum"),
-    ("PRK05", "Perak - Kg Gajah, Teluk Intan, Bagan Datuk, Seri Iskandar, Beruas, Parit, Lumut, Sitiawan, Pulau Pangkor"),
-    ("PRK06", "Perak - Selama, Taiping, Bagan Serai, Parit Buntar"),
-    ("PRK07", "Perak - Bukit Larut"),
-    ("PLS01", "Perlis - Seluruh Negeri Perlis"),
-    ("PNG01", "Pulau Pinang - Seluruh Negeri Pulau Pinang"),
-    ("SBH01", "Sabah - Bahagian Sandakan (Timur)"),
-    ("SBH02", "Sabah - Beluran, Telupid, Pinangah, Terusan, Kuamut, Bahagian Sandakan (Barat)"),
-    ("SBH03", "Sabah - Lahad Datu, Silabukan, Kunak, Sahabat, Semporna, Tungku, Bahagian Tawau (Timur)"),
-    ("SBH04", "Sabah - Bandar Tawau, Balong, Merotai, Kalabakan, Bahagian Tawau (Barat)"),
-    ("SBH05", "Sabah - Kudat, Kota Marudu, Pitas, Pulau Banggi, Bahagian Kudat"),
-    ("SBH06", "Sabah - Gunung Kinabalu"),
-    ("SBH07", "Sabah - Kota Kinabalu, Ranau, Kota Belud, Tuaran, Penampang, Papar, Putatan, Bahagian Pantai Barat"),
-    ("SBH08", "Sabah - Pensiangan, Keningau, Tambunan, Nabawan, Bahagian Pendalaman (Atas)"),
-    ("SBH09", "Sabah - Beaufort, Kuala Penyu, Sipitang, Tenom, Long Pasia, Membakut, Weston, Bahagian Pendalaman (Bawah)"),
-    ("SWK01", "Sarawak - Limbang, Lawas, Sundar, Trusan"),
-    ("SWK02", "Sarawak - Miri, Niah, Bekenu, Sibuti, Marudi"),
-    ("SWK03", "Sarawak - Pandan, Belaga, Suai, Tatau, Sebauh, Bintulu"),
-    ("SWK04", "Sarawak - Sibu, Mukah, Dalat, Song, Igan, Oya, Balingian, Kanowit, Kapit"),
-    ("SWK05", "Sarawak - Sarikei, Matu, Julau, Rajang, Daro, Bintangor, Belawai"),
-    ("SWK06", "Sarawak - Lubok Antu, Sri Aman, Roban, Debak, Kabong, Lingga, Engkelili, Betong, Spaoh, Pusa, Saratok"),
-    ("SWK07", "Sarawak - Serian, Simunjan, Samarahan, Sebuyau, Meludam"),
-    ("SWK08", "Sarawak - Kuching, Bau, Lundu, Sematan"),
-    ("SWK09", "Sarawak - Zon Khas (Kampung Patarikan)"),
-    ("SGR01", "Selangor - Gombak, Petaling, Sepang, Hulu Langat, Hulu Selangor, Shah Alam"),
-    ("SGR02", "Selangor - Kuala Selangor, Sabak Bernam"),
-    ("SGR03", "Selangor - Klang, Kuala Langat"),
-    ("TRG01", "Terengganu - Kuala Terengganu, Marang, Kuala Nerus"),
-    ("TRG02", "Terengganu - Besut, Setiu"),
-    ("TRG03", "Terengganu - Hulu Terengganu"),
-    ("TRG04", "Terengganu - Dungun, Kemaman"),
-    ("WLY01", "Wilayah Persekutuan - Kuala Lumpur, Putrajaya"),
-    ("WLY02", "Wilayah Persekutuan - Labuan"),
-]
+
+def _resolve_zone(catalogue: ZoneCatalogue, value: str) -> Tuple[Optional[str], Optional[str]]:
+    """Resolve a zone code or a typed place name (e.g. "ipoh") to a zone code.
+
+    Returns (code, None), or (None, error) when no zone or several zones match.
+    """
+    value = value.strip()
+    zone = catalogue.get(value)
+    if zone is not None:
+        return zone.code, None
+    matches = catalogue.search(value, limit=2)
+    if len(matches) == 1:
+        return matches[0].code, None
+    return None, "ambiguous_zone" if matches else "invalid_zone"
 
 
 class WaktuSolatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -107,33 +65,47 @@ class WaktuSolatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step."""
         errors = {}
+        catalogue = await async_get_zone_catalogue(self.hass)
 
         if user_input is not None:
-            # Validate the zone
-            zone = user_input[CONF_ZONE]
-            if any(z[0] == zone for z in ZONES):
-                # Validate media player if provided
-                media_player = user_input.get(CONF_MEDIA_PLAYER)
-                if media_player and not self.hass.states.get(media_player):
-                    errors[CONF_MEDIA_PLAYER] = "media_player_not_found"
-                else:
-                    # Create entry with both zone and media player
-                    return self.async_create_entry(
-                        title=f"Solat Sync MY ({zone})",
-                        data={CONF_ZONE: zone},
-                        options={
-                            CONF_MEDIA_PLAYER: media_player or "",
-                            CONF_AZAN_ENABLED: bool(media_player),  # Enable if media player selected
-                            CONF_AZAN_VOLUME: 0.7,
-                            CONF_AZAN_SUBUH_ENABLED: True,
-                            CONF_AZAN_ZOHOR_ENABLED: True,
-                            CONF_AZAN_ASAR_ENABLED: True,
-                            CONF_AZAN_MAGHRIB_ENABLED: True,
-                            CONF_AZAN_ISYAK_ENABLED: True,
-                        }
-                    )
-            else:
-                errors[CONF_ZONE] = "invalid_zone"
+            # Validate the zones; typed place names are looked up in the catalogue
+            zone, zone_error = _resolve_zone(catalogue, user_input[CONF_ZONE])
+            fleet_zones = []
+            for value in user_input.get(CONF_ZONES, []):
+                fleet_zone, fleet_error = _resolve_zone(catalogue, value)
+                if fleet_error:
+                    errors[CONF_ZONES] = fleet_error
+                elif fleet_zone != zone and fleet_zone not in fleet_zones:
+                    fleet_zones.append(fleet_zone)
+            if zone_error:
+                errors[CONF_ZONE] = zone_error
+            # Validate media player if provided
+            media_player = user_input.get(CONF_MEDIA_PLAYER)
+            if media_player and not self.hass.states.get(media_player):
+                errors[CONF_MEDIA_PLAYER] = "media_player_not_found"
+            if not errors:
+                title = f"Solat Sync MY ({zone})"
+                data = {CONF_ZONE: zone}
+                if fleet_zones:
+                    # Fleet mode: one entry tracks several zones
+                    title = f"Solat Sync MY ({zone} +{len(fleet_zones)} zones)"
+                    data[CONF_ZONES] = fleet_zones
+                
+                # Create entry with both zone and media player
+                return self.async_create_entry(
+                    title=title,
+                    data=data,
+                    options={
+                        CONF_MEDIA_PLAYER: media_player or "",
+                        CONF_AZAN_ENABLED: bool(media_player),  # Enable if media player selected
+                        CONF_AZAN_VOLUME: 0.7,
+                        CONF_AZAN_SUBUH_ENABLED: True,
+                        CONF_AZAN_ZOHOR_ENABLED: True,
+                        CONF_AZAN_ASAR_ENABLED: True,
+                        CONF_AZAN_MAGHRIB_ENABLED: True,
+                        CONF_AZAN_ISYAK_ENABLED: True,
+                    }
+                )
 
         # Get available media players
         media_players = []
@@ -144,11 +116,33 @@ class WaktuSolatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "label": f"{state.attributes.get('friendly_name', state.entity_id)}"
                 })
 
+        # Suggest the zone containing Home Assistant's configured location
+        default_zone = DEFAULT_ZONE
+        latitude, longitude = self.hass.config.latitude, self.hass.config.longitude
+        if latitude is not None and longitude is not None:
+            from .geo import async_get_zone_locator
+            
+            locator = await async_get_zone_locator(self.hass)
+            suggested_zone = locator.resolve(latitude, longitude)
+            if suggested_zone in catalogue:
+                default_zone = suggested_zone
+                _LOGGER.debug("Suggesting zone %s from configured location", suggested_zone)
+
         # Show form
+        zone_options = catalogue.as_options()
         data_schema = vol.Schema({
-            vol.Required(CONF_ZONE, default=DEFAULT_ZONE): selector.SelectSelector(
+            vol.Required(CONF_ZONE, default=default_zone): selector.SelectSelector(
                 selector.SelectSelectorConfig(
-                    options=[{"value": zone[0], "label": zone[1]} for zone in ZONES],
+                    options=zone_options,
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(CONF_ZONES, default=[]): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=zone_options,
+                    multiple=True,
+                    custom_value=True,
                     mode=selector.SelectSelectorMode.DROPDOWN,
                 )
             ),
@@ -219,6 +213,20 @@ class WaktuSolatOptionsFlowHandler(config_entries.OptionsFlow):
                 elif not remote_fajr_url.startswith(("http://", "https://")):
                     errors[CONF_REMOTE_FAJR_URL] = "invalid_url_format"
 
+            # Routing rules are compiled at runtime; reject ones that would be skipped
+            if user_input.get(CONF_ROUTING_RULES):
+                from .routing import RULES_SCHEMA
+                
+                try:
+                    RULES_SCHEMA(user_input[CONF_ROUTING_RULES])
+                except vol.Invalid as err:
+                    _LOGGER.debug("Invalid routing rules: %s", err)
+                    errors[CONF_ROUTING_RULES] = "invalid_routing_rules"
+
+            api_base_url = user_input.get(CONF_API_BASE_URL, "").strip()
+            if api_base_url and not api_base_url.startswith(("http://", "https://")):
+                errors[CONF_API_BASE_URL] = "invalid_url_format"
+
             if not errors:
                     return self.async_create_entry(title="", data=user_input)
 
@@ -287,6 +295,18 @@ class WaktuSolatOptionsFlowHandler(config_entries.OptionsFlow):
                     mode=selector.NumberSelectorMode.SLIDER,
                 )
             ),
+            vol.Optional(
+                CONF_AZAN_FADE_IN,
+                default=current_options.get(CONF_AZAN_FADE_IN, 0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=120,
+                    step=1,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
             vol.Optional(
                 CONF_AZAN_SUBUH_ENABLED,
                 default=current_options.get(CONF_AZAN_SUBUH_ENABLED, True),
@@ -307,6 +327,42 @@ class WaktuSolatOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_AZAN_ISYAK_ENABLED,
                 default=current_options.get(CONF_AZAN_ISYAK_ENABLED, True),
             ): bool,
+            vol.Optional(
+                CONF_ROUTING_RULES,
+                description={"suggested_value": current_options.get(CONF_ROUTING_RULES)},
+            ): selector.ObjectSelector(),
+            vol.Optional(
+                CONF_REMINDER_MINUTES,
+                default=current_options.get(CONF_REMINDER_MINUTES, 0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=60,
+                    step=1,
+                    unit_of_measurement="min",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_REMINDER_TTS_ENGINE,
+                description={"suggested_value": current_options.get(CONF_REMINDER_TTS_ENGINE)},
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="tts")
+            ),
+            vol.Optional(
+                CONF_ZONE_TRACKER,
+                description={"suggested_value": current_options.get(CONF_ZONE_TRACKER)},
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["device_tracker", "person"])
+            ),
+            vol.Optional(
+                CONF_API_BASE_URL,
+                description={"suggested_value": current_options.get(CONF_API_BASE_URL)},
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(
+                    type=selector.TextSelectorType.URL,
+                )
+            ),
         })
 
         # Check for local audio files and build comprehensive info
@@ -330,10 +386,10 @@ class WaktuSolatOptionsFlowHandler(config_entries.OptionsFlow):
                     audio_info_lines.append(f"   • {file_info}")
             else:
                 audio_info_lines.append("⚠️  No valid audio files found")
-                audio_info_lines.append("   Placeholder files will be created")
+                audio_info_lines.append("   The bundled azan will be used")
         else:
             audio_info_lines.append("ℹ️  Directory will be created: /config/www/solatsyncmy/")
-            audio_info_lines.append("   Placeholder files will be created")
+            audio_info_lines.append("   The bundled azan will be used")
         
         audio_info_lines.append("")
         audio_info_lines.append("💡 Local Audio Setup:")
@@ -341,7 +397,7 @@ class WaktuSolatOptionsFlowHandler(config_entries.OptionsFlow):
         audio_info_lines.append("• Prayer-specific: azan_subuh.mp3, azan_zohor.mp3, etc.")
         audio_info_lines.append("• Formats: MP3, WAV, M4A, OGG, FLAC")
         audio_info_lines.append("• Location: /config/www/solatsyncmy/")
-        audio_info_lines.append("• Served as: http://your-ha:8123/local/solatsyncmy/filename.mp3")
+        audio_info_lines.append("• Served as: http://your-ha:8123/api/solatsyncmy/audio/user/filename.mp3")
         audio_info_lines.append("")
         audio_info_lines.append("📖 See AUDIO_SETUP.md for detailed setup guide")
         
@@ -10,14 +10,82 @@ PLATFORMS = [Platform.SENSOR, Platform.SWITCH]
 # API Configuration
 API_BASE_URL = "https://api.waktusolat.app"
 API_TIMEOUT = 30
+ZONE_CATALOGUE_TTL = 7 * 24 * 3600  # Refresh the zone list from the API weekly
+ZONE_CATALOGUE_RETRY = 3600  # Seconds before a failed zone list refresh is tried again
+ZONE_CATALOGUE_STORAGE_VERSION = 1
+TIMETABLE_STORAGE_VERSION = 1  # Per-entry cache of fetched months, loaded at startup
+TIMETABLE_SAVE_DELAY = 10  # Seconds; batches the saves of months fetched together
+TIMETABLE_PACK_FILE = "timetable.pack"  # Bundled all-zone timetable served before the first fetch
+# GPS to zone resolution (grid index over Malaysia: min_lat, min_lon, max_lat, max_lon)
+GEO_GRID_BOUNDS = (0.5, 99.0, 8.0, 120.0)
+GEO_GRID_CELL_DEGREES = 0.25
+GEO_MAX_DISTANCE_KM = 150  # Farther than this from any zone is treated as outside Malaysia
+GEO_ZONE_CONFIRMATIONS = 3  # Consecutive position fixes in a new zone before the entry switches to it
+
+MAX_CONCURRENT_FETCHES = 4  # Parallel month requests for exports and multi-month lookups
 
 # Default values
 DEFAULT_ZONE = "SGR01"  # Selangor default
 DEFAULT_NAME = "Waktu Solat Malaysia"
 DEFAULT_SCAN_INTERVAL = 900  # 15 minutes in seconds (optimized for monthly caching)
 
+# hass.data keys shared across config entries
+DATA_ZONE_CATALOGUE = f"{DOMAIN}_zone_catalogue"
+DATA_ZONE_LOCATOR = f"{DOMAIN}_zone_locator"
+DATA_PLAYBACK_TRACES = f"{DOMAIN}_playback_traces"
+DATA_TIMETABLE_PACK = f"{DOMAIN}_timetable_pack"
+DATA_AUDIO_VARIANTS = f"{DOMAIN}_audio_variants"
+DATA_PLAYBACK_ARBITER = f"{DOMAIN}_playback_arbiter"
+DATA_MEDIA_SNAPSHOTS = f"{DOMAIN}_media_snapshots"
+DATA_AUDIO_CANDIDATES = f"{DOMAIN}_audio_candidates"
+DATA_PLAYER_CAPABILITIES = f"{DOMAIN}_player_capabilities"
+DATA_REMINDER_AUDIO = f"{DOMAIN}_reminder_audio"
+DATA_VOLUME_FADER = f"{DOMAIN}_volume_fader"
+
+# Diagnostics
+PLAYBACK_TRACE_LIMIT = 20  # Most recent azan playbacks kept for diagnostics
+FETCH_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds (upper bounds)
+
+# Azan timing telemetry: delay from the prayer time to each playback stage
+AZAN_LATENCY_STAGES = ["fired", "dispatched", "playing"]
+AZAN_LATENCY_STAGE_NAMES = {
+    "fired": "Timer",
+    "dispatched": "Dispatch",
+    "playing": "Playing",
+}
+AZAN_LATENCY_WINDOW = 50  # Scheduled playbacks kept for rolling percentiles
+PLAYBACK_CONFIRM_TIMEOUT = 2  # Seconds to wait for the media player to report playing
+
+# Playback queue: one job runs per media player; lower values win
+PLAYBACK_PRIORITY_SCHEDULED = 0
+PLAYBACK_PRIORITY_MANUAL = 1
+PLAYBACK_PRIORITY_TEST = 2
+PLAYBACK_WAIT_WINDOW = 50  # Queue wait samples kept for rolling percentiles
+
+# Volume fade-in: one ramp task per player, started once the azan is audible
+AZAN_FADE_START_VOLUME = 0.1  # Level the azan starts at (never above the target volume)
+AZAN_FADE_MAX_STEPS = 10  # Upper bound on volume_set calls per ramp
+AZAN_FADE_MIN_INTERVAL = 0.5  # Seconds between volume_set calls
+
+# Media player state restored after azan
+AZAN_MAX_DURATION = 600  # Seconds to wait for completion when the player reports no duration
+PLAYBACK_COMPLETION_MARGIN = 2  # Seconds allowed past the reported duration
+MEDIA_RESTORE_WINDOW = 50  # Restore latency samples kept for rolling percentiles
+
+# Audio URL candidates: validated ahead of prayer time and ranked by history
+AUDIO_CANDIDATES_STORAGE_VERSION = 1
+AUDIO_VALIDATION_INTERVAL = 900  # Seconds between pre-validation of the configured player's URLs
+AUDIO_VALIDATION_TIMEOUT = 5  # Seconds per HEAD request
+AUDIO_LATENCY_SMOOTHING = 0.3  # Weight of the newest start latency in the moving average
+# A player going from one of these states to an error state rejected the URL
+PLAYBACK_LOADING_STATES = ("buffering",)
+PLAYBACK_ERROR_STATES = ("idle", "off", "unavailable")
+
 # Configuration keys
 CONF_ZONE = "zone"
+CONF_ZONES = "zones"  # Additional zones tracked by a fleet-mode entry
+CONF_ZONE_TRACKER = "zone_tracker_entity_id"  # Entity whose location selects the zone
+CONF_API_BASE_URL = "api_base_url"  # Override for API_BASE_URL (e.g. a local test server)
 CONF_AZAN_ENABLED = "azan_enabled"
 CONF_AZAN_SUBUH_ENABLED = "azan_subuh_enabled"
 CONF_AZAN_ZOHOR_ENABLED = "azan_zohor_enabled"
@@ -26,7 +94,11 @@ CONF_AZAN_MAGHRIB_ENABLED = "azan_maghrib_enabled"
 CONF_AZAN_ISYAK_ENABLED = "azan_isyak_enabled"
 CONF_MEDIA_PLAYER = "media_player_entity_id"
 CONF_AZAN_VOLUME = "azan_volume"
+CONF_AZAN_FADE_IN = "azan_fade_in"  # Seconds to ramp the volume up once the azan is audible; 0 disables
 CONF_LOCAL_AUDIO_PATH = "local_audio_path"  # For local audio files
+CONF_ROUTING_RULES = "routing_rules"  # Per-prayer players, volume and file (see routing.py)
+CONF_REMINDER_MINUTES = "reminder_minutes"  # Spoken reminder this long before each azan; 0 disables
+CONF_REMINDER_TTS_ENGINE = "reminder_tts_engine"  # TTS entity or provider; Home Assistant's default if unset
 
 # Audio source configuration
 CONF_AUDIO_SOURCE = "audio_source"
@@ -58,6 +130,23 @@ AUDIO_SOURCE_DESCRIPTIONS = {
 PRAYER_TIMES = ["fajr", "syuruk", "dhuhr", "asr", "maghrib", "isha"]
 AZAN_PRAYERS = ["fajr", "dhuhr", "asr", "maghrib", "isha"]  # Syuruk doesn't have azan
 
+# Derived times computed from the API prayer times
+DERIVED_TIMES = ["imsak", "dhuha", "midnight", "last_third"]
+DERIVED_TIME_NAMES = {
+    "imsak": "Imsak",
+    "dhuha": "Dhuha",
+    "midnight": "Tengah Malam",
+    "last_third": "Sepertiga Malam",
+}
+DERIVED_TIME_ICONS = {
+    "imsak": "mdi:food-off",
+    "dhuha": "mdi:white-balance-sunny",
+    "midnight": "mdi:weather-night",
+    "last_third": "mdi:star-crescent",
+}
+IMSAK_OFFSET_MINUTES = 10  # Imsak is 10 minutes before Subuh
+DHUHA_OFFSET_MINUTES = 28  # Dhuha begins 28 minutes after Syuruk
+
 # Prayer name translations
 PRAYER_NAMES = {
     "fajr": "Subuh",
@@ -68,9 +157,55 @@ PRAYER_NAMES = {
     "isha": "Isyak",
 }
 
+# Hijri calendar (Malay month names, in order)
+HIJRI_MONTH_NAMES = [
+    "Muharram",
+    "Safar",
+    "Rabiulawal",
+    "Rabiulakhir",
+    "Jamadilawal",
+    "Jamadilakhir",
+    "Rejab",
+    "Syaaban",
+    "Ramadan",
+    "Syawal",
+    "Zulkaedah",
+    "Zulhijjah",
+]
+HIJRI_MAX_CORRECTION = 2  # Days the arithmetic calendar may be shifted to match the API
+HIJRI_CALENDAR_DAYS = 366  # Days of Gregorian<->Hijri mappings precomputed each day
+
+# Islamic events: (hijri month, hijri day, key, display name)
+ISLAMIC_EVENTS = [
+    (1, 1, "awal_muharram", "Awal Muharram"),
+    (1, 10, "asyura", "Hari Asyura"),
+    (3, 12, "maulidur_rasul", "Maulidur Rasul"),
+    (7, 27, "israk_mikraj", "Israk dan Mikraj"),
+    (8, 15, "nisfu_syaaban", "Nisfu Syaaban"),
+    (9, 1, "awal_ramadan", "Awal Ramadan"),
+    (9, 17, "nuzul_quran", "Nuzul Al-Quran"),
+    (10, 1, "hari_raya_aidilfitri", "Hari Raya Aidilfitri"),
+    (12, 9, "hari_arafah", "Hari Arafah"),
+    (12, 10, "hari_raya_aidiladha", "Hari Raya Aidiladha"),
+]
+
 # Prayer order for controls (global automation first, then prayer order)
 PRAYER_ORDER = ["automation", "fajr", "dhuhr", "asr", "maghrib", "isha"]
 
+# Per-prayer azan switch option keys
+PRAYER_CONFIG_MAP = {
+    "fajr": CONF_AZAN_SUBUH_ENABLED,
+    "dhuhr": CONF_AZAN_ZOHOR_ENABLED,
+    "asr": CONF_AZAN_ASAR_ENABLED,
+    "maghrib": CONF_AZAN_MAGHRIB_ENABLED,
+    "isha": CONF_AZAN_ISYAK_ENABLED,
+}
+
+# Scheduler entry kinds
+SCHEDULE_KIND_PRAYER = "prayer"
+SCHEDULE_KIND_DERIVED = "derived"
+SCHEDULE_KIND_REMINDER = "reminder"
+
 # Device info
 MANUFACTURER = "Waktu Solat Malaysia"
 MODEL = "Prayer Times API"
@@ -93,10 +228,14 @@ PRAYER_ICONS = {
     "isha": "mdi:moon-waning-crescent",
 }
 
-# Azan file names (files will be copied to www/solatsyncmy/)
+# Azan file names (bundled in audio/; a file of the same name in www/solatsyncmy/ overrides it)
 AZAN_FILE_NORMAL = "azan.mp3"
 AZAN_FILE_FAJR = "azanfajr.mp3"  # Different azan for Subuh
 
+# Audio HTTP view: /api/solatsyncmy/audio/<bundled|user|cache>/<file>?v=<version>
+AUDIO_URL_PATH = f"/api/{DOMAIN}/audio"
+AUDIO_CACHE_MAX_AGE = 31536000  # Seconds; versioned URLs never change content
+
 # Local audio paths (for manual file placement)
 LOCAL_AUDIO_PATHS = [
     "/config/www/",
@@ -105,9 +244,63 @@ LOCAL_AUDIO_PATHS = [
     "/share/",
 ]
 
+# Audio variants: loudness-normalized transcodes of local azan files, cached by content hash
+AUDIO_VARIANTS_DIR = ("www", "solatsyncmy", "variants")  # Relative to the HA config directory
+AUDIO_PIPELINE_VERSION = 2  # Part of the cache key; bump when filters or encodings change
+AUDIO_LOUDNESS_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"  # EBU R128 speech/music target
+AUDIO_VARIANTS = {
+    # Widely supported, quick to buffer on Cast, Sonos and most renderers
+    "standard": {"extension": "mp3", "args": ["-c:a", "libmp3lame", "-b:a", "128k", "-ar", "44100", "-ac", "2"]},
+    # Low bitrate mono for renderers that buffer slowly (DLNA/UPnP speakers)
+    "compact": {"extension": "mp3", "args": ["-c:a", "libmp3lame", "-b:a", "64k", "-ar", "22050", "-ac", "1"]},
+}
+AUDIO_VARIANT_DEFAULT = "standard"
+AUDIO_PLAYER_VARIANTS = {  # Media player integration (platform) -> preferred variant
+    "dlna_dmr": "compact",
+    "openhome": "compact",
+}
+AUDIO_PLAYER_FORMATS = {  # Media player integration -> file extensions it is known to play; others play all
+    "dlna_dmr": ("mp3", "wav"),
+    "openhome": ("mp3", "wav", "flac"),
+    "alexa_media": ("mp3",),
+}
+AUDIO_PLAYER_MIME_TYPES = ("dlna_dmr", "openhome")  # Integrations given a MIME type as media_content_type
+AUDIO_TRANSCODE_CONCURRENCY = 1
+AUDIO_TRANSCODE_TIMEOUT = 120  # Seconds per ffmpeg run
+# Preparation: leading silence under the threshold is cut, keeping a short pad
+AUDIO_SILENCE_THRESHOLD_DB = -50
+AUDIO_SILENCE_PAD_MS = 50
+AUDIO_PREPARATION_STORAGE_VERSION = 1  # Results per content hash, for diagnostics
+
+# Pre-prayer reminders: rendered through TTS ahead of time and cached by text, engine and language
+REMINDER_AUDIO_DIR = ("www", "solatsyncmy", "tts")  # Relative to the HA config directory
+REMINDER_MESSAGE = "Lagi {minutes} minit waktu {prayer}"
+REMINDER_LANGUAGE = "ms"  # Engines without Malay fall back to their default language
+REMINDER_RENDER_TIMEOUT = 30  # Seconds per TTS render
+
 # Service names
 SERVICE_PLAY_AZAN = "play_azan"
 SERVICE_TEST_AUDIO = "test_audio"
+SERVICE_EXPORT_TIMETABLE = "export_timetable"
+
+# Timetable export
+EXPORT_DIR = ("www", "solatsyncmy", "export")  # Relative to the HA config directory
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_ICS = "ics"
+EXPORT_FORMAT_BOTH = "both"
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_ICS, EXPORT_FORMAT_BOTH]
+EXPORT_PERIOD_MONTH = "month"
+EXPORT_PERIOD_YEAR = "year"
+EXPORT_PERIOD_RANGE = "range"
+EXPORT_PERIODS = [EXPORT_PERIOD_MONTH, EXPORT_PERIOD_YEAR, EXPORT_PERIOD_RANGE]
+EXPORT_MAX_DAYS = 366  # Longest range one export may cover, bounding the months fetched
+
+# Events
+EVENT_PRAYER_TIME = f"{DOMAIN}_prayer_time"
+EVENT_DERIVED_TIME = f"{DOMAIN}_derived_time"
+EVENT_PRAYER_REMINDER = f"{DOMAIN}_prayer_reminder"
+EVENT_AZAN_LATENCY = f"{DOMAIN}_azan_latency"
+EVENT_TIMETABLE_CHANGED = f"{DOMAIN}_timetable_changed"  # Only the cells that changed on a refetch
 
 # Attributes
 ATTR_NEXT_PRAYER = "next_prayer"
@@ -115,4 +308,5 @@ ATTR_NEXT_PRAYER_TIME = "next_prayer_time"
 ATTR_TIME_TO_NEXT_PRAYER = "time_to_next_prayer"
 ATTR_ZONE = "zone"
 ATTR_HIJRI_DATE = "hijri_date"
-ATTR_PRAYER_TIMES = "prayer_times" 
\ No newline at end of file
+ATTR_PRAYER_TIMES = "prayer_times"
+ATTR_UPCOMING_EVENTS = "upcoming_events" 
\ No newline at end of file
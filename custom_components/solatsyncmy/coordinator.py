@@ -1,40 +1,96 @@
 """Data update coordinator for Waktu Solat Malaysia."""
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, date
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
-import aiohttp
-import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    CONF_ZONE,
+    CONF_ZONES,
+    CONF_API_BASE_URL,
+    CONF_MEDIA_PLAYER,
+    CONF_AZAN_VOLUME,
+    CONF_AZAN_FADE_IN,
+    CONF_ROUTING_RULES,
+    CONF_REMINDER_MINUTES,
     API_BASE_URL,
     API_TIMEOUT,
-    DEFAULT_SCAN_INTERVAL,
+    MAX_CONCURRENT_FETCHES,
+    TIMETABLE_STORAGE_VERSION,
+    TIMETABLE_SAVE_DELAY,
     PRAYER_TIMES,
     PRAYER_NAMES,
+    HIJRI_CALENDAR_DAYS,
+    DERIVED_TIMES,
+    EVENT_TIMETABLE_CHANGED,
 )
+from .hijri import HijriCalendar, build_hijri_info, compute_correction
+from .scheduler import WaktuSolatScheduler
+from .telemetry import AzanLatencyStats, FetchStats
+from .timetable import COLUMN_INDEX, HIJRI, MISSING, CellChange, MonthView, ZoneYearTable
+
+if TYPE_CHECKING:
+    from .pack import TimetablePack
+    from .routing import RoutingTable
+    from .telemetry import SetupTimings
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _to_local(timestamp: int) -> datetime:
+    """Convert an API Unix timestamp to a timezone-aware local datetime."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+
+
+def timetable_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding an entry's cached months."""
+    return Store(hass, TIMETABLE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.timetable")
+
+
 class WaktuSolatCoordinator(DataUpdateCoordinator):
     """Coordinator to fetch prayer times from the API."""
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
-        self.config_entry = config_entry
-        self.zone = config_entry.data["zone"]
+        self.zone = config_entry.data[CONF_ZONE]
+        # Fleet mode: one entry tracks the primary zone plus any additional zones
+        self.zones = [self.zone] + [
+            zone for zone in config_entry.data.get(CONF_ZONES, []) if zone != self.zone
+        ]
+        
+        # Compact timetable shared by all zones and exports: (zone, year) -> table
+        # holding the API and derived times of every ingested month
+        self._tables: Dict[Tuple[str, int], ZoneYearTable] = {}
+        # Months served from the bundled pack until the API confirms them
+        self._pack_months: Set[Tuple[str, int, int]] = set()
+        self._pack: Optional["TimetablePack"] = None
+        self._fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._pending_fetches: Dict[Tuple[str, int, int], asyncio.Task] = {}
+        # When each month was ingested, and fetch/cache statistics for diagnostics
+        self._month_ingested_at: Dict[Tuple[str, int, int], float] = {}
+        self.fetch_stats = FetchStats()
+        # Rolling prayer-time-to-playback latencies of scheduled azans
+        self.azan_latency = AzanLatencyStats()
+        self.setup_timings: Optional["SetupTimings"] = None
+        # (zone, cell name) -> update callbacks of the entities showing that cell
+        self._cell_listeners: Dict[Tuple[str, str], List[CALLBACK_TYPE]] = {}
         
-        # Monthly data cache
-        self._monthly_cache = {}
-        self._cache_month = None
-        self._cache_year = None
+        # Hijri calendar and derived info, rebuilt once per day
+        self._hijri_calendar: Optional[HijriCalendar] = None
+        self._hijri_info: Optional[Dict[str, Any]] = None
+        self._hijri_info_date: Optional[date] = None
+        
+        # Azan routing rules, compiled on first use after each options change
+        self._routing: Optional["RoutingTable"] = None
+        self._routing_options: Optional[Mapping[str, Any]] = None
         
         super().__init__(
             hass,
@@ -43,146 +99,518 @@ class WaktuSolatCoordinator(DataUpdateCoordinator):
             # Reduced frequency since we cache monthly data
             update_interval=timedelta(minutes=15),  # Check every 15 minutes for prayer transitions
         )
+        # Set after super().__init__, which takes the entry from the setup context
+        self.config_entry = config_entry
+        
+        # Fetched months persist across restarts so entities come up without the network
+        self._store = timetable_store(hass, config_entry.entry_id)
+        
+        # One scheduler drives the events of every tracked zone
+        self.scheduler = WaktuSolatScheduler(hass, self)
 
-    async def _async_update_data(self) -> Dict[str, Any]:
-        """Fetch prayer times from API with intelligent caching."""
-        try:
-            current_date = date.today()
-            current_month = current_date.month
-            current_year = current_date.year
-            
-            # Check if we need to fetch new monthly data
-            need_fetch = (
-                not self._monthly_cache or
-                self._cache_month != current_month or
-                self._cache_year != current_year
-            )
-            
-            if need_fetch:
-                _LOGGER.info(
-                    "Fetching monthly prayer data for %s/%s (zone: %s)",
-                    current_month, current_year, self.zone
+    async def async_load_cache(self) -> bool:
+        """Load stored months into the index. Returns True if today's month is cached for every zone."""
+        stored = await self._store.async_load() or {}
+        for month_data in stored.get("months", []):
+            try:
+                self._index_month(
+                    month_data["zone"], month_data["year"], month_data["month"], month_data
                 )
-                self._monthly_cache = await self._fetch_monthly_prayer_times(
-                    current_year, current_month
+            except (KeyError, TypeError) as err:
+                _LOGGER.debug("Skipping invalid cached month: %s", err)
+        
+        today = dt_util.now().date()
+        cached = all(self._has_month(zone, today.year, today.month) for zone in self.zones)
+        _LOGGER.debug(
+            "Loaded %d cached month(s); today %s", len(stored.get("months", [])),
+            "cached" if cached else "not cached",
+        )
+        return cached
+
+    async def async_load_pack(self) -> bool:
+        """Fill months missing from the cache from the bundled pack.
+
+        Returns True if today's month is then available for every zone.
+        """
+        from .pack import async_get_timetable_pack
+        
+        self._pack = await async_get_timetable_pack(self.hass)
+        today = dt_util.now().date()
+        if self._pack is not None:
+            for day in (today, today + timedelta(days=1)):
+                for zone in self.zones:
+                    if self._has_month(zone, day.year, day.month):
+                        continue
+                    monthly_data = self._pack.month(zone, day.year, day.month)
+                    if monthly_data is not None:
+                        self._index_month(zone, day.year, day.month, monthly_data)
+                        self._pack_months.add((zone, day.year, day.month))
+            if self._pack_months:
+                _LOGGER.info(
+                    "📦 Serving %d month(s) from the bundled timetable until the API responds",
+                    len(self._pack_months),
                 )
-                self._cache_month = current_month
-                self._cache_year = current_year
-            else:
-                _LOGGER.debug("Using cached monthly data for %s/%s", current_month, current_year)
-            
-            # Extract today's data from monthly cache
-            today_data = self._extract_daily_data_from_cache(current_date)
-            
-            # Check if we need next day's prayer times (after Isyak)
-            current_time = dt_util.now()
-            today_isha = today_data.get("prayer_times", {}).get("isha")
-            
-            data = today_data.copy()
-            
-            if today_isha and current_time >= today_isha:
-                # After Isyak, show tomorrow's prayer times
-                tomorrow = current_date + timedelta(days=1)
-                
-                # Check if tomorrow is in a different month
-                if tomorrow.month != current_month or tomorrow.year != current_year:
-                    _LOGGER.info(
-                        "Fetching next month's data for tomorrow (%s)",
-                        tomorrow.strftime("%Y-%m-%d")
-                    )
-                    tomorrow_monthly_data = await self._fetch_monthly_prayer_times(
-                        tomorrow.year, tomorrow.month
-                    )
-                    tomorrow_data = self._extract_daily_data_from_monthly(
-                        tomorrow_monthly_data, tomorrow
-                    )
-                else:
-                    # Tomorrow is in the same cached month
-                    tomorrow_data = self._extract_daily_data_from_cache(tomorrow)
-                
-                data["next_day_prayer_times"] = tomorrow_data.get("prayer_times", {})
-                data["next_day_hijri"] = tomorrow_data.get("hijri_date", "")
+        return all(self._has_month(zone, today.year, today.month) for zone in self.zones)
+
+    async def async_revalidate_cache(self) -> None:
+        """Refetch the current month and any pack-served months.
+
+        Differences from the cached months propagate as deltas (see _index_month).
+        Pack-served months that fail here are retried on every later update.
+        """
+        today = dt_util.now().date()
+        months = {(zone, today.year, today.month) for zone in self.zones} | self._pack_months
+        results = await asyncio.gather(
+            *(self._async_fetch_shared(*key) for key in sorted(months)), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            _LOGGER.warning("Could not revalidate cached prayer times: %s", errors[0])
+
+    def _async_schedule_save(self) -> None:
+        """Persist the cached months after a short delay."""
+        self._store.async_delay_save(self._data_to_store, TIMETABLE_SAVE_DELAY)
+
+    def _data_to_store(self) -> Dict[str, Any]:
+        """Return the months worth keeping: last month onwards."""
+        today = dt_util.now().date()
+        oldest = (today.year - 1, 12) if today.month == 1 else (today.year, today.month - 1)
+        return {
+            "months": [
+                {
+                    "zone": zone,
+                    "year": year,
+                    "month": month,
+                    "prayers": list(MonthView(table, month).values()),
+                }
+                for (zone, year), table in self._tables.items()
+                for month in sorted(table.months)
+                if (year, month) >= oldest and (zone, year, month) not in self._pack_months
+            ]
+        }
+
+    async def _async_update_data(self) -> Dict[str, Any]:
+        """Fetch prayer times for every tracked zone with intelligent caching."""
+        current_date = dt_util.now().date()
+        
+        # Bundled pack months count as cached, so keep asking the API until it confirms them.
+        # The first refresh skips this: setup must not wait on the network (see async_revalidate_cache)
+        if self._pack_months and self.data is not None:
+            await self._async_refetch_pack_months()
+        
+        # All zones are built concurrently; month fetches share the bounded semaphore
+        results = await asyncio.gather(
+            *(self._async_build_zone_data(zone, current_date) for zone in self.zones),
+            return_exceptions=True,
+        )
+        
+        previous_zones = (self.data or {}).get("zones", {})
+        zones_data = {}
+        for zone, result in zip(self.zones, results):
+            if isinstance(result, Exception):
+                if zone == self.zone:
+                    _LOGGER.error("Error fetching prayer times: %s", result)
+                    raise UpdateFailed(f"Error fetching prayer times: {result}")
+                _LOGGER.warning("Error fetching prayer times for zone %s: %s", zone, result)
+                if zone in previous_zones:
+                    zones_data[zone] = previous_zones[zone]
+                continue
+            zones_data[zone] = result
+        
+        # The primary zone stays at the top level for single-zone consumers
+        data = dict(zones_data[self.zone])
+        data["hijri"] = self._get_hijri_info(current_date, data.get("hijri_date"))
+        data["zones"] = zones_data
+        
+        _LOGGER.debug(
+            "Prayer times updated successfully for %s (%d zone(s))", current_date, len(zones_data)
+        )
+        return data
+
+    async def _async_refetch_pack_months(self) -> None:
+        """Replace pack-served months with API data; they keep serving if the API fails."""
+        keys = sorted(self._pack_months)
+        results = await asyncio.gather(
+            *(self._async_fetch_shared(*key) for key in keys), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            _LOGGER.debug(
+                "Still serving %d bundled month(s); API fetch failed: %s", len(errors), errors[0]
+            )
+
+    async def _async_build_zone_data(self, zone: str, current_date: date) -> Dict[str, Any]:
+        """Build today's (and after Isyak, tomorrow's) data for a zone from the month index."""
+        await self.async_get_month_index(current_date.year, current_date.month, zone)
+        today_data = self._extract_daily_data_from_cache(current_date, zone)
+        
+        # Check if we need next day's prayer times (after Isyak)
+        current_time = dt_util.now()
+        today_isha = today_data.get("prayer_times", {}).get("isha")
+        
+        data = today_data.copy()
+        
+        if today_isha and current_time >= today_isha:
+            # After Isyak, show tomorrow's prayer times (fetching next month if needed)
+            tomorrow = current_date + timedelta(days=1)
+            await self.async_get_month_index(tomorrow.year, tomorrow.month, zone)
+            tomorrow_data = self._extract_daily_data_from_cache(tomorrow, zone)
             
-            _LOGGER.debug("Prayer times updated successfully for %s", current_date)
-            return data
+            data["next_day_prayer_times"] = tomorrow_data.get("prayer_times", {})
+            data["next_day_derived_times"] = tomorrow_data.get("derived_times", {})
+            data["next_day_hijri"] = tomorrow_data.get("hijri_date", "")
+        
+        return data
+
+    @property
+    def api_base_url(self) -> str:
+        """Return the API base URL, honouring the options override."""
+        return (self.config_entry.options.get(CONF_API_BASE_URL) or API_BASE_URL).rstrip("/")
+
+    @property
+    def reminder_minutes(self) -> int:
+        """Return how many minutes before each azan the spoken reminder plays; 0 if disabled."""
+        return int(self.config_entry.options.get(CONF_REMINDER_MINUTES) or 0)
+
+    @property
+    def routing(self) -> "RoutingTable":
+        """Return the compiled azan routing rules of the current options."""
+        options = self.config_entry.options
+        # Updating an entry replaces its options mapping
+        if self._routing is None or self._routing_options is not options:
+            from .routing import Route, compile_routing
             
-        except Exception as err:
-            _LOGGER.error("Error fetching prayer times: %s", err)
-            raise UpdateFailed(f"Error fetching prayer times: {err}")
+            media_player = options.get(CONF_MEDIA_PLAYER)
+            default = Route(
+                (media_player,) if media_player else (),
+                options.get(CONF_AZAN_VOLUME, 0.7),
+                fade_in=options.get(CONF_AZAN_FADE_IN) or 0,
+            )
+            self._routing = compile_routing(options.get(CONF_ROUTING_RULES), default)
+            self._routing_options = options
+        return self._routing
+
+    def get_zone_data(self, zone: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the current data for a tracked zone."""
+        if not self.data:
+            return None
+        if zone is None or zone == self.zone:
+            return self.data
+        return self.data.get("zones", {}).get(zone)
+
+    def get_day_data(self, zone: str, target_date: date) -> Optional[Dict[str, Any]]:
+        """Return the raw day entry for a zone and date, if its month is cached."""
+        table = self._tables.get((zone, target_date.year))
+        return table.day_dict(target_date.month, target_date.day) if table else None
+
+    def get_derived_day(self, zone: str, target_date: date) -> Dict[str, int]:
+        """Return the derived timestamps for a zone and date, if its month is cached."""
+        table = self._tables.get((zone, target_date.year))
+        return table.derived_dict(target_date.month, target_date.day) if table else {}
+
+    def _get_hijri_info(self, current_date: date, api_hijri: Optional[str]) -> Dict[str, Any]:
+        """Return today's Hijri info, rebuilding the calendar when the day changes."""
+        if self._hijri_info is not None and self._hijri_info_date == current_date:
+            return self._hijri_info
+        
+        correction = compute_correction(current_date, api_hijri)
+        self._hijri_calendar = HijriCalendar(current_date, HIJRI_CALENDAR_DAYS, correction)
+        self._hijri_info = build_hijri_info(self._hijri_calendar, current_date, api_hijri)
+        self._hijri_info_date = current_date
+        _LOGGER.debug("Hijri calendar rebuilt for %s (correction: %+d)", current_date, correction)
+        return self._hijri_info
 
-    def _extract_daily_data_from_cache(self, target_date: date) -> Dict[str, Any]:
-        """Extract specific day's data from cached monthly data."""
-        if not self._monthly_cache:
+    @property
+    def hijri_calendar(self) -> Optional[HijriCalendar]:
+        """Return the precomputed Hijri calendar."""
+        return self._hijri_calendar
+
+    def _extract_daily_data_from_cache(self, target_date: date, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Extract specific day's data from the cached month index."""
+        zone = zone or self.zone
+        if not self._has_month(zone, target_date.year, target_date.month):
             raise UpdateFailed("No cached monthly data available")
         
-        return self._extract_daily_data_from_monthly(self._monthly_cache, target_date)
+        return self._extract_daily_data_from_monthly({"zone": zone}, target_date)
 
     def _extract_daily_data_from_monthly(self, monthly_data: Dict[str, Any], target_date: date) -> Dict[str, Any]:
         """Extract specific day's data from monthly API response."""
-        prayers_data = monthly_data.get("prayers", [])
         target_day = target_date.day
+        zone = monthly_data.get("zone", self.zone)
         
-        # Find the specific day's data
-        day_data = None
-        for prayer_day in prayers_data:
-            if prayer_day.get("day") == target_day:
-                day_data = prayer_day
-                break
-        
-        if not day_data:
-            raise UpdateFailed(f"No prayer data found for day {target_day}")
-        
-        # Convert Unix timestamps to datetime objects
-        prayer_times = {}
-        for prayer in PRAYER_TIMES:
-            if prayer in day_data:
-                timestamp = day_data[prayer]
-                prayer_times[prayer] = datetime.fromtimestamp(timestamp)
+        # Read the table row when this month has been ingested, else scan
+        table = self._tables.get((zone, target_date.year))
+        row = table.row(target_date.month, target_day) if table else None
+        if row is not None:
+            epoch = table.epoch
+            prayer_times = {
+                prayer: _to_local(epoch + row[COLUMN_INDEX[prayer]])
+                for prayer in PRAYER_TIMES
+                if row[COLUMN_INDEX[prayer]] != MISSING
+            }
+            derived_times = {
+                name: _to_local(epoch + row[COLUMN_INDEX[name]])
+                for name in DERIVED_TIMES
+                if row[COLUMN_INDEX[name]] != MISSING
+            }
+            hijri = table.hijri(target_date.month, target_day)
+        else:
+            day_data = None
+            for prayer_day in monthly_data.get("prayers", []):
+                if prayer_day.get("day") == target_day:
+                    day_data = prayer_day
+                    break
+            if not day_data:
+                raise UpdateFailed(f"No prayer data found for day {target_day}")
+            
+            # Convert Unix timestamps to datetime objects
+            prayer_times = {}
+            for prayer in PRAYER_TIMES:
+                if prayer in day_data:
+                    prayer_times[prayer] = _to_local(day_data[prayer])
+            derived_times = {}
+            hijri = day_data.get("hijri", "")
         
         return {
             "prayer_times": prayer_times,
-            "hijri_date": day_data.get("hijri", ""),
+            "derived_times": derived_times,
+            "hijri_date": hijri,
             "zone": monthly_data.get("zone", self.zone),
             "date": target_date.strftime("%Y-%m-%d"),
         }
 
-    async def _fetch_monthly_prayer_times(self, year: int, month: int) -> Dict[str, Any]:
+    def _index_month(self, zone: str, year: int, month: int, monthly_data: Dict[str, Any]) -> MonthView:
+        """Store a monthly API response in the zone's table and return its day view."""
+        table = self._tables.get((zone, year))
+        if table is None:
+            table = self._tables[(zone, year)] = ZoneYearTable(zone, year)
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        changes = table.ingest_month(
+            month, monthly_data.get("prayers", []), self._first_fajr(zone, next_year, next_month)
+        )
+        self._month_ingested_at[(zone, year, month)] = time.time()
+        self._pack_months.discard((zone, year, month))
+        if changes:
+            self.hass.async_create_task(self._async_apply_changes(zone, year, month, changes))
+        
+        # The previous month's last night ends at this month's first Subuh, approximated until now
+        previous_year, previous_month = (year - 1, 12) if month == 1 else (year, month - 1)
+        first_fajr = table.first_fajr(month)
+        if first_fajr is not None and self._has_month(zone, previous_year, previous_month):
+            relinked = self._tables[(zone, previous_year)].relink_last_day(previous_month, first_fajr)
+            # Before the first refresh nothing holds the approximate times yet
+            if relinked and self.data is not None:
+                self.hass.async_create_task(
+                    self._async_apply_changes(zone, previous_year, previous_month, relinked)
+                )
+        return MonthView(table, month)
+
+    def _first_fajr(self, zone: str, year: int, month: int) -> Optional[int]:
+        """Return the first Subuh of an ingested month, or None."""
+        if not self._has_month(zone, year, month):
+            return None
+        return self._tables[(zone, year)].first_fajr(month)
+
+    async def _async_apply_changes(self, zone: str, year: int, month: int, changes: List[CellChange]) -> None:
+        """Propagate changed cells of a re-ingested month to the data, schedule and listeners."""
+        _LOGGER.info(
+            "🔄 %d prayer time cell(s) changed for %s %d-%02d", len(changes), zone, year, month
+        )
+        self.scheduler.async_apply_changes(zone, changes)
+        
+        # Only today's data (and tomorrow's, shown after Isyak) is held by entities
+        today = dt_util.now().date()
+        if self.data and zone in self.data.get("zones", {}) and any(
+            change.day in (today, today + timedelta(days=1)) for change in changes
+        ):
+            if zone == self.zone and any(change.name == HIJRI for change in changes):
+                self._hijri_info = None
+            zone_data = await self._async_build_zone_data(zone, today)
+            zones = dict(self.data["zones"])
+            zones[zone] = zone_data
+            if zone == self.zone:
+                data = dict(zone_data)
+                data["hijri"] = self._get_hijri_info(today, zone_data.get("hijri_date"))
+            else:
+                data = dict(self.data)
+            data["zones"] = zones
+            # Listeners are not notified wholesale; only entities showing a changed cell update
+            self.data = data
+        
+        actions = {
+            action for change in changes for action in self._cell_listeners.get((zone, change.name), [])
+        }
+        for action in actions:
+            action()
+        
+        self.hass.bus.async_fire(
+            EVENT_TIMETABLE_CHANGED,
+            {
+                "entry_id": self.config_entry.entry_id,
+                "zone": zone,
+                "year": year,
+                "month": month,
+                "changes": [
+                    {
+                        "date": change.day.isoformat(),
+                        "name": change.name,
+                        "old": _to_local(change.old).isoformat() if isinstance(change.old, int) else change.old,
+                        "new": _to_local(change.new).isoformat() if isinstance(change.new, int) else change.new,
+                    }
+                    for change in changes
+                ],
+            },
+        )
+
+    @callback
+    def async_add_cell_listener(self, zone: str, names: Iterable[str], action: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call an action when a zone's cells of the given names change. Returns an unsubscribe function."""
+        keys = [(zone, name) for name in names]
+        for key in keys:
+            self._cell_listeners.setdefault(key, []).append(action)
+
+        @callback
+        def remove_listener() -> None:
+            for key in keys:
+                if action in self._cell_listeners.get(key, []):
+                    self._cell_listeners[key].remove(action)
+
+        return remove_listener
+
+    def _has_month(self, zone: str, year: int, month: int) -> bool:
+        """Return whether a month has been ingested for a zone."""
+        table = self._tables.get((zone, year))
+        return table is not None and month in table.months
+
+    def get_derived_index(self, year: int, month: int, zone: Optional[str] = None) -> Mapping[int, Dict[str, int]]:
+        """Return the precomputed derived times for an ingested month."""
+        zone = zone or self.zone
+        if not self._has_month(zone, year, month):
+            return {}
+        return MonthView(self._tables[(zone, year)], month, derived=True)
+
+    async def async_get_month_index(self, year: int, month: int, zone: Optional[str] = None) -> Mapping[int, Dict[str, Any]]:
+        """Return the day-indexed data for a month, fetching it if not cached."""
+        zone = zone or self.zone
+        cached = self._has_month(zone, year, month)
+        self.fetch_stats.record_lookup(cached)
+        if not cached:
+            await self._async_fetch_shared(zone, year, month)
+        return MonthView(self._tables[(zone, year)], month)
+
+    def _async_fetch_shared(self, zone: str, year: int, month: int) -> asyncio.Task:
+        """Return the fetch of a month; concurrent callers share a single request."""
+        key = (zone, year, month)
+        pending = self._pending_fetches.get(key)
+        if pending is None:
+            pending = self.hass.async_create_task(
+                self._fetch_monthly_prayer_times(year, month, zone)
+            )
+            self._pending_fetches[key] = pending
+            pending.add_done_callback(lambda _: self._pending_fetches.pop(key, None))
+        return pending
+
+    async def async_get_range_index(
+        self, start: date, end: date, zone: Optional[str] = None
+    ) -> List[Tuple[Tuple[int, int], Mapping[int, Dict[str, Any]], Mapping[int, Dict[str, int]]]]:
+        """Return day-indexed months and their derived times covering a date range, in order."""
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        indexes = await asyncio.gather(
+            *(self.async_get_month_index(y, m, zone) for y, m in months)
+        )
+        return [
+            ((y, m), day_index, self.get_derived_index(y, m, zone))
+            for (y, m), day_index in zip(months, indexes)
+        ]
+
+    async def _fetch_monthly_prayer_times(self, year: int, month: int, zone: Optional[str] = None) -> Dict[str, Any]:
         """Fetch monthly prayer times from API."""
-        url = f"{API_BASE_URL}/v2/solat/{self.zone}"
+        zone = zone or self.zone
+        async with self._fetch_semaphore:
+            start = time.monotonic()
+            try:
+                monthly_data = await self._async_fetch_month(zone, year, month)
+            except Exception as err:
+                self.fetch_stats.record_fetch(time.monotonic() - start, err)
+                raise
+            self.fetch_stats.record_fetch(time.monotonic() - start)
+            return monthly_data
+
+    def cache_summary(self) -> List[Dict[str, Any]]:
+        """Describe the cached months for diagnostics."""
+        now = time.time()
+        return [
+            {
+                "zone": zone,
+                "year": year,
+                "month": month,
+                "days": len(table.month_days(month)),
+                "table_bytes": table.nbytes,
+                "source": "pack" if (zone, year, month) in self._pack_months else "api",
+                "age_seconds": round(now - self._month_ingested_at.get((zone, year, month), now)),
+            }
+            for (zone, year), table in sorted(self._tables.items())
+            for month in sorted(table.months)
+        ]
+
+    def pack_summary(self) -> Optional[Dict[str, Any]]:
+        """Describe the bundled pack for diagnostics."""
+        if self._pack is None:
+            return None
+        return self._pack.as_dict() | {
+            "serving": [f"{zone}/{year}-{month:02d}" for zone, year, month in sorted(self._pack_months)]
+        }
+
+    async def _async_fetch_month(self, zone: str, year: int, month: int) -> Dict[str, Any]:
+        """Fetch and index one month of prayer times for a zone."""
+        url = f"{self.api_base_url}/v2/solat/{zone}"
         params = {"year": year, "month": month}
         
         _LOGGER.debug("Fetching monthly data from: %s with params: %s", url, params)
         
+        # HTTP machinery is only loaded on the first network fetch (often none with a stored timetable)
+        import aiohttp
+        from homeassistant.helpers.aiohttp_client import async_get_clientsession
+        
+        session = async_get_clientsession(self.hass)
         try:
-            async with async_timeout.timeout(API_TIMEOUT):
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            json_data = await response.json()
-                            
-                            # Validate response structure
-                            if not isinstance(json_data, dict) or "prayers" not in json_data:
-                                raise UpdateFailed(
-                                    f"Invalid API response structure: {list(json_data.keys()) if isinstance(json_data, dict) else type(json_data)}"
-                                )
-                            
-                            prayers_data = json_data["prayers"]
-                            if not isinstance(prayers_data, list) or not prayers_data:
-                                raise UpdateFailed("No prayer data in API response")
-                            
-                            _LOGGER.info(
-                                "Successfully fetched %d days of prayer data for %s/%s",
-                                len(prayers_data), month, year
+            async with asyncio.timeout(API_TIMEOUT):
+                async with session.get(url, params=params) as response:
+                    if response.status == 200:
+                        json_data = await response.json()
+                        
+                        # Validate response structure
+                        if not isinstance(json_data, dict) or "prayers" not in json_data:
+                            raise UpdateFailed(
+                                f"Invalid API response structure: {list(json_data.keys()) if isinstance(json_data, dict) else type(json_data)}"
                             )
-                            return json_data
-                        else:
-                            error_text = await response.text()
-                            raise UpdateFailed(f"API request failed with status {response.status}: {error_text}")
-                            
+                        
+                        prayers_data = json_data["prayers"]
+                        if not isinstance(prayers_data, list) or not prayers_data:
+                            raise UpdateFailed("No prayer data in API response")
+                        
+                        _LOGGER.info(
+                            "Successfully fetched %d days of prayer data for %s/%s (zone: %s)",
+                            len(prayers_data), month, year, zone
+                        )
+                        self._index_month(zone, year, month, json_data)
+                        self._async_schedule_save()
+                        return json_data
+                    else:
+                        error_text = await response.text()
+                        raise UpdateFailed(f"API request failed with status {response.status}: {error_text}")
+                        
         except asyncio.TimeoutError:
             raise UpdateFailed("API request timed out")
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"API request failed: {err}")
+        except ValueError as err:
+            raise UpdateFailed(f"Invalid JSON in API response: {err}")
 
     async def _fetch_prayer_times_for_date(self, target_date: date) -> Dict[str, Any]:
         """Legacy method - now uses monthly caching for efficiency."""
@@ -215,7 +643,7 @@ class WaktuSolatCoordinator(DataUpdateCoordinator):
             for prayer in PRAYER_TIMES:
                 prayer_time = next_day_times.get(prayer)
                 if prayer_time:
-        return {
+                    return {
                         "prayer": prayer,
                         "malay_name": PRAYER_NAMES.get(prayer, prayer),
                         "time": prayer_time,
@@ -0,0 +1,47 @@
+"""Derived times (Imsak, Dhuha, Islamic midnight, last third) for Waktu Solat Malaysia."""
+from typing import Any, Dict, Optional
+
+from .const import IMSAK_OFFSET_MINUTES, DHUHA_OFFSET_MINUTES
+
+SECONDS_PER_DAY = 86400
+
+
+def compute_derived_times(
+    day_index: Dict[int, Dict[str, Any]], following_fajr: Optional[Dict[int, int]] = None
+) -> Dict[int, Dict[str, int]]:
+    """Compute derived Unix timestamps for every day of an indexed month in one pass.
+
+    The night runs from Maghrib to the next day's Subuh. Subuhs outside the
+    index can be given per day in following_fajr, e.g. the next month's first
+    for the last day. Otherwise the next Subuh is approximated as 24 hours
+    after today's, which is within a minute of the published time.
+    """
+    following_fajr = following_fajr or {}
+    derived = {}
+    days = sorted(day_index)
+    for position, day in enumerate(days):
+        day_data = day_index[day]
+        fajr = day_data.get("fajr")
+        syuruk = day_data.get("syuruk")
+        maghrib = day_data.get("maghrib")
+        
+        next_fajr = None
+        if position + 1 < len(days) and days[position + 1] == day + 1:
+            next_fajr = day_index[days[position + 1]].get("fajr")
+        elif day in following_fajr:
+            next_fajr = following_fajr[day]
+        elif fajr:
+            next_fajr = fajr + SECONDS_PER_DAY
+        
+        times = {}
+        if fajr:
+            times["imsak"] = fajr - IMSAK_OFFSET_MINUTES * 60
+        if syuruk:
+            times["dhuha"] = syuruk + DHUHA_OFFSET_MINUTES * 60
+        if maghrib and next_fajr:
+            night = next_fajr - maghrib
+            times["midnight"] = maghrib + night // 2
+            times["last_third"] = maghrib + night * 2 // 3
+        derived[day] = times
+    
+    return derived
@@ -0,0 +1,157 @@
+"""Diagnostics support for Waktu Solat Malaysia."""
+from typing import Any, Dict, Mapping, Optional
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import _get_audio_urls
+from .const import (
+    DOMAIN,
+    DATA_AUDIO_VARIANTS,
+    DATA_PLAYBACK_ARBITER,
+    DATA_MEDIA_SNAPSHOTS,
+    DATA_AUDIO_CANDIDATES,
+    DATA_PLAYER_CAPABILITIES,
+    DATA_REMINDER_AUDIO,
+    DATA_VOLUME_FADER,
+    AZAN_PRAYERS,
+    AUDIO_URL_PATH,
+    CONF_AUDIO_SOURCE,
+    CONF_MEDIA_PLAYER,
+    CONF_ROUTING_RULES,
+    AUDIO_SOURCE_BUNDLED,
+    CONF_REMOTE_AZAN_URL,
+    CONF_REMOTE_FAJR_URL,
+    SCHEDULE_KIND_PRAYER,
+)
+from .coordinator import WaktuSolatCoordinator
+from .telemetry import async_get_playback_traces
+
+# Remote audio URLs may embed access tokens
+TO_REDACT = {CONF_REMOTE_AZAN_URL, CONF_REMOTE_FAJR_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: WaktuSolatCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    audio_source = entry.options.get(CONF_AUDIO_SOURCE, AUDIO_SOURCE_BUNDLED)
+    audio_resolution = {}
+    for prayer in AZAN_PRAYERS:
+        urls = await _get_audio_urls(
+            hass, prayer, audio_source, entry, entry.options.get(CONF_MEDIA_PLAYER)
+        )
+        audio_resolution[prayer] = [_redact_url(url) for url in urls]
+
+    variants = hass.data.get(DATA_AUDIO_VARIANTS)
+    arbiter = hass.data.get(DATA_PLAYBACK_ARBITER)
+    media_state = hass.data.get(DATA_MEDIA_SNAPSHOTS)
+    candidates = hass.data.get(DATA_AUDIO_CANDIDATES)
+    capabilities = hass.data.get(DATA_PLAYER_CAPABILITIES)
+    reminders = hass.data.get(DATA_REMINDER_AUDIO)
+    fader = hass.data.get(DATA_VOLUME_FADER)
+    routing = coordinator.routing
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": _redact_options(entry.options),
+        },
+        "coordinator": {
+            "zones": coordinator.zones,
+            "api_base_url": coordinator.api_base_url,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval_seconds": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval else None,
+            "cache": coordinator.cache_summary(),
+            "timetable_pack": coordinator.pack_summary(),
+            "pending_fetches": [
+                f"{zone}/{year}-{month:02d}" for zone, year, month in coordinator._pending_fetches
+            ],
+            "fetch_stats": coordinator.fetch_stats.as_dict(),
+            "setup_timings_ms": coordinator.setup_timings.as_dict() if coordinator.setup_timings else None,
+            "hijri": (coordinator.data or {}).get("hijri"),
+        },
+        "schedule": [
+            {
+                "time": dt_util.as_local(item.when).isoformat(),
+                "zone": item.zone,
+                "kind": item.kind,
+                "name": item.name,
+            }
+            for item in coordinator.scheduler.upcoming
+        ],
+        "routing": {
+            "rules": [
+                {**_redact_route(rule), "route": _redact_route(rule["route"])} for rule in routing.as_list()
+            ],
+            "upcoming": [
+                {
+                    "time": dt_util.as_local(item.when).isoformat(),
+                    "prayer": item.name,
+                    **_redact_route(routing.resolve(item.name, dt_util.as_local(item.when))._asdict()),
+                }
+                for item in coordinator.scheduler.upcoming
+                if item.kind == SCHEDULE_KIND_PRAYER
+                and item.zone == coordinator.zone
+                and item.name in AZAN_PRAYERS
+            ],
+        },
+        "reminders": {
+            "minutes": coordinator.reminder_minutes,
+            "audio": reminders.as_dict() if reminders else None,
+        },
+        "azan_latency_ms": coordinator.azan_latency.as_dict(),
+        "playback_traces": [
+            _redact_trace(trace.as_dict())
+            for trace in async_get_playback_traces(hass)
+            if trace.entry_id in (None, entry.entry_id)
+        ],
+        "playback_queue": arbiter.as_dict() if arbiter else None,
+        "media_restore": media_state.as_dict() if media_state else None,
+        "player_capabilities": capabilities.as_dict() if capabilities else None,
+        "volume_fades": fader.as_dict() if fader else None,
+        "audio": {
+            "source": audio_source,
+            "resolution": audio_resolution,
+            "variants": variants.as_dict() if variants else None,
+            "candidates": [
+                {**candidate, "url": _redact_url(candidate["url"])}
+                for candidate in candidates.as_list()
+            ] if candidates else None,
+        },
+    }
+
+
+def _redact_url(url: Optional[str]) -> Optional[str]:
+    """Hide any URL not served by the integration itself."""
+    return url if not url or url.startswith(AUDIO_URL_PATH) else REDACTED
+
+
+def _redact_options(options: Mapping[str, Any]) -> Dict[str, Any]:
+    """Hide remote audio URLs in the options, including those of routing rules."""
+    redacted = async_redact_data(dict(options), TO_REDACT)
+    rules = redacted.get(CONF_ROUTING_RULES)
+    if isinstance(rules, list):
+        redacted[CONF_ROUTING_RULES] = [
+            _redact_route(rule) if isinstance(rule, dict) else rule for rule in rules
+        ]
+    return redacted
+
+
+def _redact_route(route: Dict[str, Any]) -> Dict[str, Any]:
+    """Hide the remote audio URL of a routing rule or route."""
+    if str(route.get("audio_file") or "").startswith(("http://", "https://")):
+        route = {**route, "audio_file": REDACTED}
+    return route
+
+
+def _redact_trace(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """Hide URLs in a playback trace that the integration does not serve."""
+    trace["url"] = _redact_url(trace["url"])
+    return trace
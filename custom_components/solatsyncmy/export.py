@@ -0,0 +1,128 @@
+"""Timetable export to CSV and iCalendar for Waktu Solat Malaysia."""
+import csv
+import logging
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PRAYER_TIMES,
+    PRAYER_NAMES,
+    AZAN_PRAYERS,
+    DERIVED_TIMES,
+    DERIVED_TIME_NAMES,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_ICS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MonthIndex = List[Tuple[Tuple[int, int], Mapping[int, Dict[str, Any]], Mapping[int, Dict[str, int]]]]
+
+CSV_HEADER = ["date", "hijri"] + PRAYER_TIMES + DERIVED_TIMES
+
+
+def iter_timetable_days(
+    months: MonthIndex, start: date, end: date
+) -> Iterator[Tuple[date, Dict[str, Any], Dict[str, int]]]:
+    """Yield (date, day_data, derived) from day-indexed months within [start, end]."""
+    for (year, month), day_index, derived_index in months:
+        for day in sorted(day_index):
+            current = date(year, month, day)
+            if start <= current <= end:
+                yield current, day_index[day], derived_index.get(day, {})
+
+
+def _local_time(timestamp: int) -> datetime:
+    """Convert an API Unix timestamp to a local datetime."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+
+
+def _write_csv(handle, zone: str, months: MonthIndex, start: date, end: date) -> int:
+    """Write CSV rows one day at a time, returning the number of days written."""
+    writer = csv.writer(handle)
+    writer.writerow(CSV_HEADER)
+    count = 0
+    for current, day_data, derived in iter_timetable_days(months, start, end):
+        row = [current.isoformat(), day_data.get("hijri", "")]
+        for prayer in PRAYER_TIMES:
+            timestamp = day_data.get(prayer)
+            row.append(_local_time(timestamp).strftime("%H:%M") if timestamp else "")
+        for name in DERIVED_TIMES:
+            timestamp = derived.get(name)
+            row.append(_local_time(timestamp).strftime("%H:%M") if timestamp else "")
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _write_event(
+    handle, zone: str, current: date, key: str, summary: str,
+    timestamp: int, category: str, stamp: str, hijri: str,
+) -> None:
+    """Write a single VEVENT."""
+    start_utc = dt_util.utc_from_timestamp(timestamp).strftime("%Y%m%dT%H%M%SZ")
+    handle.write(
+        "BEGIN:VEVENT\r\n"
+        f"UID:{zone}-{current:%Y%m%d}-{key}@solatsyncmy\r\n"
+        f"DTSTAMP:{stamp}\r\n"
+        f"DTSTART:{start_utc}\r\n"
+        f"SUMMARY:{summary}\r\n"
+        f"DESCRIPTION:{zone} {hijri}\r\n"
+        f"CATEGORIES:{category}\r\n"
+        "TRANSP:TRANSPARENT\r\n"
+        "END:VEVENT\r\n"
+    )
+
+
+def _write_ics(handle, zone: str, months: MonthIndex, start: date, end: date) -> int:
+    """Write iCalendar events one day at a time, returning the number of days written."""
+    stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    handle.write("BEGIN:VCALENDAR\r\n")
+    handle.write("VERSION:2.0\r\n")
+    handle.write("PRODID:-//Solat Sync MY//Prayer Times//EN\r\n")
+    handle.write("CALSCALE:GREGORIAN\r\n")
+    handle.write(f"X-WR-CALNAME:Waktu Solat {zone}\r\n")
+    count = 0
+    for current, day_data, derived in iter_timetable_days(months, start, end):
+        for prayer in PRAYER_TIMES:
+            timestamp = day_data.get(prayer)
+            if not timestamp:
+                continue
+            category = "Azan" if prayer in AZAN_PRAYERS else "Prayer Times"
+            _write_event(handle, zone, current, prayer, PRAYER_NAMES.get(prayer, prayer),
+                         timestamp, category, stamp, day_data.get("hijri", ""))
+        for name in DERIVED_TIMES:
+            timestamp = derived.get(name)
+            if not timestamp:
+                continue
+            _write_event(handle, zone, current, name, DERIVED_TIME_NAMES.get(name, name),
+                         timestamp, "Reminder", stamp, day_data.get("hijri", ""))
+        count += 1
+    handle.write("END:VCALENDAR\r\n")
+    return count
+
+
+_WRITERS = {
+    EXPORT_FORMAT_CSV: _write_csv,
+    EXPORT_FORMAT_ICS: _write_ics,
+}
+
+
+def write_timetable(path: str, fmt: str, zone: str, months: MonthIndex, start: date, end: date) -> int:
+    """Stream a timetable to disk. Runs in the executor.
+
+    Rows are written as they are produced from the day index, so the whole
+    document is never held in memory. The file is written to a temporary
+    name and moved into place once complete.
+    """
+    writer = _WRITERS[fmt]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as handle:
+        count = writer(handle, zone, months, start, end)
+    os.replace(tmp_path, path)
+    _LOGGER.info("📄 Exported %d days for %s to %s", count, zone, path)
+    return count
@@ -0,0 +1,96 @@
+"""Volume fade-in for azan playback.
+
+The azan starts at a low level and one task per media player ramps the
+volume to the target with a bounded number of volume_set calls. The ramp
+starts only once the player reports the azan playing, so it never delays
+the first audible sample; steps follow a fixed timetable from that point,
+so a slow volume_set does not stretch the ramp. A new ramp, the end of the
+azan or restoring the player's state cancels a running one.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_VOLUME_FADER,
+    AZAN_FADE_MAX_STEPS,
+    AZAN_FADE_MIN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def ramp_levels(start: float, target: float, duration: float) -> List[float]:
+    """Return the volume of each step of a ramp, ending at the target."""
+    steps = max(1, min(AZAN_FADE_MAX_STEPS, int(duration / AZAN_FADE_MIN_INTERVAL)))
+    return [round(start + (target - start) * step / steps, 3) for step in range(1, steps + 1)]
+
+
+class VolumeFader:
+    """Volume ramps in progress, at most one per media player."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize with no ramps."""
+        self.hass = hass
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"started": 0, "completed": 0, "cancelled": 0, "failed": 0, "volume_calls": 0}
+
+    def start(self, media_player: str, start: float, target: float, duration: float) -> asyncio.Task:
+        """Ramp a player's volume from its start level to the target in the background."""
+        self.cancel(media_player)
+        task = self.hass.async_create_background_task(
+            self._async_ramp(media_player, start, target, duration),
+            f"solatsyncmy volume fade {media_player}",
+        )
+        self._tasks[media_player] = task
+        task.add_done_callback(
+            lambda done: self._tasks.pop(media_player, None) if self._tasks.get(media_player) is done else None
+        )
+        self.stats["started"] += 1
+        _LOGGER.debug("🎚️ Fading in %s from %.2f to %.2f over %.0f s", media_player, start, target, duration)
+        return task
+
+    def cancel(self, media_player: str) -> bool:
+        """Stop a player's ramp at its current level. Returns True if one was running."""
+        task = self._tasks.pop(media_player, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        self.stats["cancelled"] += 1
+        return True
+
+    async def _async_ramp(self, media_player: str, start: float, target: float, duration: float) -> None:
+        """Set each step's volume on schedule."""
+        levels = ramp_levels(start, target, duration)
+        interval = duration / len(levels)
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        try:
+            for step, level in enumerate(levels, 1):
+                await asyncio.sleep(max(0, began + step * interval - loop.time()))
+                await self.hass.services.async_call(
+                    "media_player",
+                    "volume_set",
+                    {"entity_id": media_player, "volume_level": level},
+                    blocking=True,
+                )
+                self.stats["volume_calls"] += 1
+        except Exception as err:
+            _LOGGER.warning("⚠️ Volume fade on %s stopped: %s", media_player, err)
+            self.stats["failed"] += 1
+            return
+        self.stats["completed"] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe running ramps and totals for diagnostics."""
+        return {"fading": sorted(self._tasks), **self.stats}
+
+
+def async_get_fader(hass: HomeAssistant) -> VolumeFader:
+    """Return the fader shared by every entry."""
+    fader = hass.data.get(DATA_VOLUME_FADER)
+    if fader is None:
+        fader = hass.data[DATA_VOLUME_FADER] = VolumeFader(hass)
+    return fader
@@ -0,0 +1,229 @@
+"""GPS to JAKIM zone resolution for Waktu Solat Malaysia.
+
+Zone boundaries are loaded from the bundled zone_boundaries.json. A zone may
+carry polygons (tested with ray casting) and reference points (district
+towns). Points outside every polygon resolve to the zone of the nearest
+reference point. A uniform grid over Malaysia keeps the candidate set per
+lookup to a handful of polygons and points.
+"""
+import json
+import logging
+import math
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    DATA_ZONE_LOCATOR,
+    CONF_ZONE,
+    CONF_ZONE_TRACKER,
+    GEO_GRID_BOUNDS,
+    GEO_GRID_CELL_DEGREES,
+    GEO_MAX_DISTANCE_KM,
+    GEO_ZONE_CONFIRMATIONS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BOUNDARIES_FILE = os.path.join(os.path.dirname(__file__), "zone_boundaries.json")
+
+# A fixed longitude scale keeps the metric Euclidean (so grid pruning is exact);
+# cos(4.5°) is within 1% of the true scale anywhere in Malaysia
+_LON_SCALE = math.cos(math.radians(4.5))
+_KM_PER_DEGREE = 111.32
+
+Ring = List[Tuple[float, float]]
+
+
+def _point_in_ring(lat: float, lon: float, ring: Ring) -> bool:
+    """Return True if a point lies inside a polygon ring (ray casting)."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        lat_i, lon_i = ring[i]
+        lat_j, lon_j = ring[j]
+        if (lat_i > lat) != (lat_j > lat):
+            cross = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+class ZoneLocator:
+    """Grid-indexed point-in-polygon and nearest-point zone lookup."""
+
+    def __init__(self, boundaries: Dict[str, Dict[str, list]]) -> None:
+        """Build the grid index from zone boundary data."""
+        self.min_lat, self.min_lon, self.max_lat, self.max_lon = GEO_GRID_BOUNDS
+        self.cell = GEO_GRID_CELL_DEGREES
+        self.rows = math.ceil((self.max_lat - self.min_lat) / self.cell)
+        self.cols = math.ceil((self.max_lon - self.min_lon) / self.cell)
+
+        self._polygons: List[Tuple[str, Ring, Tuple[float, float, float, float]]] = []
+        self._points: List[Tuple[str, float, float]] = []
+        for zone, shapes in boundaries.items():
+            for ring in shapes.get("polygons", []):
+                ring = [(float(lat), float(lon)) for lat, lon in ring]
+                lats = [lat for lat, _ in ring]
+                lons = [lon for _, lon in ring]
+                self._polygons.append((zone, ring, (min(lats), min(lons), max(lats), max(lons))))
+            for lat, lon in shapes.get("points", []):
+                self._points.append((zone, float(lat), float(lon) * _LON_SCALE))
+
+        self._cell_polygons: List[List[int]] = []
+        self._cell_points: List[List[int]] = []
+        half_diagonal = math.hypot(self.cell, self.cell * _LON_SCALE) / 2
+        for row in range(self.rows):
+            for col in range(self.cols):
+                lat0 = self.min_lat + row * self.cell
+                lon0 = self.min_lon + col * self.cell
+                self._cell_polygons.append([
+                    index for index, (_, _, bbox) in enumerate(self._polygons)
+                    if bbox[0] <= lat0 + self.cell and bbox[2] >= lat0
+                    and bbox[1] <= lon0 + self.cell and bbox[3] >= lon0
+                ])
+                # Any point in the cell is within half a diagonal of the centre, so
+                # its nearest seed is within (nearest to centre + diagonal) of the centre
+                center_lat = lat0 + self.cell / 2
+                center_x = (lon0 + self.cell / 2) * _LON_SCALE
+                distances = [
+                    math.hypot(lat - center_lat, x - center_x) for _, lat, x in self._points
+                ]
+                nearest = min(distances) if distances else 0.0
+                self._cell_points.append([
+                    index for index, distance in enumerate(distances)
+                    if distance <= nearest + 2 * half_diagonal
+                ])
+
+    def resolve(self, latitude: float, longitude: float) -> Optional[str]:
+        """Return the zone code for a coordinate, or None outside Malaysia."""
+        if not (self.min_lat <= latitude < self.max_lat and self.min_lon <= longitude < self.max_lon):
+            return None
+        row = int((latitude - self.min_lat) / self.cell)
+        col = int((longitude - self.min_lon) / self.cell)
+        cell = row * self.cols + col
+
+        for index in self._cell_polygons[cell]:
+            zone, ring, bbox = self._polygons[index]
+            if bbox[0] <= latitude <= bbox[2] and bbox[1] <= longitude <= bbox[3]:
+                if _point_in_ring(latitude, longitude, ring):
+                    return zone
+
+        best_zone, best_distance = None, math.inf
+        x = longitude * _LON_SCALE
+        for index in self._cell_points[cell]:
+            zone, lat, point_x = self._points[index]
+            distance = math.hypot(lat - latitude, point_x - x)
+            if distance < best_distance:
+                best_zone, best_distance = zone, distance
+        if best_distance * _KM_PER_DEGREE > GEO_MAX_DISTANCE_KM:
+            return None
+        return best_zone
+
+
+def load_zone_locator(path: str = BOUNDARIES_FILE) -> ZoneLocator:
+    """Load the boundary file and build the locator. Runs in the executor."""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return ZoneLocator(data.get("zones", {}))
+
+
+async def async_get_zone_locator(hass: HomeAssistant) -> ZoneLocator:
+    """Return the shared zone locator, building it on first use."""
+    locator = hass.data.get(DATA_ZONE_LOCATOR)
+    if locator is None:
+        locator = await hass.async_add_executor_job(load_zone_locator)
+        hass.data[DATA_ZONE_LOCATOR] = locator
+    return locator
+
+
+class ZoneTracker:
+    """Follow a tracked entity and move the config entry to the zone it is in.
+
+    Switching zones reloads the entry, so a new zone must hold for several
+    consecutive position fixes first; GPS jitter along a zone boundary
+    alternates between zones and never confirms either.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, locator: ZoneLocator) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.entry = entry
+        self.locator = locator
+        self.entity_id: Optional[str] = None
+        self._unsub: Optional[Callable] = None
+        self._last_fix: Optional[Tuple[float, float]] = None
+        # Zone the entity seems to have moved to, and the fixes seen in it so far
+        self._candidate: Optional[str] = None
+        self._candidate_fixes = 0
+
+    @callback
+    def async_update_subscription(self) -> None:
+        """Follow the entity configured in the entry options."""
+        entity_id = self.entry.options.get(CONF_ZONE_TRACKER) or None
+        if entity_id == self.entity_id:
+            return
+        self.async_stop()
+        self.entity_id = entity_id
+        self._last_fix = None
+        self._candidate, self._candidate_fixes = None, 0
+        if entity_id:
+            self._unsub = async_track_state_change_event(
+                self.hass, [entity_id], self._handle_state_change
+            )
+            self._async_check(self.hass.states.get(entity_id))
+            _LOGGER.info("📍 Zone follows %s", entity_id)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the entity."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self.entity_id = None
+
+    @callback
+    def _handle_state_change(self, event: Event) -> None:
+        """Handle a tracked entity moving."""
+        self._async_check(event.data.get("new_state"))
+
+    @callback
+    def _async_check(self, state) -> None:
+        """Resolve the entity's position and switch zones if it changed."""
+        if state is None:
+            return
+        latitude = state.attributes.get("latitude")
+        longitude = state.attributes.get("longitude")
+        if latitude is None or longitude is None:
+            return
+        # Attribute updates that do not move the entity are not new fixes
+        fix = (float(latitude), float(longitude))
+        if fix == self._last_fix:
+            return
+        self._last_fix = fix
+
+        zone = self.locator.resolve(*fix)
+        current = self.entry.data.get(CONF_ZONE)
+        if zone is None or zone == current:
+            self._candidate, self._candidate_fixes = None, 0
+            return
+        if zone != self._candidate:
+            self._candidate, self._candidate_fixes = zone, 0
+        self._candidate_fixes += 1
+        if self._candidate_fixes < GEO_ZONE_CONFIRMATIONS:
+            _LOGGER.debug(
+                "📍 %s may be in zone %s (%d/%d fixes)",
+                self.entity_id, zone, self._candidate_fixes, GEO_ZONE_CONFIRMATIONS,
+            )
+            return
+
+        _LOGGER.info("📍 %s moved from zone %s to %s", self.entity_id, current, zone)
+        title = self.entry.title.replace(current, zone) if current else self.entry.title
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, CONF_ZONE: zone}, title=title
+        )
+        self.hass.async_create_task(self.hass.config_entries.async_reload(self.entry.entry_id))
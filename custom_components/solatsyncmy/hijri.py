@@ -0,0 +1,173 @@
+"""Local Hijri calendar engine for Waktu Solat Malaysia.
+
+Uses the tabular (arithmetic) Islamic calendar and aligns it to the
+JAKIM Hijri date returned by the API with a whole-day correction.
+"""
+import logging
+import math
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .const import HIJRI_MONTH_NAMES, ISLAMIC_EVENTS, HIJRI_MAX_CORRECTION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Julian day number of 1 Muharram 1 AH (civil epoch, 16 July 622 Julian)
+_ISLAMIC_EPOCH = 1948440
+
+
+class HijriDate(NamedTuple):
+    """A Hijri calendar date."""
+
+    year: int
+    month: int
+    day: int
+
+    @property
+    def month_name(self) -> str:
+        """Return the Malay month name."""
+        return HIJRI_MONTH_NAMES[self.month - 1]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.month_name} {self.year}"
+
+
+def _hijri_to_jdn(year: int, month: int, day: int) -> int:
+    """Convert a tabular Hijri date to a Julian day number."""
+    return (
+        day
+        + (59 * (month - 1) + 1) // 2
+        + (year - 1) * 354
+        + (3 + 11 * year) // 30
+        + _ISLAMIC_EPOCH
+        - 1
+    )
+
+
+def _jdn_to_hijri(jdn: int) -> HijriDate:
+    """Convert a Julian day number to a tabular Hijri date."""
+    year = (30 * (jdn - _ISLAMIC_EPOCH) + 10646) // 10631
+    month = min(12, math.ceil((jdn - 29 - _hijri_to_jdn(year, 1, 1)) / 29.5) + 1)
+    day = jdn - _hijri_to_jdn(year, month, 1) + 1
+    return HijriDate(year, month, day)
+
+
+def _date_to_jdn(value: date) -> int:
+    """Convert a Gregorian date to a Julian day number."""
+    return value.toordinal() + 1721425
+
+
+def _jdn_to_date(jdn: int) -> date:
+    """Convert a Julian day number to a Gregorian date."""
+    return date.fromordinal(jdn - 1721425)
+
+
+def gregorian_to_hijri(value: date, correction: int = 0) -> HijriDate:
+    """Convert a Gregorian date to Hijri, applying a day correction."""
+    return _jdn_to_hijri(_date_to_jdn(value) + correction)
+
+
+def hijri_to_gregorian(hijri: HijriDate, correction: int = 0) -> date:
+    """Convert a Hijri date to Gregorian, applying a day correction."""
+    return _jdn_to_date(_hijri_to_jdn(*hijri) - correction)
+
+
+def parse_api_hijri(value: Optional[str]) -> Optional[HijriDate]:
+    """Parse the API hijri string (YYYY-MM-DD)."""
+    if not value:
+        return None
+    try:
+        year, month, day = (int(part) for part in value.split("-")[:3])
+    except (ValueError, AttributeError):
+        return None
+    if not 1 <= month <= 12 or not 1 <= day <= 30:
+        return None
+    return HijriDate(year, month, day)
+
+
+def compute_correction(on_date: date, api_hijri: Optional[str]) -> int:
+    """Return the day offset aligning the arithmetic calendar to the API value."""
+    reference = parse_api_hijri(api_hijri)
+    if reference is None:
+        return 0
+    correction = _hijri_to_jdn(*reference) - _date_to_jdn(on_date)
+    if abs(correction) > HIJRI_MAX_CORRECTION:
+        _LOGGER.warning(
+            "Ignoring Hijri correction of %d days from API value %s", correction, api_hijri
+        )
+        return 0
+    return correction
+
+
+class HijriCalendar:
+    """Precomputed Gregorian<->Hijri mapping for a window of days."""
+
+    def __init__(self, start: date, days: int = 366, correction: int = 0) -> None:
+        """Build the mapping tables for `days` days from `start`."""
+        self.start = start
+        self.correction = correction
+        self._to_hijri: List[HijriDate] = []
+        self._to_gregorian: Dict[HijriDate, date] = {}
+        jdn = _date_to_jdn(start)
+        for offset in range(days):
+            hijri = _jdn_to_hijri(jdn + offset + correction)
+            self._to_hijri.append(hijri)
+            self._to_gregorian[hijri] = start + timedelta(days=offset)
+
+    def to_hijri(self, value: date) -> HijriDate:
+        """Return the Hijri date for a Gregorian date."""
+        offset = (value - self.start).days
+        if 0 <= offset < len(self._to_hijri):
+            return self._to_hijri[offset]
+        return gregorian_to_hijri(value, self.correction)
+
+    def to_gregorian(self, hijri: HijriDate) -> date:
+        """Return the Gregorian date for a Hijri date."""
+        found = self._to_gregorian.get(hijri)
+        if found is not None:
+            return found
+        return hijri_to_gregorian(hijri, self.correction)
+
+    def events_on(self, value: date) -> List[str]:
+        """Return the keys of Islamic events falling on a date."""
+        hijri = self.to_hijri(value)
+        return [key for month, day, key, _ in ISLAMIC_EVENTS if (month, day) == hijri[1:]]
+
+    def upcoming_events(self, from_date: date, limit: int = 5) -> List[Dict[str, Any]]:
+        """Return the next Islamic events on or after a date within the window."""
+        events = []
+        hijri_year = self.to_hijri(from_date).year
+        for month, day, key, name in ISLAMIC_EVENTS:
+            for year in (hijri_year, hijri_year + 1):
+                hijri = HijriDate(year, month, day)
+                event_date = self.to_gregorian(hijri)
+                if event_date >= from_date:
+                    events.append({
+                        "key": key,
+                        "name": name,
+                        "date": event_date.isoformat(),
+                        "hijri_date": str(hijri),
+                        "days_until": (event_date - from_date).days,
+                    })
+                    break
+        events.sort(key=lambda event: event["days_until"])
+        return events[:limit]
+
+
+def build_hijri_info(calendar: HijriCalendar, today: date, api_hijri: Optional[str]) -> Dict[str, Any]:
+    """Build the Hijri state for a day from a precomputed calendar."""
+    hijri = calendar.to_hijri(today)
+    return {
+        "year": hijri.year,
+        "month": hijri.month,
+        "day": hijri.day,
+        "month_name": hijri.month_name,
+        "formatted": str(hijri),
+        "iso": f"{hijri.year:04d}-{hijri.month:02d}-{hijri.day:02d}",
+        "api_hijri": api_hijri,
+        "correction_days": calendar.correction,
+        "is_ramadan": hijri.month == 9,
+        "is_jumaat": today.weekday() == 4,
+        "events_today": calendar.events_on(today),
+        "upcoming_events": calendar.upcoming_events(today),
+    }
@@ -0,0 +1,211 @@
+"""Snapshot and restore of media player state around azan playback.
+
+Before an azan the player's volume, mute, source and current media are
+taken from its state (no device query). Completion is detected from the
+player's state events, bounded by the duration it reports, and the
+snapshot is restored straight away. When another playback is queued for
+the same player, the snapshot is kept and reused so that back-to-back
+azans restore to the state from before the first one.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .capabilities import async_get_capabilities
+from .const import (
+    DATA_MEDIA_SNAPSHOTS,
+    AZAN_MAX_DURATION,
+    PLAYBACK_COMPLETION_MARGIN,
+    MEDIA_RESTORE_WINDOW,
+)
+from .telemetry import _percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+# States in which the player is restored by switching it off again
+_OFF_STATES = ("off", "standby")
+
+
+class MediaSnapshot(NamedTuple):
+    """What a media player was doing before azan."""
+
+    state: str
+    volume_level: Optional[float]
+    is_volume_muted: Optional[bool]
+    source: Optional[str]
+    media_content_id: Optional[str]
+    media_content_type: Optional[str]
+
+    @classmethod
+    def from_state(cls, state: State) -> "MediaSnapshot":
+        """Capture a snapshot from a media player state."""
+        attributes = state.attributes
+        return cls(
+            state.state,
+            attributes.get("volume_level"),
+            attributes.get("is_volume_muted"),
+            attributes.get("source"),
+            attributes.get("media_content_id"),
+            attributes.get("media_content_type"),
+        )
+
+
+class MediaStateManager:
+    """Per-player snapshots taken before azan and restored after it."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without snapshots."""
+        self.hass = hass
+        self._snapshots: Dict[str, MediaSnapshot] = {}
+        self._restore_ms: Deque[float] = deque(maxlen=MEDIA_RESTORE_WINDOW)
+        self.stats = {"captured": 0, "reused": 0, "restored": 0, "failed": 0}
+
+    def capture(self, media_player: str) -> Optional[MediaSnapshot]:
+        """Snapshot a player, reusing the snapshot still held from a previous azan."""
+        snapshot = self._snapshots.get(media_player)
+        if snapshot is not None:
+            self.stats["reused"] += 1
+            return snapshot
+        state = self.hass.states.get(media_player)
+        if state is None:
+            return None
+        snapshot = self._snapshots[media_player] = MediaSnapshot.from_state(state)
+        self.stats["captured"] += 1
+        return snapshot
+
+    async def async_wait_for_completion(self, media_player: str, url: Optional[str]) -> str:
+        """Wait until the azan stops playing.
+
+        The azan is recognised by its URL in the player's media_content_id, so
+        music still reported before the switch is not mistaken for it. Returns
+        "state" when the player reported the end, "duration" when its reported
+        duration elapsed first, or "timeout".
+        """
+        loop = self.hass.loop
+        finished = loop.create_future()
+        seen = False
+        duration_known = False
+
+        def _is_azan(state: State) -> bool:
+            content_id = state.attributes.get("media_content_id")
+            return bool(url and content_id) and (url in content_id or content_id in url)
+
+        def _deadline(state: State) -> Optional[float]:
+            """Return when the azan should end according to the player."""
+            duration = state.attributes.get("media_duration")
+            if not isinstance(duration, (int, float)) or duration <= 0:
+                return None
+            position = state.attributes.get("media_position") or 0
+            return loop.time() + max(0.0, duration - position) + PLAYBACK_COMPLETION_MARGIN
+
+        def _update(state: Optional[State], timeout: asyncio.Timeout) -> None:
+            nonlocal seen, duration_known
+            if finished.done():
+                return
+            if state is None:
+                finished.set_result(None)
+            elif state.state == "playing" and _is_azan(state):
+                if not seen and (deadline := _deadline(state)) is not None:
+                    timeout.reschedule(deadline)
+                    duration_known = True
+                seen = True
+            elif state.state != "playing" or seen:
+                finished.set_result(None)
+
+        try:
+            async with asyncio.timeout(AZAN_MAX_DURATION) as timeout:
+                _update(self.hass.states.get(media_player), timeout)
+                unsub = async_track_state_change_event(
+                    self.hass, [media_player],
+                    callback(lambda event: _update(event.data.get("new_state"), timeout)),
+                )
+                try:
+                    await finished
+                finally:
+                    unsub()
+            return "state"
+        except TimeoutError:
+            return "duration" if duration_known else "timeout"
+
+    async def async_restore(self, media_player: str) -> Optional[float]:
+        """Put a player back in its snapshot state. Returns the restore time in ms."""
+        snapshot = self._snapshots.pop(media_player, None)
+        if snapshot is None:
+            return None
+        start = time.monotonic()
+        current = self.hass.states.get(media_player)
+        current_attributes = current.attributes if current else {}
+        target = {"entity_id": media_player}
+        # Steps the player does not support are skipped rather than failing the restore
+        capabilities = async_get_capabilities(self.hass).get(media_player)
+        try:
+            if (
+                snapshot.volume_level is not None
+                and current_attributes.get("volume_level") != snapshot.volume_level
+                and capabilities.can_set_volume
+            ):
+                await self._async_call("volume_set", {**target, "volume_level": snapshot.volume_level})
+            if (
+                snapshot.is_volume_muted
+                and not current_attributes.get("is_volume_muted")
+                and capabilities.supports(MediaPlayerEntityFeature.VOLUME_MUTE)
+            ):
+                await self._async_call("volume_mute", {**target, "is_volume_muted": True})
+            if snapshot.state in _OFF_STATES:
+                if capabilities.supports(MediaPlayerEntityFeature.TURN_OFF):
+                    await self._async_call("turn_off", target)
+            elif snapshot.state == "playing":
+                if (
+                    snapshot.source
+                    and current_attributes.get("source") != snapshot.source
+                    and capabilities.supports(MediaPlayerEntityFeature.SELECT_SOURCE)
+                ):
+                    await self._async_call("select_source", {**target, "source": snapshot.source})
+                if snapshot.media_content_id and snapshot.media_content_type:
+                    await self._async_call("play_media", {
+                        **target,
+                        "media_content_id": snapshot.media_content_id,
+                        "media_content_type": snapshot.media_content_type,
+                    })
+        except Exception as err:
+            _LOGGER.warning("⚠️ Could not restore %s after azan: %s", media_player, err)
+            self.stats["failed"] += 1
+            return None
+
+        elapsed = round((time.monotonic() - start) * 1000, 1)
+        self._restore_ms.append(elapsed)
+        self.stats["restored"] += 1
+        _LOGGER.info("↩️ Restored %s to %s in %.0f ms", media_player, snapshot.state, elapsed)
+        return elapsed
+
+    async def _async_call(self, service: str, data: Dict[str, Any]) -> None:
+        """Call a media player service and wait for it to finish."""
+        await self.hass.services.async_call("media_player", service, data, blocking=True)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe held snapshots and restore latency for diagnostics."""
+        ordered = sorted(self._restore_ms)
+        return {
+            "held": {player: snapshot.state for player, snapshot in sorted(self._snapshots.items())},
+            "restore_ms": {
+                "samples": len(ordered),
+                "p50": _percentile(ordered, 50) if ordered else None,
+                "p95": _percentile(ordered, 95) if ordered else None,
+                "max": ordered[-1] if ordered else None,
+            },
+            **self.stats,
+        }
+
+
+def async_get_media_state(hass: HomeAssistant) -> MediaStateManager:
+    """Return the snapshot manager shared by every entry."""
+    manager = hass.data.get(DATA_MEDIA_SNAPSHOTS)
+    if manager is None:
+        manager = hass.data[DATA_MEDIA_SNAPSHOTS] = MediaStateManager(hass)
+    return manager
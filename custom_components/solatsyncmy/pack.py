@@ -0,0 +1,184 @@
+"""Bundled timetable pack for Waktu Solat Malaysia.
+
+The pack holds the six API prayer times of every JAKIM zone for a range of
+years, so a fresh install can bring entities up before its first API call.
+The file is memory-mapped and months are decoded on demand.
+
+Layout (little-endian):
+    header   magic, version, first year, year count, zone count, columns,
+             source (0 = API, 1 = calculated), build time (Unix seconds)
+    zones    zone count x 8-byte ASCII codes, NUL padded
+    times    per zone, per year: 366 rows x columns uint16 minutes after
+             local midnight (UTC+8); 0xFFFF marks a missing time
+"""
+import calendar
+import logging
+import mmap
+import os
+import struct
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_TIMETABLE_PACK, PRAYER_TIMES, TIMETABLE_PACK_FILE
+from .hijri import gregorian_to_hijri
+
+_LOGGER = logging.getLogger(__name__)
+
+PACK_FILE = os.path.join(os.path.dirname(__file__), TIMETABLE_PACK_FILE)
+MAGIC = b"SSMYPACK"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHHHI")
+ZONE_CODE_BYTES = 8
+ROWS = 366
+MISSING = 0xFFFF
+SOURCE_API = 0
+SOURCE_CALCULATED = 1
+
+# Malaysia keeps UTC+8 all year
+UTC_OFFSET = 8 * 3600
+
+DayFunc = Callable[[str, date], Optional[Dict[str, Any]]]
+
+
+def _local_midnight(day: date) -> int:
+    """Return the Unix time of local midnight on a day."""
+    return calendar.timegm(day.timetuple()) - UTC_OFFSET
+
+
+class TimetablePack:
+    """Read-only view of a memory-mapped timetable pack."""
+
+    def __init__(self, path: str) -> None:
+        """Map a pack file and read its header and zone list."""
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.first_year, self.year_count, zone_count,
+             self.columns, self.source, self.built_at) = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION or self.columns != len(PRAYER_TIMES):
+                raise ValueError(f"Unsupported timetable pack {path}")
+            zones_end = HEADER.size + zone_count * ZONE_CODE_BYTES
+            self.zones: Dict[str, int] = {
+                self._map[offset:offset + ZONE_CODE_BYTES].rstrip(b"\0").decode("ascii"): index
+                for index, offset in enumerate(range(HEADER.size, zones_end, ZONE_CODE_BYTES))
+            }
+            self._times_start = zones_end
+            self._block = ROWS * self.columns
+            self._row = struct.Struct(f"<{self.columns}H")
+            expected = zones_end + zone_count * self.year_count * self._block * 2
+            if len(self._map) < expected:
+                raise ValueError(f"Truncated timetable pack {path}")
+        except Exception:
+            self._map.close()
+            raise
+
+    def covers(self, zone: str, year: int) -> bool:
+        """Return whether the pack holds a zone's year."""
+        return zone in self.zones and self.first_year <= year < self.first_year + self.year_count
+
+    def month(self, zone: str, year: int, month: int) -> Optional[Dict[str, Any]]:
+        """Return one month in the API response format, or None if not covered."""
+        if not self.covers(zone, year):
+            return None
+        block = self.zones[zone] * self.year_count + year - self.first_year
+        first_row = date(year, month, 1).timetuple().tm_yday - 1
+        offset = self._times_start + (block * self._block + first_row * self.columns) * 2
+        prayers: List[Dict[str, Any]] = []
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            minutes = self._row.unpack_from(self._map, offset)
+            offset += self._row.size
+            if minutes[0] == MISSING:
+                continue
+            current = date(year, month, day)
+            hijri = gregorian_to_hijri(current)
+            entry: Dict[str, Any] = {
+                "day": day,
+                "hijri": f"{hijri.year:04d}-{hijri.month:02d}-{hijri.day:02d}",
+            }
+            midnight = _local_midnight(current)
+            for prayer, value in zip(PRAYER_TIMES, minutes):
+                if value != MISSING:
+                    entry[prayer] = midnight + value * 60
+            prayers.append(entry)
+        if not prayers:
+            return None
+        return {
+            "zone": zone,
+            "year": year,
+            "month": calendar.month_abbr[month].upper(),
+            "month_number": month,
+            "prayers": prayers,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the pack for diagnostics."""
+        return {
+            "years": [self.first_year, self.first_year + self.year_count - 1],
+            "zones": len(self.zones),
+            "source": "calculated" if self.source == SOURCE_CALCULATED else "api",
+            "built_at": self.built_at,
+            "bytes": len(self._map),
+        }
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+
+def write_pack(
+    path: str,
+    zones: Iterable[str],
+    first_year: int,
+    year_count: int,
+    get_day: DayFunc,
+    source: int,
+    built_at: int,
+) -> int:
+    """Write a pack from API-format days returned by get_day(zone, day). Returns its size."""
+    zones = list(zones)
+    row = struct.Struct(f"<{len(PRAYER_TIMES)}H")
+    missing_row = row.pack(*[MISSING] * len(PRAYER_TIMES))
+    chunks = [
+        HEADER.pack(MAGIC, VERSION, first_year, year_count, len(zones), len(PRAYER_TIMES), source, built_at)
+    ]
+    chunks += [zone.encode("ascii").ljust(ZONE_CODE_BYTES, b"\0") for zone in zones]
+    for zone in zones:
+        for year in range(first_year, first_year + year_count):
+            days = 366 if calendar.isleap(year) else 365
+            for day_of_year in range(ROWS):
+                entry = None
+                if day_of_year < days:
+                    current = date.fromordinal(date(year, 1, 1).toordinal() + day_of_year)
+                    entry = get_day(zone, current)
+                if not entry:
+                    chunks.append(missing_row)
+                    continue
+                midnight = _local_midnight(current)
+                chunks.append(row.pack(*(
+                    (entry[prayer] - midnight) // 60 if isinstance(entry.get(prayer), int) else MISSING
+                    for prayer in PRAYER_TIMES
+                )))
+    data = b"".join(chunks)
+    with open(path, "wb") as handle:
+        handle.write(data)
+    return len(data)
+
+
+def _open_pack(path: str) -> Optional[TimetablePack]:
+    """Open a pack, returning None if it is missing or unreadable."""
+    try:
+        return TimetablePack(path)
+    except FileNotFoundError:
+        _LOGGER.debug("No bundled timetable pack at %s", path)
+    except (OSError, ValueError, struct.error) as err:
+        _LOGGER.warning("⚠️ Ignoring bundled timetable pack: %s", err)
+    return None
+
+
+async def async_get_timetable_pack(hass: HomeAssistant) -> Optional[TimetablePack]:
+    """Return the shared bundled pack, mapping it on first use."""
+    if DATA_TIMETABLE_PACK not in hass.data:
+        hass.data[DATA_TIMETABLE_PACK] = await hass.async_add_executor_job(_open_pack, PACK_FILE)
+    return hass.data[DATA_TIMETABLE_PACK]
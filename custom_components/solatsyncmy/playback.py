@@ -0,0 +1,179 @@
+"""Playback arbiter for Waktu Solat Malaysia.
+
+Scheduled azans, the play_azan service and audio tests all go through one
+queue per media player, so their turn_on/volume/play sequences never
+interleave. A job identical to one already queued or running is merged
+with it (several entries in one zone fire together). Scheduled azans come
+before manual plays and tests, and a new job cancels lower-priority work
+on the same player instead of waiting behind it.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_PLAYBACK_ARBITER, PLAYBACK_WAIT_WINDOW
+from .telemetry import _percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PlaybackJob:
+    """One queued playback."""
+
+    __slots__ = ("key", "priority", "media_player", "factory", "created", "future", "task")
+
+    def __init__(
+        self, key: Hashable, priority: int, media_player: str, factory: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Initialize the job; factory creates the playback coroutine when its turn comes."""
+        self.key = key
+        self.priority = priority
+        self.media_player = media_player
+        self.factory = factory
+        self.created = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+
+    def resolve(self, result: bool) -> None:
+        """Complete the job for everyone waiting on it."""
+        if not self.future.done():
+            self.future.set_result(result)
+
+
+class PlaybackArbiter:
+    """Serialize, de-duplicate and prioritize playbacks per media player."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize empty queues."""
+        self.hass = hass
+        # Media player -> heap of (priority, sequence, job)
+        self._queues: Dict[str, List[Tuple[int, int, PlaybackJob]]] = {}
+        self._running: Dict[str, PlaybackJob] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._sequence = itertools.count()
+        self._waits: Deque[float] = deque(maxlen=PLAYBACK_WAIT_WINDOW)
+        self.stats = {"submitted": 0, "deduplicated": 0, "superseded": 0, "completed": 0, "failed": 0}
+
+    async def async_play(
+        self,
+        media_player: str,
+        key: Hashable,
+        priority: int,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> bool:
+        """Queue a playback and wait for it.
+
+        Returns True once it ran to completion, False if it was superseded or failed.
+        """
+        self.stats["submitted"] += 1
+        job = self._find(media_player, key, priority)
+        if job is not None:
+            self.stats["deduplicated"] += 1
+            _LOGGER.debug("🔁 Joining queued playback %s on %s", key, media_player)
+        else:
+            self._supersede(media_player, priority)
+            job = PlaybackJob(key, priority, media_player, factory)
+            heapq.heappush(self._queues.setdefault(media_player, []), (priority, next(self._sequence), job))
+            if media_player not in self._workers:
+                self._workers[media_player] = self.hass.async_create_background_task(
+                    self._async_drain(media_player), f"solatsyncmy playback {media_player}"
+                )
+        # Callers leaving early must not cancel a job others are waiting on
+        return await asyncio.shield(job.future)
+
+    def _find(self, media_player: str, key: Hashable, priority: int) -> Optional[PlaybackJob]:
+        """Return a queued or running job with the same key and priority."""
+        running = self._running.get(media_player)
+        if running is not None and running.key == key and running.priority == priority:
+            return running
+        for _, _, job in self._queues.get(media_player, ()):
+            if job.key == key and job.priority == priority:
+                return job
+        return None
+
+    def _supersede(self, media_player: str, priority: int) -> None:
+        """Drop queued jobs and cancel the running job of lower priority on a player."""
+        queue = self._queues.get(media_player)
+        if queue:
+            kept = []
+            for item in queue:
+                if item[2].priority > priority:
+                    self.stats["superseded"] += 1
+                    item[2].resolve(False)
+                else:
+                    kept.append(item)
+            if len(kept) != len(queue):
+                heapq.heapify(kept)
+                self._queues[media_player] = kept
+        running = self._running.get(media_player)
+        if running is not None and running.priority > priority and running.task is not None:
+            _LOGGER.info("⏭️ Interrupting %s on %s for a higher-priority azan", running.key, media_player)
+            running.task.cancel()
+
+    async def _async_drain(self, media_player: str) -> None:
+        """Run a player's jobs one at a time in priority order."""
+        try:
+            while queue := self._queues.get(media_player):
+                _, _, job = heapq.heappop(queue)
+                self._waits.append(round((time.monotonic() - job.created) * 1000, 1))
+                self._running[media_player] = job
+                job.task = self.hass.async_create_task(job.factory())
+                try:
+                    await job.task
+                except asyncio.CancelledError:
+                    current = asyncio.current_task()
+                    if current is not None and current.cancelling():
+                        job.resolve(False)
+                        raise
+                    self.stats["superseded"] += 1
+                    job.resolve(False)
+                except Exception as err:
+                    _LOGGER.error("❌ Playback %s on %s failed: %s", job.key, media_player, err)
+                    self.stats["failed"] += 1
+                    job.resolve(False)
+                else:
+                    self.stats["completed"] += 1
+                    job.resolve(True)
+                finally:
+                    self._running.pop(media_player, None)
+        finally:
+            # Only left non-empty when the worker is cancelled (Home Assistant stopping)
+            self._workers.pop(media_player, None)
+            for _, _, job in self._queues.pop(media_player, ()):
+                job.resolve(False)
+
+    def queue_depth(self, media_player: str) -> int:
+        """Return the number of waiting and running jobs for a player."""
+        return len(self._queues.get(media_player, ())) + (media_player in self._running)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the queues for diagnostics."""
+        ordered = sorted(self._waits)
+        return {
+            "queue_depth": {
+                player: self.queue_depth(player)
+                for player in sorted(set(self._queues) | set(self._running))
+            },
+            "running": {player: str(job.key) for player, job in self._running.items()},
+            "wait_ms": {
+                "samples": len(ordered),
+                "p50": _percentile(ordered, 50) if ordered else None,
+                "p95": _percentile(ordered, 95) if ordered else None,
+                "max": ordered[-1] if ordered else None,
+            },
+            **self.stats,
+        }
+
+
+def async_get_arbiter(hass: HomeAssistant) -> PlaybackArbiter:
+    """Return the arbiter shared by every entry."""
+    arbiter = hass.data.get(DATA_PLAYBACK_ARBITER)
+    if arbiter is None:
+        arbiter = hass.data[DATA_PLAYBACK_ARBITER] = PlaybackArbiter(hass)
+    return arbiter
@@ -0,0 +1,175 @@
+"""Spoken pre-prayer reminders for Waktu Solat Malaysia.
+
+Reminders ("Lagi 10 minit waktu Maghrib") are rendered through Home
+Assistant's TTS ahead of time and kept as files under www/solatsyncmy/tts/
+(served as /api/solatsyncmy/audio/tts/), named by a hash of the text,
+engine and language. At reminder time the file is played like an azan, so
+no TTS request sits between the timer and the first audible sample.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    DATA_REMINDER_AUDIO,
+    PRAYER_NAMES,
+    REMINDER_AUDIO_DIR,
+    REMINDER_MESSAGE,
+    REMINDER_RENDER_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# (hass, message, engine, language) -> (file extension, audio bytes)
+RenderFunction = Callable[[HomeAssistant, str, str, Optional[str]], Awaitable[Tuple[str, bytes]]]
+
+
+def reminder_message(prayer: str, minutes: int) -> str:
+    """Return the text announced before a prayer."""
+    return REMINDER_MESSAGE.format(minutes=minutes, prayer=PRAYER_NAMES.get(prayer, prayer))
+
+
+def _resolve_engine(hass: HomeAssistant, engine: Optional[str]) -> str:
+    """Return the configured TTS engine, or Home Assistant's default one."""
+    if engine:
+        return engine
+    if "tts" not in hass.config.components:
+        raise HomeAssistantError("Text-to-speech is not set up")
+    from homeassistant.components import tts
+
+    if (default := tts.async_resolve_engine(hass, None)) is None:
+        raise HomeAssistantError("No text-to-speech engine found")
+    return default
+
+
+async def _async_render_tts(
+    hass: HomeAssistant, message: str, engine: str, language: Optional[str]
+) -> Tuple[str, bytes]:
+    """Render a message with a Home Assistant TTS engine."""
+    if "tts" not in hass.config.components:
+        raise HomeAssistantError("Text-to-speech is not set up")
+    from homeassistant.components import tts
+
+    try:
+        media_source_id = tts.generate_media_source_id(hass, message, engine, language)
+    except HomeAssistantError:
+        # The engine does not speak the language; use its default one
+        media_source_id = tts.generate_media_source_id(hass, message, engine)
+    return await tts.async_get_media_source_audio(hass, media_source_id)
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write rendered audio atomically. Runs in the executor."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(temp_path, path)
+
+
+def _scan_directory(directory: str) -> Dict[str, str]:
+    """Return the cached files by key. Runs in the executor."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        os.path.splitext(name)[0]: os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if not name.endswith(".tmp")
+    }
+
+
+class ReminderAudioCache:
+    """Reminder announcements rendered ahead of time, by text, engine and language."""
+
+    def __init__(self, hass: HomeAssistant, render: RenderFunction = _async_render_tts) -> None:
+        """Initialize an empty cache."""
+        self.hass = hass
+        self.directory = hass.config.path(*REMINDER_AUDIO_DIR)
+        self._render = render
+        self._files: Dict[str, str] = {}
+        # Renders in progress, so concurrent requests for one message share a render
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "renders": 0, "failures": 0, "last_render_ms": None}
+
+    async def async_load(self) -> None:
+        """Index the files rendered before a restart."""
+        self._files = await self.hass.async_add_executor_job(_scan_directory, self.directory)
+
+    @staticmethod
+    def key(message: str, engine: str, language: Optional[str]) -> str:
+        """Return the cache key of an announcement."""
+        return hashlib.sha256(f"{engine}\n{language}\n{message}".encode()).hexdigest()[:16]
+
+    def get(self, message: str, engine: Optional[str], language: Optional[str]) -> Optional[str]:
+        """Return the file of an announcement if it has been rendered."""
+        try:
+            path = self._files.get(self.key(message, _resolve_engine(self.hass, engine), language))
+        except HomeAssistantError:
+            return None
+        if path is not None:
+            self.stats["hits"] += 1
+        return path
+
+    async def async_render(self, message: str, engine: Optional[str], language: Optional[str]) -> Optional[str]:
+        """Return the file of an announcement, rendering it if needed. None if TTS failed."""
+        try:
+            engine = _resolve_engine(self.hass, engine)
+        except HomeAssistantError as err:
+            _LOGGER.warning("⚠️ Cannot render prayer reminder: %s", err)
+            self.stats["failures"] += 1
+            return None
+        key = self.key(message, engine, language)
+        if (path := self._files.get(key)) is not None:
+            self.stats["hits"] += 1
+            return path
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = self.hass.async_create_task(
+                self._async_render(key, message, engine, language)
+            )
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_render(self, key: str, message: str, engine: str, language: Optional[str]) -> Optional[str]:
+        """Render an announcement and store it as a file."""
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(REMINDER_RENDER_TIMEOUT):
+                extension, data = await self._render(self.hass, message, engine, language)
+        except Exception as err:
+            _LOGGER.warning("⚠️ TTS engine %s failed to render \"%s\": %s", engine, message, err)
+            self.stats["failures"] += 1
+            return None
+        if not data:
+            _LOGGER.warning("⚠️ TTS engine %s returned no audio for \"%s\"", engine, message)
+            self.stats["failures"] += 1
+            return None
+
+        path = os.path.join(self.directory, f"{key}.{extension}")
+        await self.hass.async_add_executor_job(_write_file, path, data)
+        self._files[key] = path
+        self.stats["renders"] += 1
+        self.stats["last_render_ms"] = round((time.monotonic() - start) * 1000, 1)
+        _LOGGER.info("🗣️ Rendered prayer reminder \"%s\" with %s", message, engine)
+        return path
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the cache for diagnostics."""
+        return {"files": len(self._files), **self.stats}
+
+
+async def async_get_reminder_cache(hass: HomeAssistant) -> ReminderAudioCache:
+    """Return the shared reminder cache, indexing its directory on first use."""
+    cache = hass.data.get(DATA_REMINDER_AUDIO)
+    if cache is None:
+        cache = ReminderAudioCache(hass)
+        await cache.async_load()
+        # Another caller may have loaded it while this one waited
+        cache = hass.data.setdefault(DATA_REMINDER_AUDIO, cache)
+    return cache
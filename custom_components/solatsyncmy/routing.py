@@ -0,0 +1,185 @@
+"""Per-prayer azan routing for Waktu Solat Malaysia.
+
+Routing rules pick the media players, volume and audio file of an azan by
+prayer, weekday and local time window, e.g.::
+
+    - prayers: [fajr]
+      media_players: [media_player.bedroom]
+      volume: 0.3
+      fade_in: 20
+    - prayers: [dhuhr]
+      weekdays: [fri]
+      audio_file: azan_jumaat.mp3
+    - prayers: [maghrib, isha]
+      after: "18:00"
+      before: "23:00"
+      media_players: [media_player.living_room_soundbar]
+      volume: 0.8
+
+The first matching rule wins; options a rule leaves out, and azans no rule
+matches, use the entry's media player, volume and fade-in time. Rules are
+compiled once per options change into a prayer × weekday table whose cells
+are either a route or, for cells with time windows, a per-minute route
+index, so looking up a route when an azan fires is constant time.
+"""
+from array import array
+from datetime import datetime, time
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import voluptuous as vol
+
+from homeassistant.helpers import config_validation as cv
+
+from .const import AZAN_PRAYERS, PRAYER_NAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+MINUTES_PER_DAY = 24 * 60
+
+# Rules may name prayers as the API does (fajr) or as displayed (Subuh)
+_PRAYER_ALIASES = {
+    **{prayer: prayer for prayer in AZAN_PRAYERS},
+    **{PRAYER_NAMES[prayer].lower(): prayer for prayer in AZAN_PRAYERS},
+}
+
+
+def _prayer(value: Any) -> str:
+    """Validate a prayer name, returning the API name."""
+    prayer = _PRAYER_ALIASES.get(cv.string(value).strip().lower())
+    if prayer is None:
+        raise vol.Invalid(f"unknown prayer: {value}")
+    return prayer
+
+
+def _weekday(value: Any) -> str:
+    """Validate a weekday, accepting full names (friday) and abbreviations (fri)."""
+    weekday = cv.string(value).strip().lower()[:3]
+    if weekday not in WEEKDAYS:
+        raise vol.Invalid(f"unknown weekday: {value}")
+    return weekday
+
+
+def _audio_file(value: Any) -> str:
+    """Validate an audio file: a plain file name or an http(s) URL."""
+    value = cv.string(value).strip()
+    if value.startswith(("http://", "https://")):
+        return cv.url(value)
+    if not value or "/" in value or "\\" in value or value.startswith("."):
+        raise vol.Invalid("audio_file must be a file name in /config/www/solatsyncmy/ or a URL")
+    return value
+
+
+RULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("prayers"): vol.All(cv.ensure_list, [_prayer]),
+        vol.Optional("weekdays"): vol.All(cv.ensure_list, [_weekday]),
+        vol.Optional("after"): cv.time,
+        vol.Optional("before"): cv.time,
+        vol.Optional("media_players"): vol.All(cv.ensure_list, [cv.entity_domain("media_player")]),
+        vol.Optional("volume"): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+        vol.Optional("audio_file"): _audio_file,
+        vol.Optional("fade_in"): vol.All(vol.Coerce(float), vol.Range(min=0, max=120)),
+    }
+)
+RULES_SCHEMA = vol.All(cv.ensure_list, [RULE_SCHEMA])
+
+
+class Route(NamedTuple):
+    """Where and how one azan plays."""
+
+    media_players: Tuple[str, ...]
+    volume: float
+    audio_file: Optional[str] = None
+    rule: Optional[int] = None  # Index of the matching rule; None for the entry's defaults
+    fade_in: float = 0  # Seconds to ramp the volume up; 0 starts at full volume
+
+
+def _minute(value: time) -> int:
+    """Return the minute of the day of a time."""
+    return value.hour * 60 + value.minute
+
+
+class RoutingTable:
+    """Routing rules compiled for constant-time lookup."""
+
+    def __init__(self, rules: List[Dict[str, Any]], default: Route) -> None:
+        """Compile validated rules on top of the default route."""
+        self.rules = rules
+        # Route 0 is the default; rule i routes through route i + 1
+        self.routes: List[Route] = [default] + [
+            Route(
+                tuple(rule.get("media_players", default.media_players)),
+                rule.get("volume", default.volume),
+                rule.get("audio_file"),
+                index,
+                rule.get("fade_in", default.fade_in),
+            )
+            for index, rule in enumerate(rules)
+        ]
+        self._prayers = {prayer: index for index, prayer in enumerate(AZAN_PRAYERS)}
+        # [prayer][weekday] -> route index, or per-minute route indexes
+        self._cells: List[List[Union[int, array]]] = [
+            [self._compile_cell(prayer, weekday) for weekday in WEEKDAYS]
+            for prayer in AZAN_PRAYERS
+        ]
+
+    def _compile_cell(self, prayer: str, weekday: str) -> Union[int, array]:
+        """Return the route of a prayer on a weekday, per minute if time windows apply."""
+        matching = [
+            index
+            for index, rule in enumerate(self.rules)
+            if prayer in rule.get("prayers", AZAN_PRAYERS)
+            and weekday in rule.get("weekdays", WEEKDAYS)
+        ]
+        if not matching:
+            return 0
+        first = self.rules[matching[0]]
+        if "after" not in first and "before" not in first:
+            return matching[0] + 1
+
+        minutes = array("H", [0]) * MINUTES_PER_DAY
+        # Painting in reverse leaves the first matching rule on top
+        for index in reversed(matching):
+            rule = self.rules[index]
+            start = _minute(rule["after"]) if "after" in rule else 0
+            end = _minute(rule["before"]) if "before" in rule else MINUTES_PER_DAY
+            # A window ending before it starts wraps past midnight
+            spans = [(start, end)] if start <= end else [(start, MINUTES_PER_DAY), (0, end)]
+            for span_start, span_end in spans:
+                minutes[span_start:span_end] = array("H", [index + 1]) * (span_end - span_start)
+        if minutes.count(minutes[0]) == MINUTES_PER_DAY:
+            return minutes[0]
+        return minutes
+
+    def resolve(self, prayer: str, when: datetime) -> Route:
+        """Return the route of a prayer's azan at a local time."""
+        index = self._prayers.get(prayer)
+        if index is None:
+            return self.routes[0]
+        cell = self._cells[index][when.weekday()]
+        if isinstance(cell, int):
+            return self.routes[cell]
+        return self.routes[cell[when.hour * 60 + when.minute]]
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return the compiled rules, for diagnostics."""
+        return [
+            {
+                **{key: value.strftime("%H:%M") if isinstance(value, time) else value for key, value in rule.items()},
+                "route": self.routes[index + 1]._asdict(),
+            }
+            for index, rule in enumerate(self.rules)
+        ]
+
+
+def compile_routing(raw_rules: Any, default: Route) -> RoutingTable:
+    """Compile rules from the entry options, skipping any that do not validate."""
+    rules = []
+    for index, raw_rule in enumerate(raw_rules or []):
+        try:
+            rules.append(RULE_SCHEMA(raw_rule))
+        except vol.Invalid as err:
+            _LOGGER.warning("⚠️ Ignoring azan routing rule %d: %s", index + 1, err)
+    return RoutingTable(rules, default)
@@ -0,0 +1,248 @@
+"""Prayer time scheduler for Waktu Solat Malaysia.
+
+A single timeline drives the events of every zone tracked by a coordinator,
+including pre-prayer reminders when they are enabled. Only the next entry
+is armed with Home Assistant at any time.
+"""
+import asyncio
+import bisect
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    AZAN_PRAYERS,
+    PRAYER_TIMES,
+    PRAYER_NAMES,
+    DERIVED_TIMES,
+    DERIVED_TIME_NAMES,
+    EVENT_PRAYER_TIME,
+    EVENT_DERIVED_TIME,
+    EVENT_PRAYER_REMINDER,
+    SCHEDULE_KIND_PRAYER,
+    SCHEDULE_KIND_DERIVED,
+    SCHEDULE_KIND_REMINDER,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import WaktuSolatCoordinator
+    from .timetable import CellChange
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduleEntry(NamedTuple):
+    """A single scheduled instant on the timeline."""
+
+    timestamp: int
+    zone: str
+    kind: str
+    name: str
+
+    @property
+    def when(self) -> datetime:
+        """Return the scheduled instant as a UTC datetime."""
+        return dt_util.utc_from_timestamp(self.timestamp)
+
+
+class WaktuSolatScheduler:
+    """Single timer driving prayer and derived time events for all zones."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: "WaktuSolatCoordinator") -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._timeline: List[ScheduleEntry] = []
+        self._position = 0
+        self._listeners: Dict[str, List[Callable]] = {}
+        self._unsub_timer: Optional[Callable] = None
+        self._unsub_coordinator: Optional[Callable] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start following coordinator updates."""
+        if self._unsub_coordinator is None:
+            self._unsub_coordinator = self._coordinator.async_add_listener(self.async_rebuild)
+        self.async_rebuild()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the scheduler and cancel the armed timer."""
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+        self._cancel_timer()
+        self._timeline = []
+        self._position = 0
+
+    @callback
+    def async_add_listener(self, kind: str, action: Callable) -> Callable:
+        """Register a callback for entries of a kind. Returns an unsubscribe function.
+
+        The callback receives (entry, now) and may be a coroutine function.
+        """
+        self._listeners.setdefault(kind, []).append(action)
+
+        @callback
+        def remove_listener() -> None:
+            if action in self._listeners.get(kind, []):
+                self._listeners[kind].remove(action)
+
+        return remove_listener
+
+    @property
+    def upcoming(self) -> List[ScheduleEntry]:
+        """Return the entries that have not fired yet."""
+        return self._timeline[self._position:]
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Rebuild the timeline from the coordinator's indexed days and arm the next entry."""
+        now_ts = dt_util.utcnow().timestamp()
+        today = dt_util.now().date()
+        reminder_offset = self._coordinator.reminder_minutes * 60
+        timeline = []
+
+        for zone in self._coordinator.zones:
+            # Yesterday is included for the night times that fall after midnight
+            for offset in (-1, 0, 1):
+                day = today + timedelta(days=offset)
+                day_data = self._coordinator.get_day_data(zone, day) or {}
+                for prayer in PRAYER_TIMES:
+                    timestamp = day_data.get(prayer)
+                    if not timestamp:
+                        continue
+                    if timestamp > now_ts:
+                        timeline.append(ScheduleEntry(timestamp, zone, SCHEDULE_KIND_PRAYER, prayer))
+                    reminder = timestamp - reminder_offset
+                    if reminder_offset and prayer in AZAN_PRAYERS and reminder > now_ts:
+                        timeline.append(ScheduleEntry(reminder, zone, SCHEDULE_KIND_REMINDER, prayer))
+                for name, timestamp in self._coordinator.get_derived_day(zone, day).items():
+                    if timestamp > now_ts:
+                        timeline.append(ScheduleEntry(timestamp, zone, SCHEDULE_KIND_DERIVED, name))
+
+        timeline.sort()
+        self._timeline = timeline
+        self._position = 0
+        self._arm()
+        _LOGGER.debug(
+            "⏰ Schedule rebuilt with %d entries across %d zone(s)",
+            len(timeline), len(self._coordinator.zones),
+        )
+
+    @callback
+    def async_apply_changes(self, zone: str, changes: Iterable["CellChange"]) -> int:
+        """Move only the entries whose times changed. Returns the number of entries touched."""
+        now_ts = dt_util.utcnow().timestamp()
+        today = dt_util.now().date()
+        window = {today + timedelta(days=offset) for offset in (-1, 0, 1)}
+        reminder_offset = self._coordinator.reminder_minutes * 60
+        head = self._timeline[self._position] if self._position < len(self._timeline) else None
+        touched = 0
+
+        for change in changes:
+            if change.day not in window:
+                continue
+            # (kind, seconds before the time) of each entry the changed time drives
+            if change.name in PRAYER_TIMES:
+                kinds = [(SCHEDULE_KIND_PRAYER, 0)]
+                if reminder_offset and change.name in AZAN_PRAYERS:
+                    kinds.append((SCHEDULE_KIND_REMINDER, reminder_offset))
+            elif change.name in DERIVED_TIMES:
+                kinds = [(SCHEDULE_KIND_DERIVED, 0)]
+            else:
+                continue
+            for kind, offset in kinds:
+                if change.old and change.old - offset > now_ts:
+                    entry = ScheduleEntry(change.old - offset, zone, kind, change.name)
+                    index = bisect.bisect_left(self._timeline, entry, self._position)
+                    if index < len(self._timeline) and self._timeline[index] == entry:
+                        del self._timeline[index]
+                        touched += 1
+                if change.new and change.new - offset > now_ts:
+                    bisect.insort(
+                        self._timeline, ScheduleEntry(change.new - offset, zone, kind, change.name), self._position
+                    )
+                    touched += 1
+
+        new_head = self._timeline[self._position] if self._position < len(self._timeline) else None
+        if new_head != head:
+            self._arm()
+        if touched:
+            _LOGGER.debug("⏰ Schedule updated in place: %d entr(ies) for zone %s", touched, zone)
+        return touched
+
+    def _cancel_timer(self) -> None:
+        """Cancel the armed timer, if any."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    def _arm(self) -> None:
+        """Arm a timer for the next entry on the timeline."""
+        self._cancel_timer()
+        if self._position < len(self._timeline):
+            next_entry = self._timeline[self._position]
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._handle_timer, next_entry.when
+            )
+
+    @callback
+    def _handle_timer(self, now: datetime) -> None:
+        """Dispatch every entry that is due and arm the next one."""
+        self._unsub_timer = None
+        now_ts = now.timestamp()
+        # `now` is the armed instant; listeners get the actual fire time for latency telemetry
+        fired = dt_util.utcnow()
+        while self._position < len(self._timeline):
+            entry = self._timeline[self._position]
+            if entry.timestamp > now_ts:
+                break
+            self._position += 1
+            self._dispatch(entry, fired)
+        self._arm()
+
+    def _dispatch(self, entry: ScheduleEntry, now: datetime) -> None:
+        """Fire the bus event for an entry and run its listeners."""
+        if entry.kind == SCHEDULE_KIND_PRAYER:
+            self.hass.bus.async_fire(
+                EVENT_PRAYER_TIME,
+                {
+                    "prayer": entry.name,
+                    "malay_name": PRAYER_NAMES.get(entry.name, entry.name),
+                    "time": dt_util.as_local(entry.when).isoformat(),
+                    "zone": entry.zone,
+                },
+            )
+        elif entry.kind == SCHEDULE_KIND_REMINDER:
+            minutes = self._coordinator.reminder_minutes
+            self.hass.bus.async_fire(
+                EVENT_PRAYER_REMINDER,
+                {
+                    "prayer": entry.name,
+                    "malay_name": PRAYER_NAMES.get(entry.name, entry.name),
+                    "minutes": minutes,
+                    "time": dt_util.as_local(entry.when + timedelta(minutes=minutes)).isoformat(),
+                    "zone": entry.zone,
+                },
+            )
+        else:
+            self.hass.bus.async_fire(
+                EVENT_DERIVED_TIME,
+                {
+                    "name": entry.name,
+                    "malay_name": DERIVED_TIME_NAMES.get(entry.name, entry.name),
+                    "time": dt_util.as_local(entry.when).isoformat(),
+                    "zone": entry.zone,
+                },
+            )
+
+        for action in list(self._listeners.get(entry.kind, [])):
+            if asyncio.iscoroutinefunction(action):
+                self.hass.async_create_task(action(entry, now))
+            else:
+                action(entry, now)
@@ -1,7 +1,7 @@
 """Sensor platform for Waktu Solat Malaysia."""
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -9,7 +9,8 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -29,8 +30,17 @@ from .const import (
     ATTR_ZONE,
     ATTR_HIJRI_DATE,
     ATTR_PRAYER_TIMES,
+    ATTR_UPCOMING_EVENTS,
+    DERIVED_TIMES,
+    DERIVED_TIME_NAMES,
+    DERIVED_TIME_ICONS,
+    AZAN_LATENCY_STAGES,
+    AZAN_LATENCY_STAGE_NAMES,
+    EVENT_AZAN_LATENCY,
 )
-from .coordinator import WaktuSolatCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import WaktuSolatCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,12 +55,26 @@ async def async_setup_entry(
     
     entities = []
     
-    # Create individual prayer time sensors with Malay names
-    for prayer in PRAYER_TIMES:
-        entities.append(WaktuSolatPrayerTimeSensor(coordinator, config_entry, prayer))
+    # Fleet mode: each tracked zone gets its own set of prayer sensors
+    for zone in coordinator.zones:
+        # Create individual prayer time sensors with Malay names
+        for prayer in PRAYER_TIMES:
+            entities.append(WaktuSolatPrayerTimeSensor(coordinator, config_entry, prayer, zone))
+        
+        # Create derived time sensors (disabled by default)
+        for name in DERIVED_TIMES:
+            entities.append(WaktuSolatDerivedTimeSensor(coordinator, config_entry, name, zone))
+        
+        # Create next prayer sensor
+        entities.append(WaktuSolatNextPrayerSensor(coordinator, config_entry, zone))
     
-    # Create next prayer sensor
-    entities.append(WaktuSolatNextPrayerSensor(coordinator, config_entry))
+    # Create Hijri calendar sensors (the Hijri date is the same for every zone)
+    entities.append(WaktuSolatHijriDateSensor(coordinator, config_entry))
+    entities.append(WaktuSolatIslamicEventSensor(coordinator, config_entry))
+    
+    # Azan timing telemetry (diagnostic)
+    for stage in AZAN_LATENCY_STAGES:
+        entities.append(WaktuSolatAzanLatencySensor(coordinator, config_entry, stage))
     
     async_add_entities(entities)
 
@@ -58,22 +82,62 @@ async def async_setup_entry(
 class WaktuSolatEntity(CoordinatorEntity, SensorEntity):
     """Base class for Waktu Solat Malaysia entities."""
 
-    def __init__(self, coordinator: WaktuSolatCoordinator, config_entry: ConfigEntry) -> None:
+    # Timetable cells (prayer/derived names or "hijri") the state depends on
+    _timetable_keys: frozenset = frozenset()
+
+    def __init__(
+        self,
+        coordinator: "WaktuSolatCoordinator",
+        config_entry: ConfigEntry,
+        zone: Optional[str] = None,
+    ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self.config_entry = config_entry
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name="Solat Sync MY",
-            manufacturer=MANUFACTURER,
-            model=MODEL,
-            sw_version=SW_VERSION,
-        )
+        self.zone = zone or coordinator.zone
+        self.is_primary_zone = self.zone == coordinator.zone
+        
+        if self.is_primary_zone:
+            self._unique_id_prefix = config_entry.entry_id
+            self._name_prefix = "Waktu Solat"
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, config_entry.entry_id)},
+                name="Solat Sync MY",
+                manufacturer=MANUFACTURER,
+                model=MODEL,
+                sw_version=SW_VERSION,
+            )
+        else:
+            # Additional fleet zones get their own device under the entry's device
+            self._unique_id_prefix = f"{config_entry.entry_id}_{self.zone}"
+            # The zone code keeps names and entity IDs distinct across zones
+            self._name_prefix = f"Waktu Solat {self.zone}"
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, self._unique_id_prefix)},
+                name=f"Solat Sync MY {self.zone}",
+                manufacturer=MANUFACTURER,
+                model=MODEL,
+                sw_version=SW_VERSION,
+                via_device=(DOMAIN, config_entry.entry_id),
+            )
+
+    async def async_added_to_hass(self) -> None:
+        """Also follow timetable corrections that touch this entity's cells."""
+        await super().async_added_to_hass()
+        if self._timetable_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_cell_listener(self.zone, self._timetable_keys, self.async_write_ha_state)
+            )
+
+    @property
+    def zone_data(self) -> Optional[Dict[str, Any]]:
+        """Return the coordinator data for this entity's zone."""
+        return self.coordinator.get_zone_data(self.zone)
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
+        return self.coordinator.last_update_success and self.zone_data is not None
 
 
 class WaktuSolatPrayerTimeSensor(WaktuSolatEntity):
@@ -81,29 +145,32 @@ class WaktuSolatPrayerTimeSensor(WaktuSolatEntity):
 
     def __init__(
         self,
-        coordinator: WaktuSolatCoordinator,
+        coordinator: "WaktuSolatCoordinator",
         config_entry: ConfigEntry,
-        prayer: str
+        prayer: str,
+        zone: Optional[str] = None,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
+        super().__init__(coordinator, config_entry, zone)
         self.prayer = prayer
+        # After Isyak the sensor shows tomorrow's time; the Hijri date is an attribute
+        self._timetable_keys = frozenset({prayer, "isha", "hijri"})
         
         # Use Malay prayer names for display
         prayer_name = PRAYER_NAMES.get(prayer, prayer.title())
         
-        self._attr_unique_id = f"{config_entry.entry_id}_{prayer}"
-        self._attr_name = f"Waktu Solat {prayer_name}"
+        self._attr_unique_id = f"{self._unique_id_prefix}_{prayer}"
+        self._attr_name = f"{self._name_prefix} {prayer_name}"
         self._attr_icon = PRAYER_ICONS.get(prayer, "mdi:clock")
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
 
     @property
     def native_value(self) -> Optional[datetime]:
         """Return the prayer time."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return None
         
-        prayer_times = self.coordinator.data.get("prayer_times", {})
+        prayer_times = self.zone_data.get("prayer_times", {})
         
         # Check if we need to show next day's prayer times
         current_time = dt_util.now()
@@ -113,7 +180,7 @@ class WaktuSolatPrayerTimeSensor(WaktuSolatEntity):
             isha_time = prayer_times.get("isha")
             if isha_time and current_time.time() > isha_time.time():
                 # Get next day's prayer times
-                next_day_data = self.coordinator.data.get("next_day_prayer_times")
+                next_day_data = self.zone_data.get("next_day_prayer_times")
                 if next_day_data and self.prayer in next_day_data:
                     return next_day_data[self.prayer]
         
@@ -122,37 +189,96 @@ class WaktuSolatPrayerTimeSensor(WaktuSolatEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return extra state attributes."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return {}
         
         attrs = {
-            ATTR_ZONE: self.coordinator.data.get("zone"),
+            ATTR_ZONE: self.zone_data.get("zone"),
             "prayer_name": PRAYER_NAMES.get(self.prayer, self.prayer.title()),
             "prayer_name_english": self.prayer.title(),
         }
         
         # Add Hijri date if available
-        hijri_date = self.coordinator.data.get("hijri_date")
+        hijri_date = self.zone_data.get("hijri_date")
         if hijri_date:
             attrs[ATTR_HIJRI_DATE] = hijri_date
         
         return attrs
 
 
+class WaktuSolatDerivedTimeSensor(WaktuSolatEntity):
+    """Sensor for derived times (Imsak, Dhuha, Islamic midnight, last third)."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: "WaktuSolatCoordinator",
+        config_entry: ConfigEntry,
+        name: str,
+        zone: Optional[str] = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, zone)
+        self.derived_name = name
+        self._timetable_keys = frozenset({name, "isha"})
+        
+        self._attr_unique_id = f"{self._unique_id_prefix}_{name}"
+        self._attr_name = f"{self._name_prefix} {DERIVED_TIME_NAMES.get(name, name.title())}"
+        self._attr_icon = DERIVED_TIME_ICONS.get(name, "mdi:clock")
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self) -> Optional[datetime]:
+        """Return the precomputed derived time."""
+        if not self.zone_data:
+            return None
+        
+        derived_times = self.zone_data.get("derived_times", {})
+        
+        # Imsak and Dhuha move to the next day after Isyak, like the prayer sensors
+        if self.derived_name in ("imsak", "dhuha"):
+            isha_time = self.zone_data.get("prayer_times", {}).get("isha")
+            if isha_time and dt_util.now().time() > isha_time.time():
+                next_day_data = self.zone_data.get("next_day_derived_times")
+                if next_day_data and self.derived_name in next_day_data:
+                    return next_day_data[self.derived_name]
+        
+        return derived_times.get(self.derived_name)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return extra state attributes."""
+        if not self.zone_data:
+            return {}
+        
+        return {
+            ATTR_ZONE: self.zone_data.get("zone"),
+            "derived_name": DERIVED_TIME_NAMES.get(self.derived_name, self.derived_name),
+        }
+
+
 class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
     """Sensor for next prayer information."""
 
-    def __init__(self, coordinator: WaktuSolatCoordinator, config_entry: ConfigEntry) -> None:
+    _timetable_keys = frozenset(PRAYER_TIMES)
+
+    def __init__(
+        self,
+        coordinator: "WaktuSolatCoordinator",
+        config_entry: ConfigEntry,
+        zone: Optional[str] = None,
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_next_prayer"
-        self._attr_name = "Waktu Solat Next Prayer"
+        super().__init__(coordinator, config_entry, zone)
+        self._attr_unique_id = f"{self._unique_id_prefix}_next_prayer"
+        self._attr_name = f"{self._name_prefix} Next Prayer"
         self._attr_icon = "mdi:clock-alert"
 
     @property
     def native_value(self) -> Optional[str]:
         """Return the next prayer name in Malay."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return None
             
         next_prayer = self._get_next_prayer()
@@ -162,10 +288,10 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
 
     def _get_next_prayer(self) -> Optional[str]:
         """Get the next prayer."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return None
             
-        prayer_times = self.coordinator.data.get("prayer_times", {})
+        prayer_times = self.zone_data.get("prayer_times", {})
         if not prayer_times:
             return None
             
@@ -185,10 +311,10 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
 
     def _get_next_prayer_time(self) -> Optional[datetime]:
         """Get the next prayer time."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return None
         
-        prayer_times = self.coordinator.data.get("prayer_times", {})
+        prayer_times = self.zone_data.get("prayer_times", {})
         next_prayer = self._get_next_prayer()
         
         if not next_prayer:
@@ -201,7 +327,7 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
         if (next_prayer == "fajr" and isha_time and 
             current_time.time() > isha_time.time()):
             # Get next day's Subuh time
-            next_day_data = self.coordinator.data.get("next_day_prayer_times")
+            next_day_data = self.zone_data.get("next_day_prayer_times")
             if next_day_data and "fajr" in next_day_data:
                 return next_day_data["fajr"]
                 
@@ -230,7 +356,7 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return extra state attributes."""
-        if not self.coordinator.data:
+        if not self.zone_data:
             return {}
             
         next_prayer = self._get_next_prayer()
@@ -238,7 +364,7 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
         time_to_prayer = self._calculate_time_to_prayer()
         
         attrs = {
-            ATTR_ZONE: self.coordinator.data.get("zone"),
+            ATTR_ZONE: self.zone_data.get("zone"),
             ATTR_NEXT_PRAYER: next_prayer,
             ATTR_NEXT_PRAYER_TIME: next_prayer_time.isoformat() if next_prayer_time else None,
             ATTR_TIME_TO_NEXT_PRAYER: time_to_prayer,
@@ -246,7 +372,7 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
         }
         
         # Add all prayer times for reference
-        prayer_times = self.coordinator.data.get("prayer_times", {})
+        prayer_times = self.zone_data.get("prayer_times", {})
         formatted_times = {}
         for prayer, time_obj in prayer_times.items():
             if time_obj:
@@ -254,8 +380,139 @@ class WaktuSolatNextPrayerSensor(WaktuSolatEntity):
         attrs[ATTR_PRAYER_TIMES] = formatted_times
         
         # Add Hijri date if available
-        hijri_date = self.coordinator.data.get("hijri_date")
+        hijri_date = self.zone_data.get("hijri_date")
         if hijri_date:
             attrs[ATTR_HIJRI_DATE] = hijri_date
         
-        return attrs 
\ No newline at end of file
+        return attrs
+
+
+class WaktuSolatHijriDateSensor(WaktuSolatEntity):
+    """Sensor for today's Hijri date."""
+
+    _timetable_keys = frozenset({"hijri"})
+
+    def __init__(self, coordinator: "WaktuSolatCoordinator", config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self._attr_unique_id = f"{config_entry.entry_id}_hijri_date"
+        self._attr_name = "Waktu Solat Tarikh Hijri"
+        self._attr_icon = "mdi:calendar-star"
+
+    @property
+    def native_value(self) -> Optional[str]:
+        """Return the Hijri date, e.g. '7 Jamadilawal 1448'."""
+        if not self.zone_data:
+            return None
+        
+        hijri = self.zone_data.get("hijri")
+        return hijri.get("formatted") if hijri else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return extra state attributes."""
+        if not self.zone_data:
+            return {}
+        
+        hijri = self.zone_data.get("hijri") or {}
+        return {
+            ATTR_ZONE: self.zone_data.get("zone"),
+            "year": hijri.get("year"),
+            "month": hijri.get("month"),
+            "day": hijri.get("day"),
+            "month_name": hijri.get("month_name"),
+            "iso": hijri.get("iso"),
+            "is_ramadan": hijri.get("is_ramadan"),
+            "is_jumaat": hijri.get("is_jumaat"),
+            "events_today": hijri.get("events_today"),
+            "api_hijri": hijri.get("api_hijri"),
+            "correction_days": hijri.get("correction_days"),
+        }
+
+
+class WaktuSolatIslamicEventSensor(WaktuSolatEntity):
+    """Sensor for the next upcoming Islamic event."""
+
+    _timetable_keys = frozenset({"hijri"})
+
+    def __init__(self, coordinator: "WaktuSolatCoordinator", config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self._attr_unique_id = f"{config_entry.entry_id}_next_islamic_event"
+        self._attr_name = "Waktu Solat Next Islamic Event"
+        self._attr_icon = "mdi:star-crescent"
+
+    def _get_upcoming_events(self) -> list:
+        """Return the precomputed upcoming events."""
+        if not self.zone_data:
+            return []
+        
+        hijri = self.zone_data.get("hijri") or {}
+        return hijri.get("upcoming_events") or []
+
+    @property
+    def native_value(self) -> Optional[str]:
+        """Return the name of the next Islamic event."""
+        events = self._get_upcoming_events()
+        return events[0]["name"] if events else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return extra state attributes."""
+        events = self._get_upcoming_events()
+        if not events:
+            return {}
+        
+        next_event = events[0]
+        return {
+            "key": next_event["key"],
+            "date": next_event["date"],
+            "hijri_date": next_event["hijri_date"],
+            "days_until": next_event["days_until"],
+            ATTR_UPCOMING_EVENTS: events,
+        }
+
+
+class WaktuSolatAzanLatencySensor(WaktuSolatEntity):
+    """Diagnostic sensor for the delay from prayer time to an azan playback stage (rolling p95)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: "WaktuSolatCoordinator", config_entry: ConfigEntry, stage: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self.stage = stage
+        self._attr_unique_id = f"{config_entry.entry_id}_azan_latency_{stage}"
+        self._attr_name = f"Waktu Solat Azan Latency {AZAN_LATENCY_STAGE_NAMES[stage]}"
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever a scheduled azan reports its latency."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.hass.bus.async_listen(EVENT_AZAN_LATENCY, self._handle_latency_event)
+        )
+
+    @callback
+    def _handle_latency_event(self, event: Event) -> None:
+        """Handle a latency report for this entry."""
+        if event.data.get("entry_id") == self.config_entry.entry_id:
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True; telemetry does not depend on the API."""
+        return True
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the rolling p95 latency in milliseconds."""
+        return self.coordinator.azan_latency.summary(self.stage)["p95"]
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return p50, p95, max, the latest sample and the sample count."""
+        return self.coordinator.azan_latency.summary(self.stage)
@@ -0,0 +1,157 @@
+"""Services for the Waktu Solat Malaysia integration."""
+import calendar
+import logging
+import os
+from datetime import date
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+import homeassistant.helpers.config_validation as cv
+
+from . import _async_queue_azan, _test_audio_playback
+from .const import (
+    DOMAIN,
+    AZAN_FILE_NORMAL,
+    SERVICE_PLAY_AZAN,
+    SERVICE_TEST_AUDIO,
+    SERVICE_EXPORT_TIMETABLE,
+    EXPORT_DIR,
+    EXPORT_FORMATS,
+    EXPORT_FORMAT_BOTH,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_ICS,
+    EXPORT_PERIODS,
+    EXPORT_PERIOD_MONTH,
+    EXPORT_PERIOD_YEAR,
+    EXPORT_MAX_DAYS,
+)
+from .export import write_timetable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register services for the integration."""
+    
+    def get_config_entry():
+        """Get the first config entry for this integration."""
+        entries = hass.config_entries.async_entries(DOMAIN)
+        return entries[0] if entries else None
+    
+    async def play_azan_service(call: ServiceCall) -> None:
+        """Service to play azan for a specific prayer."""
+        prayer = call.data.get("prayer")
+        media_player = call.data.get("media_player")
+        volume = call.data.get("volume", 0.7)
+        
+        if not prayer:
+            _LOGGER.error("Prayer parameter is required")
+            return
+        
+        if not media_player:
+            _LOGGER.error("Media player parameter is required")
+            return
+        
+        entry = get_config_entry()
+        await _async_queue_azan(hass, prayer, media_player, volume, entry)
+    
+    async def test_audio_service(call: ServiceCall) -> None:
+        """Service to test audio playback with detailed diagnostics."""
+        media_player = call.data.get("media_player")
+        audio_file = call.data.get("audio_file", AZAN_FILE_NORMAL)
+        volume = call.data.get("volume", 0.5)
+        
+        if not media_player:
+            _LOGGER.error("Media player parameter is required")
+            return
+        
+        entry = get_config_entry()
+        await _test_audio_playback(hass, media_player, audio_file, volume, entry)
+    
+    async def export_timetable_service(call: ServiceCall) -> None:
+        """Service to export a zone's timetable to CSV and/or iCalendar files."""
+        coordinators = list(hass.data.get(DOMAIN, {}).values())
+        if not coordinators:
+            _LOGGER.error("No Solat Sync MY entry is loaded")
+            return
+        
+        zone = call.data.get("zone") or coordinators[0].zone
+        # Prefer the coordinator already tracking this zone so its cache is reused
+        coordinator = next((c for c in coordinators if c.zone == zone), coordinators[0])
+        
+        today = date.today()
+        period = call.data["period"]
+        year = call.data.get("year", today.year)
+        if period == EXPORT_PERIOD_MONTH:
+            month = call.data.get("month", today.month)
+            start = date(year, month, 1)
+            end = date(year, month, calendar.monthrange(year, month)[1])
+            label = f"{zone}_{year}-{month:02d}"
+        elif period == EXPORT_PERIOD_YEAR:
+            start, end = date(year, 1, 1), date(year, 12, 31)
+            label = f"{zone}_{year}"
+        else:
+            start = call.data.get("start_date")
+            end = call.data.get("end_date")
+            if not start or not end or end < start:
+                _LOGGER.error("A valid start_date and end_date are required for range exports")
+                return
+            if (end - start).days >= EXPORT_MAX_DAYS:
+                _LOGGER.error("❌ Range exports are limited to %d days", EXPORT_MAX_DAYS)
+                return
+            label = f"{zone}_{start:%Y%m%d}_{end:%Y%m%d}"
+        
+        fmt = call.data["format"]
+        formats = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_ICS] if fmt == EXPORT_FORMAT_BOTH else [fmt]
+        
+        try:
+            months = await coordinator.async_get_range_index(start, end, zone)
+        except Exception as err:
+            _LOGGER.error("❌ Failed to load timetable for %s: %s", zone, err)
+            return
+        
+        export_dir = hass.config.path(*EXPORT_DIR)
+        for export_format in formats:
+            path = os.path.join(export_dir, f"{label}.{export_format}")
+            await hass.async_add_executor_job(
+                write_timetable, path, export_format, zone, months, start, end
+            )
+    
+    # Register services
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAY_AZAN,
+        play_azan_service,
+        schema=vol.Schema({
+            vol.Required("prayer"): str,
+            vol.Required("media_player"): str,
+            vol.Optional("volume", default=0.7): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1.0)),
+        }),
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TEST_AUDIO,
+        test_audio_service,
+        schema=vol.Schema({
+            vol.Required("media_player"): str,
+            vol.Optional("audio_file", default=AZAN_FILE_NORMAL): str,
+            vol.Optional("volume", default=0.5): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1.0)),
+        }),
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TIMETABLE,
+        export_timetable_service,
+        schema=vol.Schema({
+            vol.Optional("zone"): vol.All(str, vol.Upper),
+            vol.Optional("period", default=EXPORT_PERIOD_MONTH): vol.In(EXPORT_PERIODS),
+            vol.Optional("year"): vol.All(vol.Coerce(int), vol.Range(min=2000, max=2100)),
+            vol.Optional("month"): vol.All(vol.Coerce(int), vol.Range(min=1, max=12)),
+            vol.Optional("start_date"): cv.date,
+            vol.Optional("end_date"): cv.date,
+            vol.Optional("format", default=EXPORT_FORMAT_BOTH): vol.In(EXPORT_FORMATS),
+        }),
+    )
@@ -1,17 +1,17 @@
 """Switch platform for Waktu Solat Malaysia azan automation."""
 import asyncio
 import logging
-import os
-from typing import Any, Dict, Optional
-from datetime import datetime, time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Optional
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -20,19 +20,21 @@ from .const import (
     SW_VERSION,
     AZAN_PRAYERS,
     PRAYER_NAMES,
-    PRAYER_ORDER,
     CONF_AZAN_ENABLED,
-    CONF_AZAN_SUBUH_ENABLED,
-    CONF_AZAN_ZOHOR_ENABLED,
-    CONF_AZAN_ASAR_ENABLED,
-    CONF_AZAN_MAGHRIB_ENABLED,
-    CONF_AZAN_ISYAK_ENABLED,
-    CONF_MEDIA_PLAYER,
-    CONF_AZAN_VOLUME,
-    AZAN_FILE_NORMAL,
-    AZAN_FILE_FAJR,
+    PRAYER_CONFIG_MAP,
+    PLAYBACK_PRIORITY_SCHEDULED,
+    PLAYBACK_PRIORITY_MANUAL,
+    AUDIO_VALIDATION_INTERVAL,
+    CONF_REMINDER_TTS_ENGINE,
+    REMINDER_LANGUAGE,
+    SCHEDULE_KIND_PRAYER,
+    SCHEDULE_KIND_REMINDER,
 )
-from .coordinator import WaktuSolatCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import WaktuSolatCoordinator
+    from .routing import Route
+    from .scheduler import ScheduleEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,19 +53,10 @@ async def async_setup_entry(
     entities.append(WaktuSolatAzanMainSwitch(coordinator, config_entry))
     
     # Create individual prayer azan switches in order: Subuh, Zohor, Asar, Maghrib, Isyak
-    prayer_config_map = {
-        "fajr": CONF_AZAN_SUBUH_ENABLED,
-        "dhuhr": CONF_AZAN_ZOHOR_ENABLED, 
-        "asr": CONF_AZAN_ASAR_ENABLED,
-        "maghrib": CONF_AZAN_MAGHRIB_ENABLED,
-        "isha": CONF_AZAN_ISYAK_ENABLED,
-    }
-    
-    # Add prayer switches in the correct order
     prayer_order = ["fajr", "dhuhr", "asr", "maghrib", "isha"]
     for prayer in prayer_order:
-        if prayer in prayer_config_map:
-            entities.append(WaktuSolatAzanPrayerSwitch(coordinator, config_entry, prayer, prayer_config_map[prayer]))
+        if prayer in PRAYER_CONFIG_MAP:
+            entities.append(WaktuSolatAzanPrayerSwitch(coordinator, config_entry, prayer, PRAYER_CONFIG_MAP[prayer]))
     
     async_add_entities(entities)
 
@@ -71,7 +64,7 @@ async def async_setup_entry(
 class WaktuSolatSwitchEntity(CoordinatorEntity, SwitchEntity):
     """Base class for Waktu Solat Malaysia switch entities."""
 
-    def __init__(self, coordinator: WaktuSolatCoordinator, config_entry: ConfigEntry) -> None:
+    def __init__(self, coordinator: "WaktuSolatCoordinator", config_entry: ConfigEntry) -> None:
         """Initialize the switch entity."""
         super().__init__(coordinator)
         self.config_entry = config_entry
@@ -92,7 +85,7 @@ class WaktuSolatSwitchEntity(CoordinatorEntity, SwitchEntity):
 class WaktuSolatAzanMainSwitch(WaktuSolatSwitchEntity):
     """Switch to control overall azan automation."""
 
-    def __init__(self, coordinator: WaktuSolatCoordinator, config_entry: ConfigEntry) -> None:
+    def __init__(self, coordinator: "WaktuSolatCoordinator", config_entry: ConfigEntry) -> None:
         """Initialize the main azan switch."""
         super().__init__(coordinator, config_entry)
         self._attr_unique_id = f"{config_entry.entry_id}_azan_automation"
@@ -143,63 +136,79 @@ class WaktuSolatAzanMainSwitch(WaktuSolatSwitchEntity):
         if self.is_on:
             await self._setup_time_listeners()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        super()._handle_coordinator_update()
-        
-        # Refresh time listeners when coordinator data changes
-        if self.is_on:
-            self.hass.async_create_task(self._setup_time_listeners())
-
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
         await super().async_will_remove_from_hass()
         self._cleanup_time_listeners()
 
     async def _setup_time_listeners(self) -> None:
-        """Set up time-based listeners for azan automation."""
-        if not self.coordinator.data:
-            _LOGGER.warning("No prayer time data available for azan setup")
-            return
-
+        """Subscribe to the coordinator's scheduler for azan automation."""
         self._cleanup_time_listeners()  # Clean up existing listeners first
-
-        prayer_times = self.coordinator.data.get("prayer_times", {})
         
-        for prayer in AZAN_PRAYERS:
-            if prayer not in prayer_times:
-                continue
-                
-            prayer_time = prayer_times[prayer]
-            if not isinstance(prayer_time, time):
-                continue
-            
-            # Check if this prayer's azan is enabled
-            prayer_config_map = {
-                "fajr": CONF_AZAN_SUBUH_ENABLED,
-                "dhuhr": CONF_AZAN_ZOHOR_ENABLED,
-                "asr": CONF_AZAN_ASAR_ENABLED,
-                "maghrib": CONF_AZAN_MAGHRIB_ENABLED,
-                "isha": CONF_AZAN_ISYAK_ENABLED,
-            }
-            
-            config_key = prayer_config_map.get(prayer)
-            if config_key and not self.config_entry.options.get(config_key, True):
-                continue  # This prayer's azan is disabled
-            
-            # Set up time listener
-            listener = async_track_time_change(
-                self.hass,
-                self._azan_time_callback,
-                hour=prayer_time.hour,
-                minute=prayer_time.minute,
-                second=0
+        # The scheduler keeps the timeline in sync with coordinator data, so
+        # one subscription covers every prayer; enabled prayers are checked at fire time
+        listener = self.coordinator.scheduler.async_add_listener(
+            SCHEDULE_KIND_PRAYER, self._azan_time_callback
+        )
+        self._time_listeners.append(listener)
+        self._time_listeners.append(
+            self.coordinator.scheduler.async_add_listener(
+                SCHEDULE_KIND_REMINDER, self._reminder_time_callback
+            )
+        )
+        
+        # Candidate audio URLs are checked and reminders rendered ahead of time, not when due
+        for prepare, name in (
+            (self._async_prevalidate_audio, "audio pre-validation"),
+            (self._async_prepare_reminders, "reminder rendering"),
+        ):
+            self._time_listeners.append(
+                async_track_time_interval(self.hass, prepare, timedelta(seconds=AUDIO_VALIDATION_INTERVAL))
             )
-            self._time_listeners.append(listener)
-            
-            prayer_name = PRAYER_NAMES.get(prayer, prayer)
-            _LOGGER.info("⏰ Scheduled azan for %s at %s", prayer_name, prayer_time.strftime("%H:%M"))
+            self.config_entry.async_create_background_task(self.hass, prepare(), f"solatsyncmy {name}")
+        
+        for entry in self.coordinator.scheduler.upcoming:
+            if entry.kind != SCHEDULE_KIND_PRAYER:
+                continue
+            if entry.zone == self.coordinator.zone and entry.name in AZAN_PRAYERS:
+                prayer_name = PRAYER_NAMES.get(entry.name, entry.name)
+                local_time = dt_util.as_local(entry.when)
+                route = self.coordinator.routing.resolve(entry.name, local_time)
+                _LOGGER.info(
+                    "⏰ Scheduled azan for %s at %s on %s",
+                    prayer_name, local_time.strftime("%H:%M"), ", ".join(route.media_players) or "no media player",
+                )
+
+    async def _async_prevalidate_audio(self, now: Optional[datetime] = None) -> None:
+        """Validate the audio URLs of the routed media players."""
+        if not any(route.media_players for route in self.coordinator.routing.routes):
+            return
+        from . import _async_prevalidate_audio
+        
+        await _async_prevalidate_audio(self.hass, self.config_entry)
+
+    def _reminder_prayers(self) -> list:
+        """Return the prayers whose azan, and so whose reminder, is enabled."""
+        if not self.coordinator.reminder_minutes:
+            return []
+        return [
+            prayer for prayer in AZAN_PRAYERS
+            if self.config_entry.options.get(PRAYER_CONFIG_MAP.get(prayer), True)
+        ]
+
+    async def _async_prepare_reminders(self, now: Optional[datetime] = None) -> None:
+        """Render the reminder of every enabled prayer, so none waits for TTS when due."""
+        prayers = self._reminder_prayers()
+        if not prayers:
+            return
+        from .reminders import async_get_reminder_cache, reminder_message
+        
+        cache = await async_get_reminder_cache(self.hass)
+        engine = self.config_entry.options.get(CONF_REMINDER_TTS_ENGINE)
+        minutes = self.coordinator.reminder_minutes
+        await asyncio.gather(
+            *(cache.async_render(reminder_message(prayer, minutes), engine, REMINDER_LANGUAGE) for prayer in prayers)
+        )
 
     def _cleanup_time_listeners(self) -> None:
         """Clean up existing time listeners."""
@@ -208,49 +217,98 @@ class WaktuSolatAzanMainSwitch(WaktuSolatSwitchEntity):
 
         self._time_listeners.clear()
 
-    async def _azan_time_callback(self, now) -> None:
+    async def _azan_time_callback(self, entry: "ScheduleEntry", now) -> None:
         """Callback when it's time for azan."""
-        if not self.coordinator.data:
+        # Fleet zones only drive events; azan plays for the entry's primary zone
+        if entry.zone != self.coordinator.zone or entry.name not in AZAN_PRAYERS:
             return
+        
+        # Check if this prayer's azan is enabled
+        config_key = PRAYER_CONFIG_MAP.get(entry.name)
+        if config_key and not self.config_entry.options.get(config_key, True):
+            return  # This prayer's azan is disabled
+        
+        await self._play_azan(entry.name, entry.when, now)
 
-        prayer_times = self.coordinator.data.get("prayer_times", {})
-        current_prayer = None
+    async def _reminder_time_callback(self, entry: "ScheduleEntry", now) -> None:
+        """Play the spoken reminder before an azan, on the players the azan will use."""
+        if entry.zone != self.coordinator.zone or entry.name not in self._reminder_prayers():
+            return
+        from .audio_view import audio_url
+        from .reminders import async_get_reminder_cache, reminder_message
         
-        # Find which prayer this is
-        for prayer in AZAN_PRAYERS:
-            if prayer in prayer_times:
-                prayer_time = prayer_times[prayer]
-                if (prayer_time.hour == now.hour and 
-                    prayer_time.minute == now.minute):
-                    current_prayer = prayer
-                    break
+        minutes = self.coordinator.reminder_minutes
+        message = reminder_message(entry.name, minutes)
+        engine = self.config_entry.options.get(CONF_REMINDER_TTS_ENGINE)
+        cache = await async_get_reminder_cache(self.hass)
+        path = cache.get(message, engine, REMINDER_LANGUAGE)
+        if path is None:
+            _LOGGER.warning("⚠️ Reminder \"%s\" was not rendered ahead of time; rendering now", message)
+            path = await cache.async_render(message, engine, REMINDER_LANGUAGE)
+        url = await self.hass.async_add_executor_job(audio_url, self.hass, path) if path else None
+        if url is None:
+            _LOGGER.error("❌ No audio for reminder \"%s\"", message)
+            return
         
-        if current_prayer:
-            await self._play_azan(current_prayer)
+        prayer_time = dt_util.as_local(entry.when + timedelta(minutes=minutes))
+        route = self.coordinator.routing.resolve(entry.name, prayer_time)
+        _LOGGER.info("🗣️ %s", message)
+        # Keyed by prayer and time, so reminders from other entries or zones are not merged into this one
+        await self._async_play_route(
+            route, f"reminder_{entry.name}", PLAYBACK_PRIORITY_SCHEDULED, entry.when, now, audio_file=url
+        )
 
-    async def _play_azan(self, prayer: str) -> None:
-        """Play azan for the specified prayer."""
-        media_player = self.config_entry.options.get(CONF_MEDIA_PLAYER)
-        if not media_player:
+    async def _play_azan(
+        self, prayer: str, scheduled: Optional[datetime] = None, fired: Optional[datetime] = None
+    ) -> None:
+        """Play azan for the specified prayer on the players its routing rule selects."""
+        route = self.coordinator.routing.resolve(prayer, dt_util.as_local(scheduled or dt_util.utcnow()))
+        if route.rule is not None:
+            _LOGGER.debug("🧭 Azan for %s routed by rule %d", prayer, route.rule + 1)
+        # Scheduled azans take priority over manual plays and tests on the same player
+        priority = PLAYBACK_PRIORITY_SCHEDULED if scheduled else PLAYBACK_PRIORITY_MANUAL
+        await self._async_play_route(route, prayer, priority, scheduled, fired, route.audio_file, route.fade_in)
+
+    async def _async_play_route(
+        self,
+        route: "Route",
+        prayer: str,
+        priority: int,
+        scheduled: Optional[datetime] = None,
+        fired: Optional[datetime] = None,
+        audio_file: Optional[str] = None,
+        fade_in: float = 0,
+    ) -> None:
+        """Play on every media player of a route through their playback queues."""
+        if not route.media_players:
             _LOGGER.warning("No media player configured for azan")
             return
 
-        # Check if media player exists
-        if not self.hass.states.get(media_player):
-            _LOGGER.error("Media player %s not found", media_player)
-            return
+        # Check if the media players exist
+        media_players = []
+        for media_player in route.media_players:
+            if self.hass.states.get(media_player):
+                media_players.append(media_player)
+            else:
+                _LOGGER.error("Media player %s not found", media_player)
 
-        try:
-            volume = self.config_entry.options.get(CONF_AZAN_VOLUME, 0.7)
-            
-            # Import the centralized audio playback function
-            from . import _play_azan_file
-            
-            # Use the centralized audio playback with config entry
-            await _play_azan_file(self.hass, prayer, media_player, volume, self.config_entry)
-            
-        except Exception as err:
-            _LOGGER.error("❌ Failed to play azan for %s: %s", prayer, err)
+        # Import the centralized playback queue
+        from . import _async_queue_azan
+        
+        # Each player has its own queue, so routed players start together
+        results = await asyncio.gather(
+            *(
+                _async_queue_azan(
+                    self.hass, prayer, media_player, route.volume, self.config_entry, scheduled, fired,
+                    priority=priority, audio_file=audio_file, fade_in=fade_in,
+                )
+                for media_player in media_players
+            ),
+            return_exceptions=True,
+        )
+        for media_player, result in zip(media_players, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("❌ Failed to play azan for %s on %s: %s", prayer, media_player, result)
 
 
 class WaktuSolatAzanPrayerSwitch(WaktuSolatSwitchEntity):
@@ -258,7 +316,7 @@ class WaktuSolatAzanPrayerSwitch(WaktuSolatSwitchEntity):
 
     def __init__(
         self,
-        coordinator: WaktuSolatCoordinator,
+        coordinator: "WaktuSolatCoordinator",
         config_entry: ConfigEntry,
         prayer: str,
         config_key: str
@@ -0,0 +1,208 @@
+"""Fetch statistics, playback traces and azan latency telemetry for Waktu Solat Malaysia."""
+import bisect
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_PLAYBACK_TRACES,
+    FETCH_LATENCY_BUCKETS,
+    PLAYBACK_TRACE_LIMIT,
+    AZAN_LATENCY_STAGES,
+    AZAN_LATENCY_WINDOW,
+)
+
+
+class FetchStats:
+    """Counters and a latency histogram for API month fetches and cache lookups."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_seconds = 0.0
+        # One bucket per upper bound plus an overflow bucket
+        self.latency_buckets: List[int] = [0] * (len(FETCH_LATENCY_BUCKETS) + 1)
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[str] = None
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count a month index lookup."""
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def record_fetch(self, seconds: float, error: Optional[Exception] = None) -> None:
+        """Count an API request and its latency."""
+        self.requests += 1
+        self.total_seconds += seconds
+        self.latency_buckets[bisect.bisect_left(FETCH_LATENCY_BUCKETS, seconds)] += 1
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)
+            self.last_error_at = dt_util.utcnow().isoformat()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        lookups = self.cache_hits + self.cache_misses
+        histogram = {f"<={bound}s": count for bound, count in zip(FETCH_LATENCY_BUCKETS, self.latency_buckets)}
+        histogram[f">{FETCH_LATENCY_BUCKETS[-1]}s"] = self.latency_buckets[-1]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "mean_latency_seconds": round(self.total_seconds / self.requests, 3) if self.requests else None,
+            "latency_histogram": histogram,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": round(self.cache_hits / lookups, 3) if lookups else None,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+        }
+
+
+class PlaybackTrace:
+    """Per-stage timings of one azan playback attempt."""
+
+    def __init__(
+        self,
+        prayer: str,
+        media_player: str,
+        entry_id: Optional[str] = None,
+        scheduled: Optional[datetime] = None,
+        fired: Optional[datetime] = None,
+    ) -> None:
+        """Start a trace. Scheduled playbacks also track latency from the prayer time."""
+        self.prayer = prayer
+        self.media_player = media_player
+        self.entry_id = entry_id
+        self.started = dt_util.utcnow()
+        self._start = time.monotonic()
+        # Milliseconds since the trace started, in stage order
+        self.stages: Dict[str, float] = {}
+        # Milliseconds from the scheduled prayer time to each latency stage
+        self.scheduled = scheduled
+        self.latency_ms: Dict[str, float] = {}
+        if scheduled is not None and fired is not None:
+            self.latency_ms["fired"] = round((fired - scheduled).total_seconds() * 1000, 1)
+        self.audio_source: Optional[str] = None
+        self.url: Optional[str] = None
+        self.result = "pending"
+
+    def mark(self, stage: str) -> None:
+        """Record the time a stage completed."""
+        self.stages[stage] = round((time.monotonic() - self._start) * 1000, 1)
+        if self.scheduled is not None and stage in AZAN_LATENCY_STAGES:
+            self.latency_ms[stage] = round(
+                (dt_util.utcnow() - self.scheduled).total_seconds() * 1000, 1
+            )
+
+    def finish(self, result: str) -> None:
+        """Record the outcome of the playback."""
+        self.result = result
+        self.mark("finished")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace for diagnostics."""
+        return {
+            "prayer": self.prayer,
+            "media_player": self.media_player,
+            "started": self.started.isoformat(),
+            "audio_source": self.audio_source,
+            "url": self.url,
+            "result": self.result,
+            "stages_ms": dict(self.stages),
+            "scheduled": self.scheduled.isoformat() if self.scheduled else None,
+            "latency_ms": dict(self.latency_ms),
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class AzanLatencyStats:
+    """Rolling latency percentiles of scheduled azan playbacks, per stage."""
+
+    def __init__(self, window: int = AZAN_LATENCY_WINDOW) -> None:
+        """Initialize empty windows."""
+        self._samples: Dict[str, Deque[float]] = {
+            stage: deque(maxlen=window) for stage in AZAN_LATENCY_STAGES
+        }
+
+    def record(self, trace: PlaybackTrace) -> None:
+        """Add the latencies of a finished trace."""
+        for stage, latency in trace.latency_ms.items():
+            if stage in self._samples:
+                self._samples[stage].append(latency)
+
+    def summary(self, stage: str) -> Dict[str, Any]:
+        """Return p50/p95/max and the latest sample for a stage, in milliseconds."""
+        samples = self._samples[stage]
+        if not samples:
+            return {"samples": 0, "p50": None, "p95": None, "max": None, "last": None}
+        ordered = sorted(samples)
+        return {
+            "samples": len(ordered),
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "max": ordered[-1],
+            "last": samples[-1],
+        }
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the summaries of every stage."""
+        return {stage: self.summary(stage) for stage in AZAN_LATENCY_STAGES}
+
+
+_T = TypeVar("_T")
+
+
+class SetupTimings:
+    """Duration of each config entry setup phase, in milliseconds."""
+
+    def __init__(self) -> None:
+        """Start timing the setup."""
+        self._start = time.monotonic()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of setup work."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.monotonic() - start) * 1000, 1)
+
+    async def async_measure(self, name: str, awaitable: Awaitable[_T]) -> _T:
+        """Time an awaitable, so concurrent phases can be timed separately."""
+        with self.phase(name):
+            return await awaitable
+
+    def finish(self) -> float:
+        """Record and return the total blocking setup time."""
+        self.phases["total"] = round((time.monotonic() - self._start) * 1000, 1)
+        return self.phases["total"]
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the phase durations."""
+        return dict(self.phases)
+
+
+def async_get_playback_traces(hass: HomeAssistant) -> Deque[PlaybackTrace]:
+    """Return the shared ring buffer of recent playback traces."""
+    traces = hass.data.get(DATA_PLAYBACK_TRACES)
+    if traces is None:
+        traces = hass.data[DATA_PLAYBACK_TRACES] = deque(maxlen=PLAYBACK_TRACE_LIMIT)
+    return traces
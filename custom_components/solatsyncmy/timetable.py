@@ -0,0 +1,264 @@
+"""Compact array-backed timetables for Waktu Solat Malaysia.
+
+Each zone-year is one flat int32 array of [day of year][column] offsets in
+seconds from the start of the year (UTC). The columns are the API prayer
+times followed by the derived times. Hijri strings are interned once per
+table and referenced by a per-day index. Day lookups return memoryview
+slices of the array without copying. Re-ingesting a month reports only the
+cells that changed.
+"""
+import calendar
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from .const import PRAYER_TIMES, DERIVED_TIMES
+from .derived import compute_derived_times
+
+COLUMNS = PRAYER_TIMES + DERIVED_TIMES
+COLUMN_INDEX = {name: index for index, name in enumerate(COLUMNS)}
+WIDTH = len(COLUMNS)
+MISSING = -(2 ** 31)  # int32 sentinel for a time the API did not provide
+
+_FAJR = COLUMN_INDEX["fajr"]
+
+# Column name used in changes for the API Hijri date
+HIJRI = "hijri"
+
+
+class CellChange(NamedTuple):
+    """One cell that differs after a month is re-ingested.
+
+    Times are Unix timestamps (None when absent); Hijri values are the API strings.
+    """
+
+    day: date
+    name: str
+    old: Union[int, str, None]
+    new: Union[int, str, None]
+
+
+class ZoneYearTable:
+    """Prayer and derived times of one zone for one Gregorian year."""
+
+    __slots__ = (
+        "zone", "year", "epoch", "days", "months",
+        "_month_start", "_month_length", "_times", "_view", "_hijri", "_hijri_lookup", "_hijri_ids",
+    )
+
+    def __init__(self, zone: str, year: int) -> None:
+        """Allocate an empty table."""
+        self.zone = zone
+        self.year = year
+        self.epoch = calendar.timegm((year, 1, 1, 0, 0, 0))
+        self.days = 366 if calendar.isleap(year) else 365
+        # Months that have been ingested
+        self.months: set = set()
+        # Zero-based day of year of the first of each month
+        self._month_start = [date(year, month, 1).timetuple().tm_yday - 1 for month in range(1, 13)]
+        self._month_length = [calendar.monthrange(year, month)[1] for month in range(1, 13)]
+        self._times = array("i", [MISSING]) * (self.days * WIDTH)
+        self._view = memoryview(self._times)
+        self._hijri: List[str] = [""]
+        self._hijri_lookup: Dict[str, int] = {"": 0}
+        self._hijri_ids = array("H", [0]) * self.days
+
+    def _row_offset(self, month: int, day: int) -> int:
+        """Return the array offset of a day's row."""
+        return (self._month_start[month - 1] + day - 1) * WIDTH
+
+    def _intern_hijri(self, value: str) -> int:
+        """Return the index of a Hijri string, adding it on first use."""
+        index = self._hijri_lookup.get(value)
+        if index is None:
+            index = len(self._hijri)
+            self._hijri.append(sys.intern(value))
+            self._hijri_lookup[value] = index
+        return index
+
+    def ingest_month(
+        self, month: int, prayers: List[Dict[str, Any]], next_fajr: Optional[int] = None
+    ) -> List[CellChange]:
+        """Store one month of API day entries and their derived times.
+
+        next_fajr is the next month's first Subuh, if known, ending the last night.
+        Returns the cells that changed if the month was already stored, else [].
+        """
+        days_in_month = self._month_length[month - 1]
+        day_index = {
+            entry["day"]: entry
+            for entry in prayers
+            if isinstance(entry.get("day"), int) and 1 <= entry["day"] <= days_in_month
+        }
+        derived = compute_derived_times(
+            day_index, {days_in_month: next_fajr} if next_fajr is not None else None
+        )
+
+        start = self._row_offset(month, 1)
+        end = start + days_in_month * WIDTH
+        first_day = start // WIDTH
+        known = month in self.months
+        if known:
+            old_times = self._times[start:end]
+            old_hijri = self._hijri_ids[first_day:first_day + days_in_month]
+        self._times[start:end] = array("i", [MISSING]) * (days_in_month * WIDTH)
+        self._hijri_ids[first_day:first_day + days_in_month] = array("H", [0]) * days_in_month
+        epoch = self.epoch
+        for day, entry in day_index.items():
+            offset = self._row_offset(month, day)
+            for column, prayer in enumerate(PRAYER_TIMES):
+                timestamp = entry.get(prayer)
+                if isinstance(timestamp, int):
+                    self._times[offset + column] = timestamp - epoch
+            for name, timestamp in derived.get(day, {}).items():
+                self._times[offset + COLUMN_INDEX[name]] = timestamp - epoch
+            self._hijri_ids[offset // WIDTH] = self._intern_hijri(str(entry.get("hijri") or ""))
+        self.months.add(month)
+        if not known:
+            return []
+        return self._diff_month(month, old_times, old_hijri)
+
+    def _diff_month(self, month: int, old_times: array, old_hijri: array) -> List[CellChange]:
+        """Compare a re-ingested month with its previous rows."""
+        start = self._row_offset(month, 1)
+        first_day = start // WIDTH
+        changes = []
+        for day in range(1, self._month_length[month - 1] + 1):
+            base = (day - 1) * WIDTH
+            for column in range(WIDTH):
+                old = old_times[base + column]
+                new = self._times[start + base + column]
+                if old != new:
+                    changes.append(CellChange(
+                        date(self.year, month, day),
+                        COLUMNS[column],
+                        None if old == MISSING else self.epoch + old,
+                        None if new == MISSING else self.epoch + new,
+                    ))
+            old_id = old_hijri[day - 1]
+            new_id = self._hijri_ids[first_day + day - 1]
+            if old_id != new_id:
+                changes.append(CellChange(
+                    date(self.year, month, day), HIJRI, self._hijri[old_id], self._hijri[new_id]
+                ))
+        return changes
+
+    def relink_last_day(self, month: int, next_fajr: int) -> List[CellChange]:
+        """Recompute a month's last-day derived times from the next month's first Subuh.
+
+        Returns the derived cells that changed.
+        """
+        last_day = self._month_length[month - 1]
+        entry = self.day_dict(month, last_day)
+        if entry is None:
+            return []
+        derived = compute_derived_times({last_day: entry}, {last_day: next_fajr})[last_day]
+        offset = self._row_offset(month, last_day)
+        changes = []
+        for name in DERIVED_TIMES:
+            old = self._times[offset + COLUMN_INDEX[name]]
+            new = derived[name] - self.epoch if name in derived else MISSING
+            if old != new:
+                self._times[offset + COLUMN_INDEX[name]] = new
+                changes.append(CellChange(
+                    date(self.year, month, last_day),
+                    name,
+                    None if old == MISSING else self.epoch + old,
+                    None if new == MISSING else self.epoch + new,
+                ))
+        return changes
+
+    def first_fajr(self, month: int) -> Optional[int]:
+        """Return the Subuh timestamp of a month's first day, or None if it is missing."""
+        row = self.row(month, 1)
+        return None if row is None else self.epoch + row[_FAJR]
+
+    def row(self, month: int, day: int) -> Optional[memoryview]:
+        """Return a zero-copy view of a day's offsets, or None if the day is missing."""
+        if month not in self.months or not 1 <= day <= self._month_length[month - 1]:
+            return None
+        offset = self._row_offset(month, day)
+        if self._times[offset + _FAJR] == MISSING:
+            return None
+        return self._view[offset:offset + WIDTH]
+
+    def hijri(self, month: int, day: int) -> str:
+        """Return the API Hijri string of a day."""
+        return self._hijri[self._hijri_ids[self._month_start[month - 1] + day - 1]]
+
+    def month_days(self, month: int) -> List[int]:
+        """Return the days of a month that have data."""
+        if month not in self.months:
+            return []
+        start = self._row_offset(month, 1)
+        return [
+            day for day in range(1, self._month_length[month - 1] + 1)
+            if self._times[start + (day - 1) * WIDTH + _FAJR] != MISSING
+        ]
+
+    def day_dict(self, month: int, day: int) -> Optional[Dict[str, Any]]:
+        """Return a day in the API format ({"day", "hijri", prayer: timestamp})."""
+        row = self.row(month, day)
+        if row is None:
+            return None
+        data: Dict[str, Any] = {"day": day, "hijri": self.hijri(month, day)}
+        epoch = self.epoch
+        for column, prayer in enumerate(PRAYER_TIMES):
+            if row[column] != MISSING:
+                data[prayer] = epoch + row[column]
+        return data
+
+    def derived_dict(self, month: int, day: int) -> Dict[str, int]:
+        """Return a day's derived timestamps."""
+        row = self.row(month, day)
+        if row is None:
+            return {}
+        epoch = self.epoch
+        return {
+            name: epoch + row[COLUMN_INDEX[name]]
+            for name in DERIVED_TIMES
+            if row[COLUMN_INDEX[name]] != MISSING
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Return the approximate memory held by the table's data."""
+        return (
+            self._times.itemsize * len(self._times)
+            + self._hijri_ids.itemsize * len(self._hijri_ids)
+            + sum(sys.getsizeof(value) for value in self._hijri)
+        )
+
+
+class MonthView(Mapping):
+    """Read-only {day: data} mapping over one month of a table.
+
+    Days are materialised as dicts only when accessed, so callers written for
+    the API's per-day dicts keep working without the table holding them.
+    """
+
+    __slots__ = ("table", "month", "derived")
+
+    def __init__(self, table: ZoneYearTable, month: int, derived: bool = False) -> None:
+        """Initialize the view; derived views map days to derived timestamps."""
+        self.table = table
+        self.month = month
+        self.derived = derived
+
+    def __getitem__(self, day: int) -> Dict[str, Any]:
+        if self.derived:
+            if self.table.row(self.month, day) is None:
+                raise KeyError(day)
+            return self.table.derived_dict(self.month, day)
+        data = self.table.day_dict(self.month, day)
+        if data is None:
+            raise KeyError(day)
+        return data
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.table.month_days(self.month))
+
+    def __len__(self) -> int:
+        return len(self.table.month_days(self.month))
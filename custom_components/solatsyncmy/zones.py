@@ -0,0 +1,257 @@
+"""Zone catalogue for Waktu Solat Malaysia.
+
+The JAKIM zone list is fetched from the API, cached persistently with a
+TTL, and indexed for constant-time validation and type-ahead search. The
+bundled list below is used when the API is unreachable, and a failed
+refresh is not retried for an hour.
+"""
+import asyncio
+import bisect
+import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    API_BASE_URL,
+    API_TIMEOUT,
+    CONF_API_BASE_URL,
+    DATA_ZONE_CATALOGUE,
+    ZONE_CATALOGUE_RETRY,
+    ZONE_CATALOGUE_STORAGE_VERSION,
+    ZONE_CATALOGUE_TTL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bundled JAKIM zones (offline fallback): (code, "State - District, District, ...")
+BUNDLED_ZONES = [
+    ("JHR01", "Johor - Pulau Aur dan Pulau Pemanggil"),
+    ("JHR02", "Johor - Johor Bahru, Kota Tinggi, Mersing, Kulai"),
+    ("JHR03", "Johor - Kluang, Pontian"),
+    ("JHR04", "Johor - Batu Pahat, Muar, Segamat, Gemas Johor, Tangkak"),
+    ("KDH01", "Kedah - Kota Setar, Kubang Pasu, Pokok Sena"),
+    ("KDH02", "Kedah - Kuala Muda, Yan, Pendang"),
+    ("KDH03", "Kedah - Padang Terap, Sik"),
+    ("KDH04", "Kedah - Baling"),
+    ("KDH05", "Kedah - Bandar Baharu, Kulim"),
+    ("KDH06", "Kedah - Langkawi"),
+    ("KDH07", "Kedah - Puncak Gunung Jerai"),
+    ("KTN01", "Kelantan - Bachok, Kota Bharu, Machang, Pasir Mas, Pasir Puteh, Tanah Merah, Tumpat, Kuala Krai, Mukim Chiku"),
+    ("KTN02", "Kelantan - Gua Musang, Jeli, Jajahan Kecil Lojing"),
+    ("MLK01", "Melaka - Seluruh Negeri Melaka"),
+    ("NGS01", "Negeri Sembilan - Tampin, Jempol"),
+    ("NGS02", "Negeri Sembilan - Jelebu, Kuala Pilah, Rembau"),
+    ("NGS03", "Negeri Sembilan - Port Dickson, Seremban"),
+    ("PHG01", "Pahang - Pulau Tioman"),
+    ("PHG02", "Pahang - Kuantan, Pekan, Muadzam Shah"),
+    ("PHG03", "Pahang - Jerantut, Temerloh, Maran, Bera, Chenor, Jengka"),
+    ("PHG04", "Pahang - Bentong, Lipis, Raub"),
+    ("PHG05", "Pahang - Genting Sempah, Janda Baik, Bukit Tinggi"),
+    ("PHG06", "Pahang - Cameron Highlands, Genting Higlands, Bukit Fraser"),
+    ("PRK01", "Perak - Tapah, Slim River, Tanjung Malim"),
+    ("PRK02", "Perak - Kuala Kangsar, Sg. Siput, Ipoh, Batu Gajah, Kampar"),
+    ("PRK03", "Perak - Lenggong, Pengkalan Hulu, Grik"),
+    ("PRK04", "Perak - Temengor, Belum"),
+    ("PRK05", "Perak - Kg Gajah, Teluk Intan, Bagan Datuk, Seri Iskandar, Beruas, Parit, Lumut, Sitiawan, Pulau Pangkor"),
+    ("PRK06", "Perak - Selama, Taiping, Bagan Serai, Parit Buntar"),
+    ("PRK07", "Perak - Bukit Larut"),
+    ("PLS01", "Perlis - Seluruh Negeri Perlis"),
+    ("PNG01", "Pulau Pinang - Seluruh Negeri Pulau Pinang"),
+    ("SBH01", "Sabah - Bahagian Sandakan (Timur)"),
+    ("SBH02", "Sabah - Beluran, Telupid, Pinangah, Terusan, Kuamut, Bahagian Sandakan (Barat)"),
+    ("SBH03", "Sabah - Lahad Datu, Silabukan, Kunak, Sahabat, Semporna, Tungku, Bahagian Tawau (Timur)"),
+    ("SBH04", "Sabah - Bandar Tawau, Balong, Merotai, Kalabakan, Bahagian Tawau (Barat)"),
+    ("SBH05", "Sabah - Kudat, Kota Marudu, Pitas, Pulau Banggi, Bahagian Kudat"),
+    ("SBH06", "Sabah - Gunung Kinabalu"),
+    ("SBH07", "Sabah - Kota Kinabalu, Ranau, Kota Belud, Tuaran, Penampang, Papar, Putatan, Bahagian Pantai Barat"),
+    ("SBH08", "Sabah - Pensiangan, Keningau, Tambunan, Nabawan, Bahagian Pendalaman (Atas)"),
+    ("SBH09", "Sabah - Beaufort, Kuala Penyu, Sipitang, Tenom, Long Pasia, Membakut, Weston, Bahagian Pendalaman (Bawah)"),
+    ("SWK01", "Sarawak - Limbang, Lawas, Sundar, Trusan"),
+    ("SWK02", "Sarawak - Miri, Niah, Bekenu, Sibuti, Marudi"),
+    ("SWK03", "Sarawak - Pandan, Belaga, Suai, Tatau, Sebauh, Bintulu"),
+    ("SWK04", "Sarawak - Sibu, Mukah, Dalat, Song, Igan, Oya, Balingian, Kanowit, Kapit"),
+    ("SWK05", "Sarawak - Sarikei, Matu, Julau, Rajang, Daro, Bintangor, Belawai"),
+    ("SWK06", "Sarawak - Lubok Antu, Sri Aman, Roban, Debak, Kabong, Lingga, Engkelili, Betong, Spaoh, Pusa, Saratok"),
+    ("SWK07", "Sarawak - Serian, Simunjan, Samarahan, Sebuyau, Meludam"),
+    ("SWK08", "Sarawak - Kuching, Bau, Lundu, Sematan"),
+    ("SWK09", "Sarawak - Zon Khas (Kampung Patarikan)"),
+    ("SGR01", "Selangor - Gombak, Petaling, Sepang, Hulu Langat, Hulu Selangor, Shah Alam"),
+    ("SGR02", "Selangor - Kuala Selangor, Sabak Bernam"),
+    ("SGR03", "Selangor - Klang, Kuala Langat"),
+    ("TRG01", "Terengganu - Kuala Terengganu, Marang, Kuala Nerus"),
+    ("TRG02", "Terengganu - Besut, Setiu"),
+    ("TRG03", "Terengganu - Hulu Terengganu"),
+    ("TRG04", "Terengganu - Dungun, Kemaman"),
+    ("WLY01", "Wilayah Persekutuan - Kuala Lumpur, Putrajaya"),
+    ("WLY02", "Wilayah Persekutuan - Labuan"),
+]
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+class ZoneInfo(NamedTuple):
+    """A JAKIM prayer time zone."""
+
+    code: str
+    state: str
+    districts: Tuple[str, ...]
+
+    @property
+    def label(self) -> str:
+        """Return the display label, e.g. 'Selangor - Klang, Kuala Langat'."""
+        return f"{self.state} - {', '.join(self.districts)}"
+
+
+class ZoneCatalogue:
+    """Zones indexed by code and by the words of their state and district names."""
+
+    def __init__(
+        self, zones: Iterable[ZoneInfo], source: str = "bundled", fetched_at: float = 0.0
+    ) -> None:
+        """Build the indexes."""
+        self.source = source
+        self.fetched_at = fetched_at
+        # When async_get_zone_catalogue next tries the API
+        self.refresh_at = fetched_at + ZONE_CATALOGUE_TTL
+        self._by_code: Dict[str, ZoneInfo] = {}
+        # Sorted (token, code) pairs; a prefix search is a bisect range scan
+        tokens = set()
+        for zone in sorted(zones):
+            self._by_code[zone.code] = zone
+            for text in (zone.code, zone.state, *zone.districts):
+                for token in _TOKEN_SPLIT.split(text.lower()):
+                    if token:
+                        tokens.add((token, zone.code))
+        self._tokens = sorted(tokens)
+
+    def __contains__(self, code: object) -> bool:
+        return isinstance(code, str) and code.upper() in self._by_code
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def get(self, code: str) -> Optional[ZoneInfo]:
+        """Return a zone by code."""
+        return self._by_code.get(code.upper())
+
+    @property
+    def zones(self) -> List[ZoneInfo]:
+        """Return all zones ordered by code."""
+        return list(self._by_code.values())
+
+    def search(self, query: str, limit: int = 10) -> List[ZoneInfo]:
+        """Return zones whose code, state or district words start with every query word."""
+        words = [word for word in _TOKEN_SPLIT.split(query.lower()) if word]
+        if not words:
+            return self.zones[:limit]
+        
+        matches: Optional[set] = None
+        for word in words:
+            start = bisect.bisect_left(self._tokens, (word, ""))
+            found = set()
+            for token, code in self._tokens[start:]:
+                if not token.startswith(word):
+                    break
+                found.add(code)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [self._by_code[code] for code in sorted(matches)][:limit]
+
+    def as_options(self) -> List[Dict[str, str]]:
+        """Return select selector options."""
+        return [{"value": zone.code, "label": zone.label} for zone in self._by_code.values()]
+
+    def as_storage(self) -> List[Dict[str, Any]]:
+        """Return the zones in the API's format for persistent storage."""
+        return [
+            {"jakimCode": zone.code, "negeri": zone.state, "daerah": ", ".join(zone.districts)}
+            for zone in self._by_code.values()
+        ]
+
+
+def _split_districts(text: str) -> Tuple[str, ...]:
+    """Split a comma separated district list."""
+    return tuple(part.strip() for part in text.split(",") if part.strip())
+
+
+def _parse_api_zones(payload: Any) -> List[ZoneInfo]:
+    """Parse the API zone list ([{jakimCode, negeri, daerah}, ...])."""
+    zones = []
+    for item in payload if isinstance(payload, list) else []:
+        if not isinstance(item, dict):
+            continue
+        code = str(item.get("jakimCode", "")).strip().upper()
+        state = str(item.get("negeri", "")).strip()
+        if not code or not state:
+            continue
+        zones.append(ZoneInfo(code, state, _split_districts(str(item.get("daerah", "")))))
+    return zones
+
+
+def bundled_catalogue() -> ZoneCatalogue:
+    """Build the catalogue from the bundled zone list."""
+    zones = []
+    for code, label in BUNDLED_ZONES:
+        state, _, districts = label.partition(" - ")
+        zones.append(ZoneInfo(code, state, _split_districts(districts)))
+    return ZoneCatalogue(zones, "bundled")
+
+
+def _api_base_url(hass: HomeAssistant) -> str:
+    """Return the API base URL, following an entry's override if one is configured."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if base_url := entry.options.get(CONF_API_BASE_URL):
+            return base_url.rstrip("/")
+    return API_BASE_URL
+
+
+async def _async_fetch_zones(hass: HomeAssistant) -> List[ZoneInfo]:
+    """Fetch the zone list from the API."""
+    session = async_get_clientsession(hass)
+    async with asyncio.timeout(API_TIMEOUT):
+        async with session.get(f"{_api_base_url(hass)}/zones") as response:
+            response.raise_for_status()
+            return _parse_api_zones(await response.json())
+
+
+async def async_get_zone_catalogue(hass: HomeAssistant) -> ZoneCatalogue:
+    """Return the zone catalogue, refreshing it from the API when the cache has expired."""
+    catalogue = hass.data.get(DATA_ZONE_CATALOGUE)
+    if catalogue is not None and time.time() < catalogue.refresh_at:
+        return catalogue
+    
+    store = Store(hass, ZONE_CATALOGUE_STORAGE_VERSION, f"{DOMAIN}.zones")
+    if catalogue is None:
+        stored = await store.async_load() or {}
+        zones = _parse_api_zones(stored.get("zones"))
+        catalogue = ZoneCatalogue(zones, "cache", stored.get("fetched_at", 0.0)) if zones else None
+    
+    if catalogue is None or time.time() >= catalogue.refresh_at:
+        try:
+            fresh = await _async_fetch_zones(hass)
+        except Exception as err:  # Network errors fall back to the cached or bundled list
+            _LOGGER.warning(
+                "Could not fetch zone catalogue, using %s list: %s",
+                "cached" if catalogue else "bundled", err,
+            )
+            fresh = None
+        if fresh:
+            catalogue = ZoneCatalogue(fresh, "api", time.time())
+            await store.async_save(
+                {"fetched_at": catalogue.fetched_at, "zones": catalogue.as_storage()}
+            )
+            _LOGGER.info("🗺️ Zone catalogue refreshed from API (%d zones)", len(catalogue))
+        else:
+            # Back off so opening the config flow does not wait on the API every time
+            catalogue = catalogue or bundled_catalogue()
+            catalogue.refresh_at = time.time() + ZONE_CATALOGUE_RETRY
+    
+    hass.data[DATA_ZONE_CATALOGUE] = catalogue
+    return catalogue
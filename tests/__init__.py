@@ -0,0 +1 @@
+"""Tests for the Solat Sync MY integration."""
@@ -0,0 +1 @@
+"""Benchmarks for the Solat Sync MY integration."""
@@ -0,0 +1,139 @@
+"""Benchmark harness for Solat Sync MY hot paths.
+
+Benchmarks are opt-in, since wall-clock timings are too noisy for every
+test run. Each reports the best per-call time over several rounds.
+
+    pytest tests/benchmarks --benchmark       compare with baselines.json;
+                                              slower than baseline * tolerance fails
+    pytest tests/benchmarks --benchmark-save  write this run's results as baselines
+
+SOLATSYNCMY_BENCH_TOLERANCE sets the allowed slowdown factor (default 1.5).
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import pytest
+
+BASELINES_FILE = Path(__file__).with_name("baselines.json")
+TOLERANCE = float(os.environ.get("SOLATSYNCMY_BENCH_TOLERANCE", "1.5"))
+
+# Scales (zones per entry, or entries) covered by each benchmark
+SCALES = [1, 10, 100, 500]
+
+
+class BenchmarkRecorder:
+    """Collect timings and compare them with stored baselines."""
+
+    def __init__(self) -> None:
+        """Load stored baselines."""
+        self.baselines: Dict[str, float] = {}
+        if BASELINES_FILE.exists():
+            self.baselines = json.loads(BASELINES_FILE.read_text())
+        self.results: Dict[str, float] = {}
+        # Set by --benchmark-save: record results instead of comparing them
+        self.update = False
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a result and fail if it regressed against its baseline."""
+        self.results[name] = seconds
+        baseline = self.baselines.get(name)
+        if baseline is None or self.update:
+            return
+        if seconds > baseline * TOLERANCE:
+            pytest.fail(
+                f"{name} regressed: {seconds * 1e6:.1f} µs vs baseline "
+                f"{baseline * 1e6:.1f} µs (tolerance x{TOLERANCE})"
+            )
+
+    def save(self) -> None:
+        """Persist this run's results as the baselines."""
+        if self.results:
+            self.baselines.update(self.results)
+            BASELINES_FILE.write_text(json.dumps(self.baselines, indent=2, sort_keys=True) + "\n")
+
+
+_RECORDER = BenchmarkRecorder()
+
+
+def pytest_configure(config) -> None:
+    """Record instead of compare when saving baselines."""
+    _RECORDER.update = config.getoption("--benchmark-save")
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    """Skip the benchmarks unless they were asked for."""
+    if config.getoption("--benchmark") or config.getoption("--benchmark-save"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark or --benchmark-save")
+    directory = Path(__file__).parent
+    for item in items:
+        if directory in item.path.parents:
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    """Write baselines once all benchmarks have run, if asked to."""
+    if session.config.getoption("--benchmark-save"):
+        _RECORDER.save()
+
+
+@pytest.fixture
+def perf():
+    """Return a function timing a sync or async callable: perf(name, func, number=...)."""
+
+    async def run(name: str, func: Callable[[], Any], number: int = 100, rounds: int = 5) -> float:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(number):
+                result = func()
+                if asyncio.iscoroutine(result):
+                    await result
+            best = min(best, (time.perf_counter() - start) / number)
+        _RECORDER.record(name, best)
+        return best
+
+    return run
+
+
+@pytest.fixture
+def coordinator_factory(hass):
+    """Return a factory for coordinators preloaded with synthetic months for N zones."""
+    from datetime import timedelta
+
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.solatsyncmy.const import CONF_ZONE, CONF_ZONES, DOMAIN
+    from custom_components.solatsyncmy.coordinator import WaktuSolatCoordinator
+    from tests.synthetic import make_month, make_zones
+
+    async def factory(zone_count: int) -> WaktuSolatCoordinator:
+        zones = make_zones(zone_count)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_ZONE: zones[0], CONF_ZONES: zones[1:]},
+            title=f"Benchmark ({zone_count} zones)",
+        )
+        entry.add_to_hass(hass)
+        coordinator = WaktuSolatCoordinator(hass, entry)
+        today = dt_util.now().date()
+        for zone in zones:
+            for day in (today, today + timedelta(days=1)):
+                coordinator._index_month(
+                    zone, day.year, day.month, make_month(zone, day.year, day.month)
+                )
+        coordinator.async_set_updated_data(await coordinator._async_update_data())
+        return coordinator
+
+    return factory
+
+
+@pytest.fixture
+def bench_recorder() -> BenchmarkRecorder:
+    """Return the shared recorder for benchmarks that take their own measurements."""
+    return _RECORDER
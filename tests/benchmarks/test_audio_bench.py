@@ -0,0 +1,48 @@
+"""Benchmarks for audio URL resolution."""
+import os
+
+import pytest
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solatsyncmy import _get_audio_urls
+from custom_components.solatsyncmy.const import (
+    AUDIO_SOURCE_BUNDLED,
+    AUDIO_SOURCE_LOCAL_ONLY,
+    AUDIO_SOURCE_MIXED,
+    AZAN_FILE_FAJR,
+    AZAN_FILE_NORMAL,
+    CONF_AUDIO_SOURCE,
+    CONF_ZONE,
+    DOMAIN,
+)
+
+from .conftest import SCALES
+
+
+@pytest.fixture
+def audio_dir(hass):
+    """Create www/solatsyncmy with real-sized azan files."""
+    path = hass.config.path("www", "solatsyncmy")
+    os.makedirs(path, exist_ok=True)
+    for name in (AZAN_FILE_NORMAL, AZAN_FILE_FAJR, "azan_maghrib.mp3"):
+        with open(os.path.join(path, name), "wb") as handle:
+            handle.write(b"\0" * 4096)
+    return path
+
+
+@pytest.mark.parametrize("audio_source", [AUDIO_SOURCE_BUNDLED, AUDIO_SOURCE_LOCAL_ONLY, AUDIO_SOURCE_MIXED])
+@pytest.mark.parametrize("entry_count", SCALES)
+async def test_get_audio_urls(perf, hass, audio_dir, audio_source, entry_count) -> None:
+    """Resolve azan URLs for every prayer across N config entries."""
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data={CONF_ZONE: "SGR01"}, options={CONF_AUDIO_SOURCE: audio_source})
+        for _ in range(entry_count)
+    ]
+
+    async def resolve_all() -> None:
+        for entry in entries:
+            for prayer in ("fajr", "dhuhr", "asr", "maghrib", "isha"):
+                await _get_audio_urls(hass, prayer, audio_source, entry)
+
+    await perf(f"get_audio_urls[{audio_source}-{entry_count}]", resolve_all, number=1, rounds=5)
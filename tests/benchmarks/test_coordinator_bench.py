@@ -0,0 +1,28 @@
+"""Benchmarks for coordinator data extraction."""
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from .conftest import SCALES
+
+
+@pytest.mark.parametrize("zone_count", SCALES)
+async def test_extract_daily_data_from_monthly(perf, coordinator_factory, zone_count) -> None:
+    """Extract today's data for every zone from the month index."""
+    coordinator = await coordinator_factory(zone_count)
+    today = dt_util.now().date()
+    monthly = [{"zone": zone} for zone in coordinator.zones]
+
+    def extract_all() -> None:
+        for monthly_data in monthly:
+            coordinator._extract_daily_data_from_monthly(monthly_data, today)
+
+    await perf(f"extract_daily_data[{zone_count}]", extract_all, number=20)
+
+
+@pytest.mark.parametrize("zone_count", SCALES)
+async def test_update_data_from_cache(perf, coordinator_factory, zone_count) -> None:
+    """Run a full cached coordinator update for every zone."""
+    coordinator = await coordinator_factory(zone_count)
+
+    await perf(f"update_data_cached[{zone_count}]", coordinator._async_update_data, number=5)
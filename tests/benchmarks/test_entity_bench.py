@@ -0,0 +1,37 @@
+"""Benchmarks for sensor property evaluation."""
+import pytest
+
+from custom_components.solatsyncmy.const import DERIVED_TIMES, PRAYER_TIMES
+from custom_components.solatsyncmy.sensor import (
+    WaktuSolatDerivedTimeSensor,
+    WaktuSolatHijriDateSensor,
+    WaktuSolatIslamicEventSensor,
+    WaktuSolatNextPrayerSensor,
+    WaktuSolatPrayerTimeSensor,
+)
+
+from .conftest import SCALES
+
+
+@pytest.mark.parametrize("zone_count", SCALES)
+async def test_entity_properties(perf, coordinator_factory, zone_count) -> None:
+    """Evaluate state and attributes of every sensor, as a state write would."""
+    coordinator = await coordinator_factory(zone_count)
+    entry = coordinator.config_entry
+    entities = []
+    for zone in coordinator.zones:
+        entities += [WaktuSolatPrayerTimeSensor(coordinator, entry, p, zone) for p in PRAYER_TIMES]
+        entities += [WaktuSolatDerivedTimeSensor(coordinator, entry, n, zone) for n in DERIVED_TIMES]
+        entities.append(WaktuSolatNextPrayerSensor(coordinator, entry, zone))
+    entities += [
+        WaktuSolatHijriDateSensor(coordinator, entry),
+        WaktuSolatIslamicEventSensor(coordinator, entry),
+    ]
+
+    def evaluate_all() -> None:
+        for entity in entities:
+            entity.available
+            entity.native_value
+            entity.extra_state_attributes
+
+    await perf(f"entity_properties[{zone_count}]", evaluate_all, number=5)
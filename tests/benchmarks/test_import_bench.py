@@ -0,0 +1,64 @@
+"""Benchmark of the integration's import cost on top of Home Assistant's own bootstrap."""
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).parents[2]
+MARKER = "--- solatsyncmy ---"
+
+# Modules Home Assistant has already loaded when it sets up a sensor/switch integration
+PRELUDE = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
+    "homeassistant.components.sensor",
+    "homeassistant.components.switch",
+]
+
+# Loaded at setup: the package and its platforms
+RUNTIME = [
+    "custom_components.solatsyncmy",
+    "custom_components.solatsyncmy.sensor",
+    "custom_components.solatsyncmy.switch",
+]
+
+# Only needed by config flows, services, diagnostics, exports or location following
+DEFERRED = ["config_flow", "services", "export", "geo", "zones", "diagnostics"]
+
+RUNS = 3
+
+
+def _import_runtime() -> Tuple[float, List[str]]:
+    """Import the runtime modules under -X importtime; return seconds and loaded submodules."""
+    code = (
+        f"import {', '.join(PRELUDE)}, sys\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"import {', '.join(RUNTIME)}\n"
+        "print(' '.join(m for m in sys.modules if m.startswith('custom_components.solatsyncmy.')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    log = result.stderr.split(MARKER, 1)[1]
+    # "import time: self [us] | cumulative | imported package"; self times sum to the total
+    micros = sum(
+        int(line.split("|")[0].split(":")[1])
+        for line in log.splitlines()
+        if line.startswith("import time:") and line.split("|")[0].split(":")[1].strip().isdigit()
+    )
+    modules = [name.rsplit(".", 1)[1] for name in result.stdout.split()]
+    return micros / 1e6, modules
+
+
+def test_runtime_import_time(bench_recorder) -> None:
+    """Importing the package and platforms stays cheap and skips deferred modules."""
+    runs = [_import_runtime() for _ in range(RUNS)]
+
+    loaded = runs[0][1]
+    assert not set(DEFERRED) & set(loaded), f"deferred modules imported at runtime: {loaded}"
+    bench_recorder.record("import[runtime]", min(seconds for seconds, _ in runs))
@@ -0,0 +1,57 @@
+"""Memory benchmarks: a year of cached months as API dicts vs compact tables."""
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+from custom_components.solatsyncmy.derived import compute_derived_times
+from custom_components.solatsyncmy.timetable import ZoneYearTable
+from tests.synthetic import make_month, make_zones
+
+from .conftest import SCALES
+
+YEAR = 2025
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by what build() returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+@pytest.mark.parametrize("zone_count", [scale for scale in SCALES if scale <= 100])
+def test_timetable_memory(bench_recorder, zone_count) -> None:
+    """A zone-year table holds a year of months in a fraction of the dict index memory."""
+    zones = make_zones(zone_count)
+    responses = {
+        (zone, month): make_month(zone, YEAR, month)["prayers"]
+        for zone in zones
+        for month in range(1, 13)
+    }
+
+    def build_dicts() -> Any:
+        index = {}
+        for (zone, month), prayers in responses.items():
+            day_index = {entry["day"]: dict(entry) for entry in prayers}
+            index[(zone, YEAR, month)] = (day_index, compute_derived_times(day_index))
+        return index
+
+    def build_tables() -> Any:
+        tables = {zone: ZoneYearTable(zone, YEAR) for zone in zones}
+        for (zone, month), prayers in responses.items():
+            tables[zone].ingest_month(month, prayers)
+        return tables
+
+    dict_bytes = _allocated(build_dicts)
+    table_bytes = _allocated(build_tables)
+    bench_recorder.record(f"memory_bytes[json-{zone_count}]", dict_bytes)
+    bench_recorder.record(f"memory_bytes[table-{zone_count}]", table_bytes)
+
+    assert table_bytes * 4 < dict_bytes
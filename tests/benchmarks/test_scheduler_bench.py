@@ -0,0 +1,40 @@
+"""Benchmarks for scheduler timeline rebuilds and in-place updates."""
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.solatsyncmy.timetable import CellChange
+
+from .conftest import SCALES
+
+
+@pytest.mark.parametrize("zone_count", SCALES)
+async def test_schedule_rebuild(perf, coordinator_factory, zone_count) -> None:
+    """Rebuild and re-arm the shared timeline for every zone."""
+    coordinator = await coordinator_factory(zone_count)
+    scheduler = coordinator.scheduler
+
+    try:
+        await perf(f"schedule_rebuild[{zone_count}]", scheduler.async_rebuild, number=10)
+    finally:
+        scheduler.async_stop()
+
+
+@pytest.mark.parametrize("zone_count", SCALES)
+async def test_schedule_apply_changes(perf, coordinator_factory, zone_count) -> None:
+    """Move one corrected prayer in a full timeline instead of rebuilding it."""
+    coordinator = await coordinator_factory(zone_count)
+    scheduler = coordinator.scheduler
+    scheduler.async_rebuild()
+    entry = scheduler.upcoming[-1]
+    forward = [CellChange(dt_util.as_local(entry.when).date(), entry.name, entry.timestamp, entry.timestamp + 60)]
+    back = [CellChange(change.day, change.name, change.new, change.old) for change in forward]
+
+    def apply_round_trip() -> None:
+        scheduler.async_apply_changes(entry.zone, forward)
+        scheduler.async_apply_changes(entry.zone, back)
+
+    try:
+        await perf(f"schedule_apply_changes[{zone_count}]", apply_round_trip, number=100)
+    finally:
+        scheduler.async_stop()
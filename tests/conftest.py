@@ -0,0 +1,65 @@
+"""Shared fixtures for Solat Sync MY tests."""
+import pytest
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+def pytest_addoption(parser) -> None:
+    """Add the opt-in benchmark options (see tests/benchmarks/conftest.py)."""
+    group = parser.getgroup("solatsyncmy benchmarks")
+    group.addoption(
+        "--benchmark", action="store_true", help="run tests/benchmarks and compare with the stored baselines"
+    )
+    group.addoption(
+        "--benchmark-save", action="store_true", help="run tests/benchmarks and write their results as baselines"
+    )
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations, hass):
+    """Enable loading custom_components/solatsyncmy in every test.
+
+    The bundled timetable pack is disabled so tests exercise the API path;
+    tests of the pack install their own in hass.data.
+    """
+    from custom_components.solatsyncmy.const import DATA_TIMETABLE_PACK
+
+    hass.data[DATA_TIMETABLE_PACK] = None
+    yield
+
+
+@pytest.fixture
+async def fake_api(socket_enabled):
+    """Start the fake waktusolat.app API on localhost and yield it.
+
+    Point an entry at it with options={CONF_API_BASE_URL: fake_api.base_url}.
+    """
+    from aiohttp.test_utils import TestServer
+
+    from tests.fake_api import FakeWaktuSolatApi
+
+    api = FakeWaktuSolatApi()
+    server = TestServer(api.app)
+    await server.start_server()
+    api.base_url = str(server.make_url("")).rstrip("/")
+    yield api
+    await server.close()
+
+
+@pytest.fixture
+async def setup_entry(hass, fake_api):
+    """Set up a config entry for SGR01 against the fake API and return it."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.solatsyncmy.const import CONF_API_BASE_URL, CONF_ZONE, DOMAIN
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Waktu Solat SGR01",
+        data={CONF_ZONE: "SGR01"},
+        options={CONF_API_BASE_URL: fake_api.base_url},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,140 @@
+"""Local stand-in for the waktusolat.app API.
+
+Serves `/v2/solat/{zone}?year=&month=` and `/zones` from deterministic
+synthetic months (tests/synthetic.py) or recorded JSON responses, with
+optional latency, HTTP errors, timeouts and malformed payloads.
+
+Run standalone and point the integration's "API Base URL" option at it:
+
+    python -m tests.fake_api --port 8080 --latency 0.2 --error-rate 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from custom_components.solatsyncmy.zones import BUNDLED_ZONES
+from tests.synthetic import make_month
+
+# Seconds a "timeout" response stalls for; longer than API_TIMEOUT
+TIMEOUT_STALL = 60
+
+
+@dataclass
+class FakeApiConfig:
+    """Fault injection settings. Rates are probabilities per request."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+    malformed_rate: float = 0.0
+    recorded_dir: Optional[Path] = None
+    seed: Optional[int] = None
+    requests: Dict[str, int] = field(default_factory=dict)
+
+
+class FakeWaktuSolatApi:
+    """aiohttp application serving synthetic or recorded prayer times."""
+
+    def __init__(self, config: Optional[FakeApiConfig] = None) -> None:
+        """Initialize the fake API."""
+        self.config = config or FakeApiConfig()
+        self._random = random.Random(self.config.seed)
+        self.app = web.Application()
+        self.app.router.add_get("/v2/solat/{zone}", self._handle_solat)
+        self.app.router.add_get("/zones", self._handle_zones)
+
+    def _count(self, key: str) -> None:
+        """Count a request by route key."""
+        self.config.requests[key] = self.config.requests.get(key, 0) + 1
+
+    async def _inject_faults(self) -> Optional[web.Response]:
+        """Apply latency and return an error response if one is drawn."""
+        config = self.config
+        delay = config.latency + self._random.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._random.random() < config.timeout_rate:
+            await asyncio.sleep(TIMEOUT_STALL)
+        if self._random.random() < config.error_rate:
+            return web.Response(status=config.error_status, text="Injected error")
+        if self._random.random() < config.malformed_rate:
+            return web.Response(
+                text=self._random.choice(['{"prayers": ', '{"zone": "X"}', '{"prayers": []}', "[]"]),
+                content_type="application/json",
+            )
+        return None
+
+    def _load_month(self, zone: str, year: int, month: int) -> Dict[str, Any]:
+        """Return a recorded month if available, else a synthetic one."""
+        if self.config.recorded_dir is not None:
+            path = self.config.recorded_dir / f"{zone}-{year}-{month:02d}.json"
+            if path.exists():
+                return json.loads(path.read_text())
+        return make_month(zone, year, month)
+
+    async def _handle_solat(self, request: web.Request) -> web.Response:
+        """Serve one month of prayer times for a zone."""
+        zone = request.match_info["zone"].upper()
+        self._count(f"solat/{zone}")
+        try:
+            year = int(request.query["year"])
+            month = int(request.query["month"])
+        except (KeyError, ValueError):
+            return web.json_response({"message": "year and month are required"}, status=400)
+        if not 1 <= month <= 12:
+            return web.json_response({"message": "Invalid month"}, status=400)
+
+        if (fault := await self._inject_faults()) is not None:
+            return fault
+        return web.json_response(self._load_month(zone, year, month))
+
+    async def _handle_zones(self, request: web.Request) -> web.Response:
+        """Serve the zone list in the API format."""
+        self._count("zones")
+        if (fault := await self._inject_faults()) is not None:
+            return fault
+        zones = []
+        for code, label in BUNDLED_ZONES:
+            state, _, districts = label.partition(" - ")
+            zones.append({"jakimCode": code, "negeri": state, "daerah": districts})
+        return web.json_response(zones)
+
+
+def main() -> None:
+    """Run the fake API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds (0..jitter)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--recorded-dir", type=Path, help="directory of ZONE-YYYY-MM.json responses")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = FakeApiConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        timeout_rate=args.timeout_rate,
+        malformed_rate=args.malformed_rate,
+        recorded_dir=args.recorded_dir,
+        seed=args.seed,
+    )
+    web.run_app(FakeWaktuSolatApi(config).app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Deterministic synthetic waktusolat.app responses for tests and benchmarks."""
+import calendar
+import math
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from custom_components.solatsyncmy.hijri import gregorian_to_hijri
+
+MYT = timezone(timedelta(hours=8))
+
+# Minutes after local midnight for each prayer, before the seasonal swing
+BASE_MINUTES = {
+    "fajr": 5 * 60 + 50,
+    "syuruk": 7 * 60 + 5,
+    "dhuhr": 13 * 60 + 15,
+    "asr": 16 * 60 + 35,
+    "maghrib": 19 * 60 + 20,
+    "isha": 20 * 60 + 30,
+}
+
+
+def zone_offset_minutes(zone: str) -> int:
+    """Return a stable per-zone shift so zones differ like east/west Malaysia."""
+    return zlib.crc32(zone.encode()) % 40 - 20
+
+
+def make_day(zone: str, day: date) -> Dict[str, Any]:
+    """Build one day entry in the API format."""
+    midnight = datetime(day.year, day.month, day.day, tzinfo=MYT)
+    swing = round(8 * math.sin(2 * math.pi * day.timetuple().tm_yday / 365.25))
+    offset = zone_offset_minutes(zone)
+    hijri = gregorian_to_hijri(day)
+    entry = {"day": day.day, "hijri": f"{hijri.year:04d}-{hijri.month:02d}-{hijri.day:02d}"}
+    for prayer, minutes in BASE_MINUTES.items():
+        entry[prayer] = int((midnight + timedelta(minutes=minutes + swing + offset)).timestamp())
+    return entry
+
+
+def make_month(zone: str, year: int, month: int) -> Dict[str, Any]:
+    """Build a full monthly API response for a zone."""
+    days = calendar.monthrange(year, month)[1]
+    prayers: List[Dict[str, Any]] = [
+        make_day(zone, date(year, month, day)) for day in range(1, days + 1)
+    ]
+    return {
+        "zone": zone,
+        "year": year,
+        "month": calendar.month_abbr[month].upper(),
+        "month_number": month,
+        "last_updated": None,
+        "prayers": prayers,
+    }
+
+
+def make_zones(count: int) -> List[str]:
+    """Return `count` zone codes (real codes first, then synthetic ones)."""
+    from custom_components.solatsyncmy.zones import BUNDLED_ZONES
+
+    codes = [code for code, _ in BUNDLED_ZONES]
+    codes += [f"TST{index:02d}" for index in range(max(0, count - len(codes)))]
+    return codes[:count]
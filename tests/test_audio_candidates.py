@@ -0,0 +1,80 @@
+"""Tests for audio URL pre-validation, ranking and hedged playback."""
+from homeassistant.core import ServiceCall
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.audio_candidates import async_get_candidate_ranker
+from custom_components.solatsyncmy.audio_prep import PreparedAudio
+from custom_components.solatsyncmy.audio_variants import AudioVariantCache
+from custom_components.solatsyncmy.audio_view import audio_url
+from custom_components.solatsyncmy.const import DATA_AUDIO_VARIANTS, PLAYBACK_CONFIRM_TIMEOUT
+
+PLAYER = "media_player.kitchen"
+PREPARED = "/api/solatsyncmy/audio/user/azan.prepared.mp3"
+ORIGINAL = "/api/solatsyncmy/audio/user/azan.mp3"
+
+
+async def test_candidates_ranked_by_history(hass) -> None:
+    """Reliable, fast URLs go first and URLs that failed validation go last."""
+    ranker = await async_get_candidate_ranker(hass)
+    ranker.record("http://a/azan.mp3", False)
+    ranker.record("http://a/azan.mp3", False)
+    ranker.record("http://b/azan.mp3", True, 300)
+    ranker._entry("http://d/azan.mp3")["valid"] = False
+
+    ranked = ranker.rank(["http://d/azan.mp3", "http://a/azan.mp3", "http://c/azan.mp3", "http://b/azan.mp3"])
+
+    assert ranked == ["http://b/azan.mp3", "http://c/azan.mp3", "http://a/azan.mp3", "http://d/azan.mp3"]
+
+
+async def test_validation_checks_files_and_remote_urls(hass, tmp_path, aioclient_mock) -> None:
+    """Local URLs are checked on disk and remote URLs with HEAD."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan.mp3").write_bytes(b"\xff" * 4096)
+    aioclient_mock.request("head", "https://cdn.example/azan.mp3", status=200)
+    aioclient_mock.request("head", "https://gone.example/azan.mp3", status=404)
+    aioclient_mock.request("head", "https://nohead.example/azan.mp3", status=405)
+    ranker = await async_get_candidate_ranker(hass)
+
+    results = await ranker.async_validate([
+        ORIGINAL, PREPARED,
+        "https://cdn.example/azan.mp3", "https://gone.example/azan.mp3", "https://nohead.example/azan.mp3",
+    ])
+
+    assert results == {
+        ORIGINAL: True,
+        PREPARED: False,
+        "https://cdn.example/azan.mp3": True,
+        "https://gone.example/azan.mp3": False,
+        "https://nohead.example/azan.mp3": None,
+    }
+
+
+async def test_rejected_url_falls_back_without_waiting(hass, tmp_path) -> None:
+    """A player that drops from buffering to idle moves playback on immediately."""
+    hass.config.config_dir = str(tmp_path)
+    directory = tmp_path / "www" / "solatsyncmy"
+    directory.mkdir(parents=True)
+    (directory / "azan.mp3").write_bytes(b"\xff" * 4096)
+    (directory / "azan.prepared.mp3").write_bytes(b"\xff" * 4086)
+    cache = hass.data[DATA_AUDIO_VARIANTS] = AudioVariantCache(hass, None)
+    cache.prepared[str(directory / "azan.mp3")] = PreparedAudio(str(directory / "azan.prepared.mp3"), 0, 10)
+    prepared_url = audio_url(hass, str(directory / "azan.prepared.mp3"))
+    original_url = audio_url(hass, str(directory / "azan.mp3"))
+    hass.states.async_set(PLAYER, "idle")
+    hass.services.async_register("media_player", "volume_set", lambda call: None)
+
+    async def play_media(call: ServiceCall) -> None:
+        url = call.data["media_content_id"]
+        hass.states.async_set(PLAYER, "buffering", {"media_content_id": url})
+        hass.states.async_set(PLAYER, "idle" if url == prepared_url else "playing", {"media_content_id": url})
+
+    hass.services.async_register("media_player", "play_media", play_media)
+
+    trace = await _play_azan_file(hass, "asr", PLAYER, 0.5)
+
+    assert trace.result == "playing"
+    assert trace.url == original_url
+    assert trace.stages["playing"] - trace.stages["volume_set"] < PLAYBACK_CONFIRM_TIMEOUT * 1000 / 2
+    ranker = await async_get_candidate_ranker(hass)
+    assert ranker.rank([prepared_url, original_url]) == [original_url, prepared_url]
@@ -0,0 +1,134 @@
+"""Tests for audio preparation and the normalized variant cache."""
+import math
+import os
+import shutil
+import struct
+import wave
+
+import pytest
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.solatsyncmy import _get_audio_urls
+from custom_components.solatsyncmy.audio_prep import prepared_path
+from custom_components.solatsyncmy.audio_variants import (
+    AudioVariantCache,
+    async_get_variant_cache,
+    select_variant,
+)
+from custom_components.solatsyncmy.audio_view import audio_url
+from custom_components.solatsyncmy.const import AUDIO_SOURCE_BUNDLED, DATA_AUDIO_VARIANTS
+
+
+def _write_tone(path: str, seconds: float = 1.0, rate: int = 22050, silence: float = 0.0) -> None:
+    """Write a mono 16-bit sine tone, optionally preceded by silence."""
+    with wave.open(path, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(b"\0\0" * int(silence * rate) + b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * index / rate)))
+            for index in range(int(seconds * rate))
+        ))
+
+
+@pytest.fixture
+def audio_dir(hass, tmp_path):
+    """Point the config directory at a temporary folder with www/solatsyncmy/."""
+    hass.config.config_dir = str(tmp_path)
+    directory = tmp_path / "www" / "solatsyncmy"
+    directory.mkdir(parents=True)
+    return directory
+
+
+async def test_select_variant_by_player_integration(hass) -> None:
+    """Slow-buffering renderers get the compact variant, others the standard one."""
+    registry = er.async_get(hass)
+    registry.async_get_or_create("media_player", "dlna_dmr", "renderer", suggested_object_id="renderer")
+    registry.async_get_or_create("media_player", "cast", "nest", suggested_object_id="nest")
+
+    assert select_variant(hass, "media_player.renderer") == "compact"
+    assert select_variant(hass, "media_player.nest") == "standard"
+    assert select_variant(hass, "media_player.unknown") == "standard"
+
+
+async def test_cached_variant_is_reused_by_content_hash(hass, audio_dir) -> None:
+    """An existing variant for the file's content is used without ffmpeg."""
+    source = str(audio_dir / "azan.mp3")
+    _write_tone(source)
+    cache = hass.data[DATA_AUDIO_VARIANTS] = AudioVariantCache(hass, None)
+
+    assert await cache.async_ensure(source, "standard") is None
+
+    digest = await cache._async_digest(source)
+    os.makedirs(cache.directory)
+    with open(cache.target_path(digest, "standard"), "wb") as handle:
+        handle.write(b"variant")
+    assert await cache.async_ensure(source, "standard") == cache.target_path(digest, "standard")
+
+    urls = await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED, None, "media_player.nest")
+    assert urls == [audio_url(hass, cache.target_path(digest, "standard")), audio_url(hass, source)]
+    assert urls[0].startswith(f"/api/solatsyncmy/audio/cache/{digest}-standard.mp3?v=")
+
+    # Editing the file changes its hash, so the old variant no longer matches
+    _write_tone(source, seconds=2.0)
+    assert await cache.async_ensure(source, "standard") is None
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+async def test_transcode_variants_with_ffmpeg(hass, audio_dir) -> None:
+    """ffmpeg produces each variant once; later runs hit the cache."""
+    source = str(audio_dir / "azan.mp3")
+    _write_tone(source)
+    cache = await async_get_variant_cache(hass)
+
+    await cache.async_prepare([source])
+    assert cache.stats["transcoded"] == 2
+    assert os.path.getsize(cache.variant_path(source, "compact")) > 0
+
+    await cache.async_prepare([source])
+    assert cache.stats["cached"] == 2
+
+
+async def test_prepare_trims_leading_silence(hass, audio_dir) -> None:
+    """Leading silence is cut into a prepared copy that playback prefers."""
+    source = str(audio_dir / "azan.mp3")
+    _write_tone(source, silence=1.5)
+    cache = hass.data[DATA_AUDIO_VARIANTS] = AudioVariantCache(hass, None)
+
+    prepared = await cache.async_prepare_source(source)
+
+    digest = await cache._async_digest(source)
+    assert prepared.path == prepared_path(cache.directory, digest, source)
+    assert prepared.path == os.path.join(cache.directory, f"{digest}.prepared.mp3")
+    assert 1400 <= prepared.silence_ms <= 1500
+    with wave.open(prepared.path) as handle:
+        assert abs(handle.getnframes() / handle.getframerate() - 1.05) < 0.01
+    urls = await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED, None, "media_player.nest")
+    assert urls == [audio_url(hass, prepared.path), audio_url(hass, source)]
+    assert urls[0].startswith(f"/api/solatsyncmy/audio/cache/{digest}.prepared.mp3?v=")
+    assert cache.as_dict()["preparation"]["azan.mp3"]["saved_ms"] == prepared.silence_ms
+
+    # Unchanged files are not prepared again
+    assert await cache.async_prepare_source(source) == prepared
+
+
+async def test_prepare_strips_id3_header(hass, audio_dir) -> None:
+    """An MP3 ID3v2 tag (e.g. cover art) is dropped so audio starts at the first byte."""
+    source = audio_dir / "azanfajr.mp3"
+    art = b"\xaa" * 5000
+    # Syncsafe tag size: 7 bits per byte
+    size = bytes([(len(art) >> shift) & 0x7F for shift in (21, 14, 7, 0)])
+    frames = b"\xff\xfb\x90\x00" + b"\x00" * 2000
+    source.write_bytes(b"ID3\x03\x00\x00" + size + art + frames)
+    cache = AudioVariantCache(hass, None)
+
+    prepared = await cache.async_prepare_source(str(source))
+    assert prepared is not None
+
+    assert prepared.header_bytes == 10 + len(art)
+    with open(prepared.path, "rb") as handle:
+        assert handle.read() == frames
+    # Nothing is written next to the original, and no temporary file is left behind
+    assert sorted(os.listdir(audio_dir)) == ["azanfajr.mp3", "variants"]
+    assert os.listdir(cache.directory) == [os.path.basename(prepared.path)]
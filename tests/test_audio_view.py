@@ -0,0 +1,94 @@
+"""Tests for the azan audio HTTP view."""
+from http import HTTPStatus
+from unittest.mock import patch
+
+from aiohttp import web
+import pytest
+
+from custom_components.solatsyncmy import _get_audio_urls, _setup_audio_files_sync
+from custom_components.solatsyncmy.audio_view import AzanAudioView, audio_path, audio_url
+from custom_components.solatsyncmy.const import AUDIO_SOURCE_BUNDLED
+
+AUDIO = bytes(range(256)) * 16
+
+
+@pytest.fixture
+async def client(hass, tmp_path, aiohttp_client, socket_enabled):
+    """Serve a user azan file from a temporary config directory.
+
+    The view runs on a bare aiohttp app, without Home Assistant's HTTP middlewares.
+    """
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan.mp3").write_bytes(AUDIO)
+    view = AzanAudioView()
+    app = web.Application()
+    app["hass"] = hass
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        return await view.get(request, **request.match_info)
+
+    app.router.add_route("GET", view.url, handler)
+    return await aiohttp_client(app)
+
+
+async def test_versioned_url_is_cached_long_term(hass, tmp_path, client) -> None:
+    """A URL carrying the file's version is immutable; a bare one revalidates by ETag."""
+    url = audio_url(hass, str(tmp_path / "www" / "solatsyncmy" / "azan.mp3"))
+    assert audio_path(hass, url) == str(tmp_path / "www" / "solatsyncmy" / "azan.mp3")
+
+    response = await client.get(url)
+    assert response.status == HTTPStatus.OK
+    assert await response.read() == AUDIO
+    assert "immutable" in response.headers["Cache-Control"]
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    response = await client.get(url.split("?")[0], headers={"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+
+async def test_vanished_file_is_not_offered(hass, client) -> None:
+    """A file removed between the existence check and its stat yields no URL instead of None."""
+    assert len(await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED)) == 1
+
+    with patch("custom_components.solatsyncmy.audio_view.file_version", side_effect=FileNotFoundError):
+        assert await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED) == []
+
+
+async def test_range_requests(client) -> None:
+    """Players can fetch part of a file."""
+    response = await client.get("/api/solatsyncmy/audio/user/azan.mp3", headers={"Range": "bytes=100-199"})
+
+    assert response.status == HTTPStatus.PARTIAL_CONTENT
+    assert await response.read() == AUDIO[100:200]
+    assert response.headers["Content-Range"] == f"bytes 100-199/{len(AUDIO)}"
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/solatsyncmy/audio/user/missing.mp3",
+        "/api/solatsyncmy/audio/user/..%2Fsecrets.yaml",
+        "/api/solatsyncmy/audio/user/.hidden.mp3",
+        "/api/solatsyncmy/audio/other/azan.mp3",
+    ],
+)
+async def test_only_audio_files_are_served(client, path) -> None:
+    """Unknown kinds, non-audio names and path tricks are refused."""
+    response = await client.get(path)
+
+    assert response.status == HTTPStatus.NOT_FOUND
+
+
+async def test_old_copies_removed_from_www(hass, tmp_path) -> None:
+    """Placeholders written by earlier versions are cleaned up instead of served."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    placeholder = tmp_path / "www" / "solatsyncmy" / "azanfajr.mp3"
+    placeholder.write_text("# Placeholder - Replace with your azan file\n")
+
+    await hass.async_add_executor_job(_setup_audio_files_sync, hass, AUDIO_SOURCE_BUNDLED)
+
+    assert not placeholder.exists()
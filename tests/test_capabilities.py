@@ -0,0 +1,63 @@
+"""Tests for the media player capability cache."""
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.core import ServiceCall
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.capabilities import async_get_capabilities
+
+PLAY_ONLY = MediaPlayerEntityFeature.PLAY_MEDIA
+
+
+async def test_capabilities_cached_until_registry_changes(hass) -> None:
+    """A player is probed once; a registry update or new features probe it again."""
+    registry = er.async_get(hass)
+    registry.async_get_or_create("media_player", "dlna_dmr", "renderer", suggested_object_id="renderer")
+    hass.states.async_set("media_player.renderer", "idle", {"supported_features": PLAY_ONLY})
+    cache = async_get_capabilities(hass)
+
+    capabilities = cache.get("media_player.renderer")
+    assert cache.get("media_player.renderer") is capabilities
+    assert capabilities.platform == "dlna_dmr"
+    assert not capabilities.can_set_volume
+    assert capabilities.accepts("/api/solatsyncmy/audio/user/azan.mp3?v=1")
+    assert not capabilities.accepts("/api/solatsyncmy/audio/user/azan.m4a?v=1")
+    assert capabilities.content_type("/api/solatsyncmy/audio/user/azan.mp3?v=1") == "audio/mpeg"
+
+    registry.async_update_entity("media_player.renderer", name="Renderer")
+    await hass.async_block_till_done()
+    assert cache.get("media_player.renderer") is not capabilities
+    assert cache.stats["invalidations"] == 1
+
+    hass.states.async_set(
+        "media_player.renderer", "idle", {"supported_features": PLAY_ONLY | MediaPlayerEntityFeature.VOLUME_SET}
+    )
+    assert cache.get("media_player.renderer").can_set_volume
+    assert cache.stats == {"hits": 1, "probes": 3, "invalidations": 1}
+
+
+async def test_playback_skips_unsupported_steps(hass, tmp_path) -> None:
+    """A player without power or volume control gets only play_media, in a format it plays."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan.mp3").write_bytes(b"\xff" * 4096)
+    hass.states.async_set("media_player.speaker", "off", {"supported_features": PLAY_ONLY})
+    calls = []
+
+    async def handle(call: ServiceCall) -> None:
+        calls.append((call.service, dict(call.data)))
+        if call.service == "play_media":
+            hass.states.async_set(
+                "media_player.speaker", "playing",
+                {"supported_features": PLAY_ONLY, "media_content_id": call.data["media_content_id"]},
+            )
+
+    for service in ("turn_on", "volume_set", "play_media"):
+        hass.services.async_register("media_player", service, handle)
+
+    trace = await _play_azan_file(hass, "asr", "media_player.speaker", 0.5)
+
+    assert trace.result == "playing"
+    assert [service for service, _ in calls] == ["play_media"]
+    assert calls[0][1]["media_content_type"] == "music"
+    assert "volume_set" not in trace.stages
@@ -0,0 +1,132 @@
+"""Tests for the coordinator against the fake API."""
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from custom_components.solatsyncmy.const import (
+    CONF_API_BASE_URL,
+    CONF_ZONE,
+    CONF_ZONES,
+    DOMAIN,
+    EVENT_TIMETABLE_CHANGED,
+)
+from custom_components.solatsyncmy.coordinator import WaktuSolatCoordinator
+from tests.synthetic import make_month
+
+
+def _coordinator(hass, fake_api, zones=("SGR01",)) -> WaktuSolatCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ZONE: zones[0], CONF_ZONES: list(zones[1:])},
+        options={CONF_API_BASE_URL: fake_api.base_url},
+    )
+    entry.add_to_hass(hass)
+    return WaktuSolatCoordinator(hass, entry)
+
+
+async def test_update_uses_base_url_override(hass, fake_api) -> None:
+    """Prayer times are fetched from the configured API base URL."""
+    coordinator = _coordinator(hass, fake_api, ("SGR01", "WLY01"))
+
+    data = await coordinator._async_update_data()
+
+    assert data["zone"] == "SGR01"
+    assert set(data["prayer_times"]) >= {"fajr", "dhuhr", "asr", "maghrib", "isha"}
+    assert set(data["zones"]) == {"SGR01", "WLY01"}
+    assert fake_api.config.requests["solat/SGR01"] >= 1
+    assert fake_api.config.requests["solat/WLY01"] >= 1
+
+
+async def test_update_uses_month_cache(hass, fake_api) -> None:
+    """A second update is served from the month index."""
+    coordinator = _coordinator(hass, fake_api)
+    await coordinator._async_update_data()
+    requests = dict(fake_api.config.requests)
+
+    await coordinator._async_update_data()
+
+    assert fake_api.config.requests == requests
+
+
+@pytest.mark.parametrize("fault", ["error_rate", "malformed_rate"])
+async def test_update_fails_on_bad_response(hass, fake_api, fault) -> None:
+    """HTTP errors and malformed payloads surface as UpdateFailed."""
+    setattr(fake_api.config, fault, 1.0)
+    coordinator = _coordinator(hass, fake_api)
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+async def test_range_index_fetches_each_month_once(hass, fake_api) -> None:
+    """Concurrent requests for the same months share one fetch per month."""
+    fake_api.config.latency = 0.05
+    coordinator = _coordinator(hass, fake_api)
+    start = dt_util.now().date().replace(day=1)
+    end = date(start.year + 1, start.month, 1) - timedelta(days=1)
+
+    first, second = await asyncio.gather(
+        coordinator.async_get_range_index(start, end, "SGR01"),
+        coordinator.async_get_range_index(start, end, "SGR01"),
+    )
+
+    assert len(first) == len(second) == 12
+    assert fake_api.config.requests["solat/SGR01"] == 12
+
+
+async def test_refetch_propagates_only_changed_cells(hass, setup_entry, fake_api, tmp_path) -> None:
+    """A corrected month fires one event with the changed cells and skips a full refresh."""
+    coordinator = hass.data[DOMAIN][setup_entry.entry_id]
+    cached = {(month["year"], month["month"]) for month in coordinator.cache_summary()}
+    for year, month in cached:
+        corrected = make_month("SGR01", year, month)
+        for day in corrected["prayers"]:
+            day["asr"] += 180
+        (tmp_path / f"SGR01-{year}-{month:02d}.json").write_text(json.dumps(corrected))
+    fake_api.config.recorded_dir = tmp_path
+
+    events = async_capture_events(hass, EVENT_TIMETABLE_CHANGED)
+    refreshes = []
+    setup_entry.async_on_unload(coordinator.async_add_listener(lambda: refreshes.append(1)))
+    asar_before = hass.states.get("sensor.waktu_solat_asar").state
+    zohor_before = hass.states.get("sensor.waktu_solat_zohor").last_updated
+    old_asr = {item.when for item in coordinator.scheduler.upcoming if item.name == "asr"}
+
+    for year, month in sorted(cached):
+        await coordinator._fetch_monthly_prayer_times(year, month, "SGR01")
+    await hass.async_block_till_done()
+
+    assert len(events) == len(cached)
+    assert {change["name"] for event in events for change in event.data["changes"]} == {"asr"}
+    assert not refreshes
+    assert hass.states.get("sensor.waktu_solat_asar").state != asar_before
+    assert hass.states.get("sensor.waktu_solat_zohor").last_updated == zohor_before
+    new_asr = {item.when for item in coordinator.scheduler.upcoming if item.name == "asr"}
+    assert new_asr == {when + timedelta(seconds=180) for when in old_asr}
+
+
+async def test_next_month_relinks_the_last_night(hass, fake_api) -> None:
+    """Indexing a month replaces the previous month's approximate last-night times."""
+    coordinator = _coordinator(hass, fake_api)
+    january = make_month("SGR01", 2026, 1)
+    january["prayers"][0]["fajr"] += 120
+    december = make_month("SGR01", 2025, 12)
+    last = december["prayers"][-1]
+    midnight = last["maghrib"] + (january["prayers"][0]["fajr"] - last["maghrib"]) // 2
+
+    coordinator._index_month("SGR01", 2025, 12, december)
+    assert coordinator.get_derived_index(2025, 12)[31]["midnight"] != midnight
+    coordinator._index_month("SGR01", 2026, 1, january)
+    assert coordinator.get_derived_index(2025, 12)[31]["midnight"] == midnight
+
+    # In the other order the month is indexed with the exact time straight away
+    coordinator = _coordinator(hass, fake_api)
+    coordinator._index_month("SGR01", 2026, 1, january)
+    coordinator._index_month("SGR01", 2025, 12, december)
+    assert coordinator.get_derived_index(2025, 12)[31]["midnight"] == midnight
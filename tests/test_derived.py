@@ -0,0 +1,60 @@
+"""Tests for derived times."""
+from custom_components.solatsyncmy.const import DHUHA_OFFSET_MINUTES, IMSAK_OFFSET_MINUTES
+from custom_components.solatsyncmy.derived import SECONDS_PER_DAY, compute_derived_times
+
+HOUR = 3600
+
+
+def _day(fajr: int, syuruk: int, maghrib: int) -> dict:
+    """Return a day entry with the times derived times depend on."""
+    return {"fajr": fajr, "syuruk": syuruk, "maghrib": maghrib}
+
+
+def test_derived_times_use_the_next_subuh() -> None:
+    """The night runs from Maghrib to the next day's Subuh."""
+    day_index = {
+        1: _day(6 * HOUR, 7 * HOUR, 19 * HOUR),
+        # Subuh a minute later the next day
+        2: _day(SECONDS_PER_DAY + 6 * HOUR + 60, SECONDS_PER_DAY + 7 * HOUR, SECONDS_PER_DAY + 19 * HOUR),
+    }
+
+    derived = compute_derived_times(day_index)
+
+    assert derived[1]["imsak"] == 6 * HOUR - IMSAK_OFFSET_MINUTES * 60
+    assert derived[1]["dhuha"] == 7 * HOUR + DHUHA_OFFSET_MINUTES * 60
+    night = 11 * HOUR + 60
+    assert derived[1]["midnight"] == 19 * HOUR + night // 2
+    assert derived[1]["last_third"] == 19 * HOUR + night * 2 // 3
+
+
+def test_missing_tomorrow_is_approximated() -> None:
+    """Without the next day, its Subuh is taken as 24 hours after today's."""
+    day_index = {
+        1: _day(6 * HOUR, 7 * HOUR, 19 * HOUR),
+        # Day 2 is missing, so day 1 must not use day 3's Subuh
+        3: _day(2 * SECONDS_PER_DAY + 6 * HOUR, 2 * SECONDS_PER_DAY + 7 * HOUR, 2 * SECONDS_PER_DAY + 19 * HOUR),
+    }
+
+    derived = compute_derived_times(day_index)
+
+    # 19:00 to 06:00 is 11 hours: midnight at 00:30, last third from 02:20
+    assert derived[1]["midnight"] == SECONDS_PER_DAY + HOUR // 2
+    assert derived[1]["last_third"] == SECONDS_PER_DAY + 2 * HOUR + 20 * 60
+    assert derived[3]["midnight"] == 3 * SECONDS_PER_DAY + HOUR // 2
+
+
+def test_following_subuh_replaces_the_approximation() -> None:
+    """A Subuh known from outside the index (the next month's first) ends the last night."""
+    day_index = {30: _day(6 * HOUR, 7 * HOUR, 19 * HOUR)}
+
+    derived = compute_derived_times(day_index, {30: SECONDS_PER_DAY + 6 * HOUR + 120})
+
+    assert derived[30]["midnight"] == 19 * HOUR + (11 * HOUR + 120) // 2
+
+
+def test_missing_prayers_leave_times_out() -> None:
+    """A derived time is only computed when the times it needs exist."""
+    derived = compute_derived_times({1: {"fajr": 6 * HOUR}, 2: {"syuruk": SECONDS_PER_DAY + 7 * HOUR}})
+
+    assert set(derived[1]) == {"imsak"}
+    assert set(derived[2]) == {"dhuha"}
@@ -0,0 +1,82 @@
+"""Tests for Solat Sync MY diagnostics."""
+from homeassistant.components.diagnostics import REDACTED
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.const import (
+    AUDIO_SOURCE_REMOTE,
+    AUDIO_URL_PATH,
+    CONF_AUDIO_SOURCE,
+    CONF_REMOTE_AZAN_URL,
+    CONF_REMOTE_FAJR_URL,
+    CONF_ROUTING_RULES,
+)
+from custom_components.solatsyncmy.diagnostics import async_get_config_entry_diagnostics
+from custom_components.solatsyncmy.telemetry import PlaybackTrace, async_get_playback_traces
+
+
+async def test_diagnostics(hass, setup_entry) -> None:
+    """Diagnostics cover the cache, fetch statistics, schedule and audio table."""
+    diagnostics = await async_get_config_entry_diagnostics(hass, setup_entry)
+
+    coordinator = diagnostics["coordinator"]
+    assert coordinator["zones"] == ["SGR01"]
+    assert coordinator["cache"][0]["zone"] == "SGR01"
+    assert coordinator["cache"][0]["days"] >= 28
+    assert coordinator["fetch_stats"]["requests"] >= 1
+    assert coordinator["fetch_stats"]["errors"] == 0
+    assert sum(coordinator["fetch_stats"]["latency_histogram"].values()) == coordinator["fetch_stats"]["requests"]
+    assert coordinator["fetch_stats"]["cache_misses"] >= 1
+    assert diagnostics["schedule"]
+    assert set(diagnostics["audio"]["resolution"]) == {"fajr", "dhuhr", "asr", "maghrib", "isha"}
+
+
+async def test_diagnostics_playback_trace(hass, setup_entry) -> None:
+    """Playback traces record their stages and hide remote URLs."""
+    hass.config_entries.async_update_entry(
+        setup_entry,
+        options={
+            **setup_entry.options,
+            CONF_AUDIO_SOURCE: AUDIO_SOURCE_REMOTE,
+            CONF_REMOTE_AZAN_URL: "https://example.com/azan.mp3?token=secret",
+            CONF_REMOTE_FAJR_URL: "https://example.com/fajr.mp3?token=secret",
+        },
+    )
+    await _play_azan_file(hass, "dhuhr", "media_player.missing", 0.5, setup_entry)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, setup_entry)
+
+    assert diagnostics["entry"]["options"][CONF_REMOTE_AZAN_URL] == REDACTED
+    assert diagnostics["audio"]["resolution"]["dhuhr"] == [REDACTED]
+    trace = diagnostics["playback_traces"][-1]
+    assert trace["prayer"] == "dhuhr"
+    assert trace["result"] == "media_player_not_found"
+    assert "finished" in trace["stages_ms"]
+
+
+async def test_diagnostics_hide_routed_remote_files(hass, setup_entry) -> None:
+    """Remote files of routing rules are hidden even when the entry plays bundled audio."""
+    remote = "https://example.com/jumaat.mp3?token=secret"
+    hass.config_entries.async_update_entry(
+        setup_entry,
+        options={
+            **setup_entry.options,
+            CONF_ROUTING_RULES: [
+                {"prayers": ["dhuhr"], "weekdays": ["fri"], "audio_file": remote},
+                {"prayers": ["isha"], "audio_file": "azan_isha.mp3"},
+            ],
+        },
+    )
+    for url in (remote, f"{AUDIO_URL_PATH}/bundled/azan.mp3"):
+        trace = PlaybackTrace("dhuhr", "media_player.kitchen", setup_entry.entry_id)
+        trace.url = url
+        trace.finish("played")
+        async_get_playback_traces(hass).append(trace)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, setup_entry)
+
+    rules = diagnostics["entry"]["options"][CONF_ROUTING_RULES]
+    assert [rule["audio_file"] for rule in rules] == [REDACTED, "azan_isha.mp3"]
+    assert [trace["url"] for trace in diagnostics["playback_traces"][-2:]] == [
+        REDACTED, f"{AUDIO_URL_PATH}/bundled/azan.mp3"
+    ]
+    assert remote not in str(diagnostics)
@@ -0,0 +1,65 @@
+"""Tests for the timetable export."""
+import csv
+import os
+from datetime import date
+
+from custom_components.solatsyncmy.const import DOMAIN, SERVICE_EXPORT_TIMETABLE
+from custom_components.solatsyncmy.derived import compute_derived_times
+from custom_components.solatsyncmy.export import CSV_HEADER, write_timetable
+from tests.synthetic import make_month
+
+
+def _months(zone: str, year: int, month: int):
+    """Return one synthetic month in the export's month index format."""
+    day_index = {entry["day"]: entry for entry in make_month(zone, year, month)["prayers"]}
+    return [((year, month), day_index, compute_derived_times(day_index))]
+
+
+async def test_csv_covers_only_the_requested_days(hass, tmp_path) -> None:
+    """One row per day in range, with local HH:MM times and the Hijri date."""
+    hass.config.set_time_zone("Asia/Kuala_Lumpur")
+    path = str(tmp_path / "export" / "SGR01.csv")
+    months = _months("SGR01", 2026, 2)
+
+    count = write_timetable(path, "csv", "SGR01", months, date(2026, 2, 17), date(2026, 2, 19))
+
+    with open(path, encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert count == 3
+    assert rows[0] == CSV_HEADER
+    assert [row[0] for row in rows[1:]] == ["2026-02-17", "2026-02-18", "2026-02-19"]
+    day = dict(zip(CSV_HEADER, rows[2]))
+    assert day["hijri"] == "1447-09-01"
+    assert len(day["fajr"]) == 5 and day["fajr"] < day["dhuhr"] < day["isha"]
+    assert day["imsak"] < day["fajr"]
+    assert not (tmp_path / "export" / "SGR01.csv.tmp").exists()
+
+
+async def test_ics_has_an_event_per_time(hass, tmp_path) -> None:
+    """Each prayer and derived time of each day becomes one VEVENT."""
+    path = str(tmp_path / "SGR01.ics")
+    months = _months("SGR01", 2026, 2)
+
+    write_timetable(path, "ics", "SGR01", months, date(2026, 2, 18), date(2026, 2, 18))
+
+    content = open(path, encoding="utf-8", newline="").read()
+    assert content.startswith("BEGIN:VCALENDAR\r\n")
+    assert content.endswith("END:VCALENDAR\r\n")
+    assert content.count("BEGIN:VEVENT") == 10  # Six prayer times and four derived times
+    assert "UID:SGR01-20260218-fajr@solatsyncmy" in content
+    assert "SUMMARY:Subuh\r\nDESCRIPTION:SGR01 1447-09-01\r\nCATEGORIES:Azan" in content
+
+
+async def test_export_rejects_long_ranges(hass, setup_entry, fake_api) -> None:
+    """A range beyond the limit fetches nothing and writes nothing."""
+    requests = dict(fake_api.config.requests)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_TIMETABLE,
+        {"period": "range", "start_date": "2020-01-01", "end_date": "2029-12-31"},
+        blocking=True,
+    )
+
+    assert fake_api.config.requests == requests
+    assert not os.path.exists(hass.config.path("www", "solatsyncmy", "export", "SGR01_20200101_20291231.csv"))
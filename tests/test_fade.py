@@ -0,0 +1,52 @@
+"""Tests for the azan volume fade-in."""
+import asyncio
+
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.core import ServiceCall
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.const import AZAN_FADE_MAX_STEPS, AZAN_FADE_START_VOLUME
+from custom_components.solatsyncmy.fade import async_get_fader, ramp_levels
+
+FEATURES = MediaPlayerEntityFeature.PLAY_MEDIA | MediaPlayerEntityFeature.VOLUME_SET
+
+
+def test_ramp_is_bounded_and_ends_at_target() -> None:
+    """Long ramps are capped in steps; short ones still reach the target."""
+    levels = ramp_levels(0.1, 0.8, 60)
+    assert len(levels) == AZAN_FADE_MAX_STEPS
+    assert levels == sorted(levels)
+    assert levels[-1] == 0.8
+    assert ramp_levels(0.1, 0.5, 0.2) == [0.5]
+
+
+async def test_fade_starts_after_playback_and_is_cancellable(hass, tmp_path) -> None:
+    """The azan starts quietly, the ramp follows play_media, and cancelling stops it."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan.mp3").write_bytes(b"\xff" * 4096)
+    hass.states.async_set("media_player.hall", "idle", {"supported_features": FEATURES})
+    calls = []
+
+    async def handle(call: ServiceCall) -> None:
+        calls.append((call.service, call.data.get("volume_level")))
+        if call.service == "play_media":
+            hass.states.async_set(
+                "media_player.hall", "playing",
+                {"supported_features": FEATURES, "media_content_id": call.data["media_content_id"]},
+            )
+
+    for service in ("volume_set", "play_media"):
+        hass.services.async_register("media_player", service, handle)
+
+    trace = await _play_azan_file(hass, "asr", "media_player.hall", 0.8, fade_in=60)
+
+    assert trace.result == "playing"
+    assert calls == [("volume_set", AZAN_FADE_START_VOLUME), ("play_media", None)]
+    fader = async_get_fader(hass)
+    assert fader.as_dict()["fading"] == ["media_player.hall"]
+
+    assert fader.cancel("media_player.hall")
+    await asyncio.sleep(0)
+    assert fader.as_dict()["fading"] == []
+    assert fader.stats["started"] == fader.stats["cancelled"] == 1
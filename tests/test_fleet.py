@@ -0,0 +1,99 @@
+"""Tests for fleet mode: several zones in one entry."""
+import json
+
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.solatsyncmy.const import (
+    CONF_API_BASE_URL,
+    CONF_ZONE,
+    CONF_ZONES,
+    DOMAIN,
+    EVENT_PRAYER_TIME,
+    EVENT_TIMETABLE_CHANGED,
+    SCHEDULE_KIND_PRAYER,
+)
+from tests.synthetic import make_month
+
+
+async def _setup_fleet(hass, fake_api) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Waktu Solat SGR01",
+        data={CONF_ZONE: "SGR01", CONF_ZONES: ["WLY01", "JHR01"]},
+        options={CONF_API_BASE_URL: fake_api.base_url},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_each_zone_gets_distinct_entities(hass, fake_api) -> None:
+    """Additional zones get their own device and zone-coded entity IDs."""
+    entry = await _setup_fleet(hass, fake_api)
+    registry = er.async_get(hass)
+
+    primary = registry.async_get("sensor.waktu_solat_subuh")
+    wly01 = registry.async_get("sensor.waktu_solat_wly01_subuh")
+    assert primary is not None and wly01 is not None
+    assert registry.async_get("sensor.waktu_solat_jhr01_next_prayer") is not None
+    assert registry.async_get("sensor.waktu_solat_subuh_2") is None
+    assert hass.states.get("sensor.waktu_solat_wly01_subuh").name == "Waktu Solat WLY01 Subuh"
+
+    devices = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+    assert len(devices) == 3
+    assert primary.device_id != wly01.device_id
+
+
+async def test_one_scheduler_drives_every_zone(hass, fake_api, freezer) -> None:
+    """A single timeline holds every zone's prayers and fires them with their zone."""
+    entry = await _setup_fleet(hass, fake_api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    upcoming = [item for item in coordinator.scheduler.upcoming if item.kind == SCHEDULE_KIND_PRAYER]
+    assert {item.zone for item in upcoming} == {"SGR01", "WLY01", "JHR01"}
+    assert upcoming == sorted(upcoming)
+
+    events = async_capture_events(hass, EVENT_PRAYER_TIME)
+    target = next(item for item in upcoming if item.zone == "WLY01")
+    # Only the head of the timeline is armed; step through each entry up to the target
+    for item in upcoming[: upcoming.index(target) + 1]:
+        freezer.move_to(item.when)
+        async_fire_time_changed(hass, item.when)
+        await hass.async_block_till_done()
+
+    fired = [(event.data["zone"], event.data["prayer"]) for event in events]
+    assert ("WLY01", target.name) in fired
+    assert coordinator.scheduler.upcoming[0].timestamp > target.timestamp
+
+
+async def test_timetable_changes_reach_only_their_zone(hass, fake_api, tmp_path) -> None:
+    """A corrected month updates the entities of its own zone and cells, not the whole fleet."""
+    entry = await _setup_fleet(hass, fake_api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert hass.bus.async_listeners().get(EVENT_TIMETABLE_CHANGED, 0) == 0
+
+    cached = {(month["year"], month["month"]) for month in coordinator.cache_summary() if month["zone"] == "WLY01"}
+    for year, month in cached:
+        corrected = make_month("WLY01", year, month)
+        for day in corrected["prayers"]:
+            day["asr"] += 180
+        (tmp_path / f"WLY01-{year}-{month:02d}.json").write_text(json.dumps(corrected))
+    fake_api.config.recorded_dir = tmp_path
+    before = {
+        entity_id: hass.states.get(entity_id).last_updated
+        for entity_id in ("sensor.waktu_solat_asar", "sensor.waktu_solat_wly01_zohor")
+    }
+    asar_before = hass.states.get("sensor.waktu_solat_wly01_asar").state
+
+    for year, month in sorted(cached):
+        await coordinator._fetch_monthly_prayer_times(year, month, "WLY01")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.waktu_solat_wly01_asar").state != asar_before
+    for entity_id, last_updated in before.items():
+        assert hass.states.get(entity_id).last_updated == last_updated
@@ -0,0 +1,78 @@
+"""Tests for GPS to zone resolution."""
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solatsyncmy.const import (
+    CONF_ZONE,
+    CONF_ZONE_TRACKER,
+    DOMAIN,
+    GEO_ZONE_CONFIRMATIONS,
+)
+from custom_components.solatsyncmy.geo import ZoneLocator, ZoneTracker, load_zone_locator
+
+KUALA_LUMPUR = (3.14, 101.69)
+GOMBAK = (3.26, 101.66)
+
+
+def test_locator_resolves_nearest_zone() -> None:
+    """Points resolve to the zone of the nearest district; far-away points to None."""
+    locator = load_zone_locator()
+
+    assert locator.resolve(*KUALA_LUMPUR) == "WLY01"
+    assert locator.resolve(*GOMBAK) == "SGR01"
+    assert locator.resolve(4.6, 101.09) == "PRK02"  # Ipoh
+    assert locator.resolve(1.55, 110.35) == "SWK08"  # Kuching
+    assert locator.resolve(6.0, 119.9) is None  # Sulu Sea, inside the grid but far from any zone
+    assert locator.resolve(51.5, -0.12) is None  # Outside the grid
+
+
+def test_polygons_take_precedence() -> None:
+    """A point inside a zone polygon resolves to it even when another zone's point is nearer."""
+    locator = ZoneLocator({
+        "AAA01": {"points": [[3.0, 101.0]]},
+        "BBB01": {
+            "polygons": [[[2.9, 100.9], [2.9, 101.1], [3.1, 101.1], [3.1, 100.9]]],
+            "points": [[4.0, 102.0]],
+        },
+    })
+
+    assert locator.resolve(3.0, 101.0) == "BBB01"
+    assert locator.resolve(3.3, 101.0) == "AAA01"
+
+
+async def test_tracker_switches_after_consecutive_fixes(hass) -> None:
+    """Boundary jitter never reloads the entry; a confirmed move reloads it once."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Solat Sync MY (SGR01)",
+        data={CONF_ZONE: "SGR01"},
+        options={CONF_ZONE_TRACKER: "device_tracker.boat"},
+    )
+    entry.add_to_hass(hass)
+    hass.states.async_set("device_tracker.boat", "home", {"latitude": GOMBAK[0], "longitude": GOMBAK[1]})
+    tracker = ZoneTracker(hass, entry, load_zone_locator())
+
+    def move(latitude: float, longitude: float) -> None:
+        hass.states.async_set("device_tracker.boat", "not_home", {"latitude": latitude, "longitude": longitude})
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        tracker.async_update_subscription()
+        for step in range(6):
+            # Alternating between zones near the boundary
+            move(*(KUALA_LUMPUR if step % 2 else GOMBAK))
+            move(KUALA_LUMPUR[0] + 0.001 * step, KUALA_LUMPUR[1])
+            move(*GOMBAK)
+        await hass.async_block_till_done()
+        assert entry.data[CONF_ZONE] == "SGR01"
+
+        for step in range(GEO_ZONE_CONFIRMATIONS):
+            move(KUALA_LUMPUR[0] + 0.001 * step, KUALA_LUMPUR[1])
+            # Repeating a fix (e.g. a battery update) does not count twice
+            move(KUALA_LUMPUR[0] + 0.001 * step, KUALA_LUMPUR[1])
+            await hass.async_block_till_done()
+            assert reload.call_count == (1 if step == GEO_ZONE_CONFIRMATIONS - 1 else 0)
+
+    assert entry.data[CONF_ZONE] == "WLY01"
+    assert entry.title == "Solat Sync MY (WLY01)"
+    tracker.async_stop()
@@ -0,0 +1,49 @@
+"""Tests for the local Hijri calendar."""
+from datetime import date
+
+from custom_components.solatsyncmy.hijri import (
+    HijriCalendar,
+    HijriDate,
+    build_hijri_info,
+    compute_correction,
+    gregorian_to_hijri,
+    hijri_to_gregorian,
+)
+
+
+def test_known_dates() -> None:
+    """The arithmetic calendar matches published dates and round-trips."""
+    assert gregorian_to_hijri(date(2026, 2, 18)) == HijriDate(1447, 9, 1)
+    assert str(gregorian_to_hijri(date(2026, 2, 18))) == "1 Ramadan 1447"
+    assert gregorian_to_hijri(date(2025, 3, 1)) == HijriDate(1446, 9, 1)
+    assert hijri_to_gregorian(HijriDate(1447, 9, 1)) == date(2026, 2, 18)
+
+
+def test_api_correction() -> None:
+    """A one-day disagreement with JAKIM is corrected; implausible values are ignored."""
+    # Malaysia began Ramadan 1445 on 12 March 2024, a day after the tabular calendar
+    correction = compute_correction(date(2024, 3, 12), "1445-09-01")
+    assert correction == -1
+    assert gregorian_to_hijri(date(2024, 3, 12), correction) == HijriDate(1445, 9, 1)
+    assert compute_correction(date(2024, 3, 12), "1445-10-01") == 0
+    assert compute_correction(date(2024, 3, 12), None) == 0
+
+
+def test_calendar_events() -> None:
+    """Events are found on their day and listed ahead of it."""
+    calendar = HijriCalendar(date(2026, 1, 1), correction=0)
+    assert calendar.to_gregorian(HijriDate(1447, 9, 1)) == date(2026, 2, 18)
+
+    info = build_hijri_info(calendar, date(2026, 2, 18), "1447-09-01")
+    assert info["is_ramadan"]
+    assert info["iso"] == "1447-09-01"
+    assert info["events_today"] == ["awal_ramadan"]
+    upcoming = info["upcoming_events"]
+    assert [event["key"] for event in upcoming[:3]] == ["awal_ramadan", "nuzul_quran", "hari_raya_aidilfitri"]
+    assert upcoming[1] == {
+        "key": "nuzul_quran",
+        "name": "Nuzul Al-Quran",
+        "date": "2026-03-06",
+        "hijri_date": "17 Ramadan 1447",
+        "days_until": 16,
+    }
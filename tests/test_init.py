@@ -0,0 +1,158 @@
+"""Tests for Solat Sync MY setup."""
+from datetime import timedelta
+import time
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.solatsyncmy.const import (
+    CONF_API_BASE_URL,
+    CONF_ZONE,
+    DATA_TIMETABLE_PACK,
+    DOMAIN,
+    TIMETABLE_SAVE_DELAY,
+)
+from custom_components.solatsyncmy.pack import SOURCE_API, TimetablePack, write_pack
+from tests.synthetic import make_day, make_month
+
+
+def _entry(hass, fake_api) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ZONE: "SGR01"},
+        options={CONF_API_BASE_URL: fake_api.base_url},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_setup_saves_timetable(hass, hass_storage, fake_api) -> None:
+    """Fetched months are written to the entry's timetable store."""
+    entry = _entry(hass, fake_api)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=TIMETABLE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    months = hass_storage[f"{DOMAIN}.{entry.entry_id}.timetable"]["data"]["months"]
+    today = dt_util.now().date()
+    assert {"zone": "SGR01", "year": today.year, "month": today.month} in [
+        {key: month[key] for key in ("zone", "year", "month")} for month in months
+    ]
+    timings = hass.data[DOMAIN][entry.entry_id].setup_timings.as_dict()
+    assert {"cache_load", "first_refresh", "platforms", "zone_tracker", "total"} <= set(timings)
+
+
+async def test_setup_from_cache_without_network(hass, hass_storage, fake_api) -> None:
+    """A stored timetable brings entities up even when the API is failing."""
+    fake_api.config.error_rate = 1.0
+    entry = _entry(hass, fake_api)
+    today = dt_util.now().date()
+    tomorrow = today + timedelta(days=1)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.timetable"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.timetable",
+        "data": {
+            "months": [
+                make_month("SGR01", day.year, day.month) | {"month": day.month}
+                for day in {today, tomorrow}
+            ]
+        },
+    }
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.waktu_solat_subuh").state != "unavailable"
+    assert fake_api.config.requests["solat/SGR01"] == 1  # background revalidation only
+
+
+async def test_remove_entry_deletes_timetable(hass, hass_storage, setup_entry) -> None:
+    """Removing the entry deletes its stored timetable."""
+    key = f"{DOMAIN}.{setup_entry.entry_id}.timetable"
+    hass_storage[key] = {"version": 1, "key": key, "data": {"months": []}}
+
+    await hass.config_entries.async_remove(setup_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert key not in hass_storage
+
+
+async def test_setup_from_pack_without_network(hass, fake_api, tmp_path) -> None:
+    """A fresh install comes up from the timetable pack and reconciles with the API later."""
+    today = dt_util.now().date()
+    path = str(tmp_path / "timetable.pack")
+    write_pack(path, ["SGR01"], today.year, 2, make_day, SOURCE_API, 0)
+    hass.data[DATA_TIMETABLE_PACK] = TimetablePack(path)
+    fake_api.config.error_rate = 1.0
+    entry = _entry(hass, fake_api)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.waktu_solat_subuh").state != "unavailable"
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert f"SGR01/{today.year}-{today.month:02d}" in coordinator.pack_summary()["serving"]
+
+    fake_api.config.error_rate = 0.0
+    await coordinator.async_revalidate_cache()
+
+    assert coordinator.pack_summary()["serving"] == []
+    assert {month["source"] for month in coordinator.cache_summary()} == {"api"}
+
+
+async def test_setup_from_pack_does_not_wait_for_api(hass, fake_api, tmp_path) -> None:
+    """Setup from the pack returns before the API answers; each month is fetched once."""
+    today = dt_util.now().date()
+    path = str(tmp_path / "timetable.pack")
+    write_pack(path, ["SGR01"], today.year, 12, make_day, SOURCE_API, 0)
+    hass.data[DATA_TIMETABLE_PACK] = TimetablePack(path)
+    fake_api.config.latency = 1.0
+    entry = _entry(hass, fake_api)
+
+    started = time.monotonic()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert time.monotonic() - started < fake_api.config.latency
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    months = len(coordinator.pack_summary()["serving"])
+    assert months >= 1
+
+    # A refresh while the revalidation is in flight shares its requests
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert fake_api.config.requests["solat/SGR01"] == months
+    assert coordinator.pack_summary()["serving"] == []
+
+
+async def test_pack_months_retried_until_api_responds(hass, fake_api, tmp_path) -> None:
+    """A failed revalidation at setup is retried by the regular refresh."""
+    today = dt_util.now().date()
+    path = str(tmp_path / "timetable.pack")
+
+    def approximate_day(zone, day):
+        # Calculated times a few minutes off the published ones
+        entry = make_day(zone, day)
+        return {**entry, **{prayer: entry[prayer] + 300 for prayer in ("fajr", "dhuhr", "isha")}}
+
+    write_pack(path, ["SGR01"], today.year, 2, approximate_day, SOURCE_API, 0)
+    hass.data[DATA_TIMETABLE_PACK] = TimetablePack(path)
+    fake_api.config.error_rate = 1.0
+    entry = _entry(hass, fake_api)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await coordinator.async_refresh()
+    assert f"SGR01/{today.year}-{today.month:02d}" in coordinator.pack_summary()["serving"]
+
+    fake_api.config.error_rate = 0.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.pack_summary()["serving"] == []
+    published = make_day("SGR01", today)["fajr"]
+    assert coordinator.data["prayer_times"]["fajr"] == dt_util.as_local(dt_util.utc_from_timestamp(published))
@@ -0,0 +1,70 @@
+"""Tests for media player snapshot and restore around azan."""
+import asyncio
+
+from homeassistant.core import ServiceCall
+
+from custom_components.solatsyncmy import _async_queue_azan
+from custom_components.solatsyncmy.media_state import async_get_media_state
+
+PLAYER = "media_player.living_room"
+MUSIC = {"volume_level": 0.3, "source": "Spotify", "media_content_id": "spotify:track:1", "media_content_type": "music"}
+
+
+def _fake_player(hass) -> list:
+    """Register media player services that update the player's state; return the calls."""
+    calls = []
+
+    async def handle(call: ServiceCall) -> None:
+        calls.append((call.service, dict(call.data)))
+        state = hass.states.get(PLAYER)
+        attributes = dict(state.attributes)
+        if call.service == "volume_set":
+            attributes["volume_level"] = call.data["volume_level"]
+        elif call.service == "play_media":
+            attributes["media_content_id"] = call.data["media_content_id"]
+            attributes["media_content_type"] = call.data["media_content_type"]
+        hass.states.async_set(PLAYER, "playing", attributes)
+
+    for service in ("volume_set", "play_media", "select_source"):
+        hass.services.async_register("media_player", service, handle)
+    return calls
+
+
+async def test_music_is_restored_after_azan(hass, tmp_path) -> None:
+    """Volume and the interrupted track come back as soon as the azan stops."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan.mp3").write_bytes(b"\xff" * 4096)
+    hass.states.async_set(PLAYER, "playing", MUSIC)
+    calls = _fake_player(hass)
+
+    playback = hass.async_create_task(_async_queue_azan(hass, "asr", PLAYER, 0.7))
+    while not any(service == "play_media" for service, _ in calls):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0)
+    assert hass.states.get(PLAYER).attributes["media_content_id"].startswith("/api/solatsyncmy/audio/user/azan.mp3?v=")
+
+    # The azan ends
+    hass.states.async_set(PLAYER, "idle", hass.states.get(PLAYER).attributes)
+    assert await playback is True
+
+    restore = calls[-2:]
+    assert restore[0] == ("volume_set", {"entity_id": PLAYER, "volume_level": 0.3})
+    assert restore[1][0] == "play_media"
+    assert restore[1][1]["media_content_id"] == "spotify:track:1"
+    summary = async_get_media_state(hass).as_dict()
+    assert summary["held"] == {}
+    assert summary["restored"] == 1
+    assert summary["restore_ms"]["samples"] == 1
+
+
+async def test_snapshot_is_reused_until_restored(hass) -> None:
+    """A second capture before restoring keeps the pre-azan snapshot."""
+    hass.states.async_set(PLAYER, "playing", MUSIC)
+    media_state = async_get_media_state(hass)
+
+    first = media_state.capture(PLAYER)
+    hass.states.async_set(PLAYER, "playing", {**MUSIC, "media_content_id": "/api/solatsyncmy/audio/user/azan.mp3"})
+
+    assert media_state.capture(PLAYER) is first
+    assert media_state.stats["reused"] == 1
@@ -0,0 +1,43 @@
+"""Tests for the bundled timetable pack."""
+from custom_components.solatsyncmy.pack import PACK_FILE, SOURCE_API, TimetablePack, write_pack
+from custom_components.solatsyncmy.zones import BUNDLED_ZONES
+from tests.synthetic import make_day, make_month
+
+
+def test_pack_round_trips_api_months(tmp_path) -> None:
+    """Months read from a pack match the API days it was built from."""
+    path = str(tmp_path / "timetable.pack")
+    write_pack(path, ["SGR01", "JHR01"], 2024, 2, make_day, SOURCE_API, 0)
+    pack = TimetablePack(path)
+
+    assert pack.covers("JHR01", 2025)
+    assert not pack.covers("JHR01", 2026)
+    assert not pack.covers("WLY01", 2024)
+    assert pack.month("SGR01", 2024, 2)["prayers"] == make_month("SGR01", 2024, 2)["prayers"]
+    assert pack.month("JHR01", 2025, 12)["prayers"] == make_month("JHR01", 2025, 12)["prayers"]
+    assert pack.month("SGR01", 2026, 1) is None
+    pack.close()
+
+
+def test_pack_skips_days_without_data(tmp_path) -> None:
+    """Days the builder had no data for are left out of the month."""
+    path = str(tmp_path / "timetable.pack")
+    write_pack(
+        path, ["SGR01"], 2024, 1,
+        lambda zone, day: make_day(zone, day) if day.day <= 10 else None, SOURCE_API, 0,
+    )
+    pack = TimetablePack(path)
+
+    assert [entry["day"] for entry in pack.month("SGR01", 2024, 5)["prayers"]] == list(range(1, 11))
+    pack.close()
+
+
+def test_bundled_pack_covers_every_zone() -> None:
+    """The shipped pack holds every bundled zone with plausible times."""
+    pack = TimetablePack(PACK_FILE)
+
+    assert set(pack.zones) == {code for code, _ in BUNDLED_ZONES}
+    assert pack.year_count >= 2
+    for entry in pack.month("SGR01", pack.first_year, 6)["prayers"]:
+        assert entry["fajr"] < entry["syuruk"] < entry["dhuhr"] < entry["asr"] < entry["maghrib"] < entry["isha"]
+    pack.close()
@@ -0,0 +1,75 @@
+"""Tests for the playback arbiter."""
+import asyncio
+
+from custom_components.solatsyncmy.const import (
+    PLAYBACK_PRIORITY_MANUAL,
+    PLAYBACK_PRIORITY_SCHEDULED,
+    PLAYBACK_PRIORITY_TEST,
+)
+from custom_components.solatsyncmy.playback import async_get_arbiter
+
+PLAYER = "media_player.speaker"
+
+
+async def test_identical_jobs_share_one_playback(hass) -> None:
+    """Entries in the same zone firing together play the azan once."""
+    arbiter = async_get_arbiter(hass)
+    release = asyncio.Event()
+    runs = []
+
+    async def play() -> None:
+        runs.append("fajr")
+        await release.wait()
+
+    key = ("fajr", "2026-10-19T05:50:00+08:00")
+    first = hass.async_create_task(arbiter.async_play(PLAYER, key, PLAYBACK_PRIORITY_SCHEDULED, play))
+    second = hass.async_create_task(arbiter.async_play(PLAYER, key, PLAYBACK_PRIORITY_SCHEDULED, play))
+    await asyncio.sleep(0)
+    assert arbiter.queue_depth(PLAYER) == 1
+    release.set()
+
+    assert await first is True
+    assert await second is True
+    assert runs == ["fajr"]
+    assert arbiter.stats["deduplicated"] == 1
+    assert arbiter.as_dict()["wait_ms"]["samples"] == 1
+
+
+async def test_higher_priority_jobs_supersede_lower_ones(hass) -> None:
+    """A scheduled azan interrupts a running test; a manual play drops a queued test."""
+    arbiter = async_get_arbiter(hass)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    order = []
+
+    async def test_audio() -> None:
+        order.append("test")
+        started.set()
+        await asyncio.Event().wait()
+
+    async def maghrib() -> None:
+        order.append("maghrib")
+        await release.wait()
+
+    async def asr() -> None:
+        order.append("asr")
+
+    test = hass.async_create_task(arbiter.async_play(PLAYER, ("test", None), PLAYBACK_PRIORITY_TEST, test_audio))
+    await started.wait()
+    scheduled = hass.async_create_task(
+        arbiter.async_play(PLAYER, ("maghrib", "2026-10-19T19:10:00+08:00"), PLAYBACK_PRIORITY_SCHEDULED, maghrib)
+    )
+    assert await test is False
+
+    queued_test = hass.async_create_task(arbiter.async_play(PLAYER, ("test", None), PLAYBACK_PRIORITY_TEST, test_audio))
+    await asyncio.sleep(0)
+    manual = hass.async_create_task(arbiter.async_play(PLAYER, ("asr", None), PLAYBACK_PRIORITY_MANUAL, asr))
+    assert await queued_test is False
+    assert arbiter.queue_depth(PLAYER) == 2
+    release.set()
+
+    assert await scheduled is True
+    assert await manual is True
+    assert order == ["test", "maghrib", "asr"]
+    assert arbiter.stats["superseded"] == 2
+    assert arbiter.as_dict()["queue_depth"] == {}
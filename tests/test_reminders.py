@@ -0,0 +1,137 @@
+"""Tests for pre-rendered prayer reminders."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import ServiceCall
+from homeassistant.util import dt as dt_util
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.audio_view import audio_url
+from custom_components.solatsyncmy.const import (
+    CONF_MEDIA_PLAYER,
+    CONF_REMINDER_MINUTES,
+    CONF_REMINDER_TTS_ENGINE,
+    DOMAIN,
+    SCHEDULE_KIND_PRAYER,
+    SCHEDULE_KIND_REMINDER,
+)
+from custom_components.solatsyncmy.reminders import ReminderAudioCache, reminder_message
+from custom_components.solatsyncmy.scheduler import ScheduleEntry
+
+AUDIO = b"\xff\xfb" * 2048
+
+
+def _stub_engine(renders: list):
+    """Return a TTS render function that records what it was asked to say."""
+
+    async def render(hass, message, engine, language):
+        renders.append((message, engine, language))
+        await asyncio.sleep(0)
+        return "mp3", AUDIO
+
+    return render
+
+
+async def test_reminders_rendered_once_per_text_and_engine(hass, tmp_path) -> None:
+    """Concurrent requests share one render; files survive a restart."""
+    hass.config.config_dir = str(tmp_path)
+    renders = []
+    cache = ReminderAudioCache(hass, _stub_engine(renders))
+    message = reminder_message("maghrib", 10)
+    assert message == "Lagi 10 minit waktu Maghrib"
+
+    first, second = await asyncio.gather(
+        cache.async_render(message, "tts.stub", "ms"), cache.async_render(message, "tts.stub", "ms")
+    )
+    assert first == second
+    assert open(first, "rb").read() == AUDIO
+    assert audio_url(hass, first).startswith("/api/solatsyncmy/audio/tts/")
+    assert cache.get(message, "tts.stub", "ms") == first
+
+    await cache.async_render(message, "tts.other", "ms")
+    assert renders == [(message, "tts.stub", "ms"), (message, "tts.other", "ms")]
+
+    restarted = ReminderAudioCache(hass, _stub_engine(renders))
+    await restarted.async_load()
+    assert restarted.get(message, "tts.stub", "ms") == first
+    assert len(renders) == 2
+
+
+async def test_failed_render_returns_none(hass, tmp_path) -> None:
+    """An engine error is reported as a failure instead of raising."""
+    hass.config.config_dir = str(tmp_path)
+
+    async def broken(hass, message, engine, language):
+        raise RuntimeError("engine offline")
+
+    cache = ReminderAudioCache(hass, broken)
+
+    assert await cache.async_render("Lagi 5 minit waktu Asar", "tts.stub", "ms") is None
+    assert cache.stats["failures"] == 1
+
+
+async def test_reminders_scheduled_before_azan(hass, setup_entry) -> None:
+    """Enabling reminders puts an entry on the timeline ahead of each azan."""
+    coordinator = hass.data[DOMAIN][setup_entry.entry_id]
+    assert not [item for item in coordinator.scheduler.upcoming if item.kind == SCHEDULE_KIND_REMINDER]
+
+    hass.config_entries.async_update_entry(setup_entry, options={**setup_entry.options, CONF_REMINDER_MINUTES: 10})
+    await hass.async_block_till_done()
+
+    upcoming = coordinator.scheduler.upcoming
+    prayers = {(item.zone, item.name, item.timestamp) for item in upcoming if item.kind == SCHEDULE_KIND_PRAYER}
+    reminders = [item for item in upcoming if item.kind == SCHEDULE_KIND_REMINDER]
+    assert reminders
+    assert all(item.name != "syuruk" for item in reminders)
+    assert all((item.zone, item.name, item.timestamp + 600) in prayers for item in reminders)
+
+
+async def test_rendered_reminder_plays_without_tts(hass, tmp_path) -> None:
+    """At reminder time the cached file is played directly."""
+    hass.config.config_dir = str(tmp_path)
+    cache = ReminderAudioCache(hass, _stub_engine([]))
+    url = audio_url(hass, await cache.async_render(reminder_message("isha", 10), "tts.stub", "ms"))
+    hass.states.async_set("media_player.hall", "idle")
+    hass.services.async_register("media_player", "volume_set", lambda call: None)
+
+    async def play_media(call: ServiceCall) -> None:
+        hass.states.async_set("media_player.hall", "playing", {"media_content_id": call.data["media_content_id"]})
+
+    hass.services.async_register("media_player", "play_media", play_media)
+
+    trace = await _play_azan_file(hass, "reminder", "media_player.hall", 0.5, audio_file=url)
+
+    assert trace.result == "playing"
+    assert trace.url == url
+
+
+async def test_reminders_queued_per_prayer_and_time(hass, tmp_path, setup_entry) -> None:
+    """Each reminder is its own playback, keyed and traced by its prayer and time."""
+    hass.config.config_dir = str(tmp_path)
+    hass.states.async_set("media_player.hall", "idle")
+    hass.config_entries.async_update_entry(
+        setup_entry,
+        options={
+            **setup_entry.options,
+            CONF_REMINDER_MINUTES: 10,
+            CONF_REMINDER_TTS_ENGINE: "tts.stub",
+            CONF_MEDIA_PLAYER: "media_player.hall",
+        },
+    )
+    await hass.async_block_till_done()
+    cache = ReminderAudioCache(hass, _stub_engine([]))
+    switch = hass.data["entity_components"]["switch"].get_entity("switch.waktu_solat_azan_automation")
+    now = dt_util.utcnow()
+    reminders = [
+        ScheduleEntry(int(now.timestamp()) + 60, "SGR01", SCHEDULE_KIND_REMINDER, "maghrib"),
+        ScheduleEntry(int(now.timestamp()) + 3600, "SGR01", SCHEDULE_KIND_REMINDER, "isha"),
+    ]
+
+    with patch(
+        "custom_components.solatsyncmy.reminders.async_get_reminder_cache", AsyncMock(return_value=cache)
+    ), patch("custom_components.solatsyncmy._async_queue_azan", AsyncMock(return_value=True)) as queue:
+        for reminder in reminders:
+            await switch._reminder_time_callback(reminder, now)
+
+    calls = [(call.args[1], call.args[5]) for call in queue.call_args_list]
+    assert calls == [("reminder_maghrib", reminders[0].when), ("reminder_isha", reminders[1].when)]
@@ -0,0 +1,94 @@
+"""Tests for per-prayer azan routing."""
+from datetime import datetime
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.components.diagnostics import REDACTED
+
+from custom_components.solatsyncmy import _get_audio_urls
+from custom_components.solatsyncmy.const import AUDIO_SOURCE_BUNDLED, CONF_ROUTING_RULES, DOMAIN
+from custom_components.solatsyncmy.diagnostics import async_get_config_entry_diagnostics
+from custom_components.solatsyncmy.routing import RULES_SCHEMA, Route, compile_routing
+
+DEFAULT = Route(("media_player.kitchen",), 0.7)
+RULES = [
+    {"prayers": ["Subuh"], "media_players": "media_player.bedroom", "volume": 0.3},
+    {"prayers": ["dhuhr"], "weekdays": ["friday"], "audio_file": "azan_jumaat.mp3"},
+    # Late maghrib and isha go to the soundbar, wrapping past midnight
+    {"prayers": ["maghrib", "isha"], "after": "19:30", "before": "01:00",
+     "media_players": ["media_player.soundbar"], "volume": 0.8},
+    {"prayers": ["isha"], "media_players": ["media_player.hall"]},
+]
+
+
+def _at(day: int, hour: int, minute: int) -> datetime:
+    """Return a local time in the week starting Monday 2026-10-19."""
+    return datetime(2026, 10, 19 + day, hour, minute)
+
+
+def test_first_matching_rule_wins() -> None:
+    """Rules pick players, volume and file by prayer, weekday and time of day."""
+    table = compile_routing(RULES, DEFAULT)
+
+    assert table.resolve("fajr", _at(0, 5, 50)) == Route(("media_player.bedroom",), 0.3, None, 0)
+    assert table.resolve("dhuhr", _at(4, 13, 5)) == Route(DEFAULT.media_players, 0.7, "azan_jumaat.mp3", 1)
+    assert table.resolve("dhuhr", _at(3, 13, 5)) == DEFAULT
+    assert table.resolve("asr", _at(4, 16, 20)) == DEFAULT
+    assert table.resolve("maghrib", _at(0, 19, 10)) == DEFAULT
+    assert table.resolve("maghrib", _at(0, 19, 30)).media_players == ("media_player.soundbar",)
+    assert table.resolve("isha", _at(0, 20, 25)).rule == 2
+    assert table.resolve("isha", _at(0, 0, 59)).rule == 2
+    assert table.resolve("isha", _at(0, 1, 0)).rule == 3
+
+
+def test_invalid_rules_are_rejected() -> None:
+    """The options flow refuses rules the table would skip; compiling drops them."""
+    for rule in (
+        {"prayers": ["syuruk"]},
+        {"weekdays": ["someday"]},
+        {"after": "25:00"},
+        {"media_players": ["switch.kettle"]},
+        {"volume": 2},
+        {"audio_file": "../secrets.yaml"},
+    ):
+        with pytest.raises(vol.Invalid):
+            RULES_SCHEMA([rule])
+
+    table = compile_routing([{"volume": 2}, {"volume": 0.5}], DEFAULT)
+    assert table.resolve("asr", _at(2, 16, 20)) == Route(DEFAULT.media_players, 0.5, None, 0)
+
+
+async def test_routed_audio_file_replaces_source(hass, tmp_path) -> None:
+    """A rule's file is played when it exists; otherwise the audio source decides."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www" / "solatsyncmy").mkdir(parents=True)
+    (tmp_path / "www" / "solatsyncmy" / "azan_jumaat.mp3").write_bytes(b"\xff" * 4096)
+
+    routed = await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED, audio_file="azan_jumaat.mp3")
+    missing = await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED, audio_file="missing.mp3")
+    remote = await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED, audio_file="https://cdn.example/a.mp3")
+
+    assert len(routed) == 1 and routed[0].startswith("/api/solatsyncmy/audio/user/azan_jumaat.mp3?v=")
+    assert missing == await _get_audio_urls(hass, "dhuhr", AUDIO_SOURCE_BUNDLED)
+    assert remote == ["https://cdn.example/a.mp3"]
+
+
+async def test_routing_follows_options(hass, setup_entry) -> None:
+    """The table is recompiled after an options change and shown in diagnostics."""
+    coordinator = hass.data[DOMAIN][setup_entry.entry_id]
+    assert coordinator.routing is coordinator.routing
+    hass.config_entries.async_update_entry(
+        setup_entry,
+        options={
+            **setup_entry.options,
+            CONF_ROUTING_RULES: [{"media_players": ["media_player.hall"], "audio_file": "https://cdn.example/a.mp3"}],
+        },
+    )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, setup_entry)
+
+    assert diagnostics["routing"]["rules"][0]["audio_file"] == REDACTED
+    upcoming = diagnostics["routing"]["upcoming"]
+    assert upcoming
+    assert all(route["media_players"] == ("media_player.hall",) and route["rule"] == 0 for route in upcoming)
@@ -0,0 +1,50 @@
+"""Tests for azan latency telemetry."""
+from datetime import timedelta
+
+from homeassistant.core import ServiceCall
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events, async_mock_service
+
+from custom_components.solatsyncmy import _play_azan_file
+from custom_components.solatsyncmy.const import EVENT_AZAN_LATENCY
+from custom_components.solatsyncmy.telemetry import AzanLatencyStats, PlaybackTrace
+
+
+def test_latency_percentiles() -> None:
+    """Percentiles use the nearest rank over the rolling window."""
+    stats = AzanLatencyStats(window=20)
+    scheduled = dt_util.utcnow()
+    for latency in range(1, 101):
+        trace = PlaybackTrace("fajr", "media_player.speaker", scheduled=scheduled)
+        trace.latency_ms["playing"] = float(latency)
+        stats.record(trace)
+
+    summary = stats.summary("playing")
+
+    assert summary == {"samples": 20, "p50": 90.0, "p95": 99.0, "max": 100.0, "last": 100.0}
+    assert stats.summary("fired")["samples"] == 0
+
+
+async def test_scheduled_playback_reports_latency(hass, setup_entry) -> None:
+    """A scheduled azan records each stage and updates the latency sensors."""
+    hass.states.async_set("media_player.speaker", "idle")
+    async_mock_service(hass, "media_player", "volume_set")
+
+    async def play_media(call: ServiceCall) -> None:
+        hass.states.async_set("media_player.speaker", "playing")
+
+    hass.services.async_register("media_player", "play_media", play_media)
+    events = async_capture_events(hass, EVENT_AZAN_LATENCY)
+    scheduled = dt_util.utcnow() - timedelta(milliseconds=50)
+
+    await _play_azan_file(
+        hass, "fajr", "media_player.speaker", 0.5, setup_entry, scheduled, dt_util.utcnow()
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["result"] == "playing"
+    assert 50 <= events[0].data["fired_ms"] <= events[0].data["dispatched_ms"] <= events[0].data["playing_ms"]
+    state = hass.states.get("sensor.waktu_solat_azan_latency_playing")
+    assert float(state.state) == events[0].data["playing_ms"]
+    assert state.attributes["samples"] == 1
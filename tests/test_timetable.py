@@ -0,0 +1,81 @@
+"""Tests for the compact timetable."""
+import copy
+from datetime import date
+
+from custom_components.solatsyncmy.derived import compute_derived_times
+from custom_components.solatsyncmy.timetable import MonthView, ZoneYearTable
+from tests.synthetic import make_month
+
+
+def test_table_round_trips_api_days() -> None:
+    """Days read back from the table match the API entries and derived times."""
+    month = make_month("SGR01", 2024, 2)
+    day_index = {entry["day"]: entry for entry in month["prayers"]}
+    table = ZoneYearTable("SGR01", 2024)
+    assert table.ingest_month(2, month["prayers"]) == []
+
+    view = MonthView(table, 2)
+    assert list(view) == list(range(1, 30))
+    assert dict(view) == day_index
+    assert dict(MonthView(table, 2, derived=True)) == compute_derived_times(day_index)
+    assert table.row(3, 1) is None
+    assert table.day_dict(2, 30) is None
+
+
+def test_table_keeps_missing_days_and_prayers_missing() -> None:
+    """Days or prayers the API omits are not invented."""
+    prayers = make_month("SGR01", 2024, 3)["prayers"][:10]
+    del prayers[4]["isha"]
+    table = ZoneYearTable("SGR01", 2024)
+    table.ingest_month(3, prayers)
+
+    assert len(MonthView(table, 3)) == 10
+    assert "isha" not in table.day_dict(3, 5)
+    assert table.day_dict(3, 11) is None
+
+    # Re-ingesting a month replaces it
+    table.ingest_month(3, prayers[:2])
+    assert table.month_days(3) == [1, 2]
+    assert table.hijri(3, 1) == prayers[0]["hijri"]
+
+
+def test_reingest_reports_only_changed_cells() -> None:
+    """Re-ingesting a corrected month returns the changed cells with old and new values."""
+    prayers = make_month("SGR01", 2024, 3)["prayers"]
+    table = ZoneYearTable("SGR01", 2024)
+    table.ingest_month(3, prayers)
+
+    assert table.ingest_month(3, prayers) == []
+
+    corrected = copy.deepcopy(prayers)
+    corrected[9]["dhuhr"] += 120
+    corrected[19]["hijri"] = "1445-09-11"
+    changes = table.ingest_month(3, corrected)
+
+    assert [(change.day, change.name) for change in changes] == [
+        (date(2024, 3, 10), "dhuhr"),
+        (date(2024, 3, 20), "hijri"),
+    ]
+    assert changes[0].old == prayers[9]["dhuhr"]
+    assert changes[0].new == prayers[9]["dhuhr"] + 120
+    assert changes[1].old == prayers[19]["hijri"]
+
+
+def test_last_night_uses_the_next_months_subuh() -> None:
+    """The last day's night ends at the next month's first Subuh, whichever month comes first."""
+    march = make_month("SGR01", 2024, 3)["prayers"]
+    april_fajr = march[-1]["fajr"] + 86400 + 120
+    last = march[-1]
+    midnight = last["maghrib"] + (april_fajr - last["maghrib"]) // 2
+
+    table = ZoneYearTable("SGR01", 2024)
+    table.ingest_month(3, march, next_fajr=april_fajr)
+    assert table.derived_dict(3, 31)["midnight"] == midnight
+
+    table = ZoneYearTable("SGR01", 2024)
+    table.ingest_month(3, march)
+    changes = table.relink_last_day(3, april_fajr)
+    assert {change.name for change in changes} == {"midnight", "last_third"}
+    assert all(change.day == date(2024, 3, 31) for change in changes)
+    assert table.derived_dict(3, 31)["midnight"] == midnight
+    assert table.relink_last_day(3, april_fajr) == []
@@ -0,0 +1,84 @@
+"""Tests for the zone catalogue and zone selection in the config flow."""
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solatsyncmy.const import (
+    CONF_API_BASE_URL,
+    CONF_ZONE,
+    CONF_ZONES,
+    DATA_ZONE_CATALOGUE,
+    DOMAIN,
+    ZONE_CATALOGUE_RETRY,
+    ZONE_CATALOGUE_TTL,
+)
+from custom_components.solatsyncmy.zones import BUNDLED_ZONES, async_get_zone_catalogue, bundled_catalogue
+
+
+def test_search_matches_word_prefixes() -> None:
+    """Every query word must prefix a word of the code, state or districts."""
+    catalogue = bundled_catalogue()
+
+    assert [zone.code for zone in catalogue.search("ipoh")] == ["PRK02"]
+    assert [zone.code for zone in catalogue.search("kuala lump")] == ["WLY01"]
+    assert [zone.code for zone in catalogue.search("sgr")] == ["SGR01", "SGR02", "SGR03"]
+    assert len(catalogue.search("kuala", limit=3)) == 3
+    assert catalogue.search("atlantis") == []
+
+
+async def test_catalogue_cached_until_ttl(hass, fake_api, freezer) -> None:
+    """The zone list is fetched from the configured API once per TTL."""
+    MockConfigEntry(
+        domain=DOMAIN, data={CONF_ZONE: "SGR01"}, options={CONF_API_BASE_URL: fake_api.base_url}
+    ).add_to_hass(hass)
+
+    catalogue = await async_get_zone_catalogue(hass)
+    assert catalogue.source == "api"
+    assert len(catalogue) == len(BUNDLED_ZONES)
+    assert await async_get_zone_catalogue(hass) is catalogue
+    assert fake_api.config.requests["zones"] == 1
+
+    freezer.tick(ZONE_CATALOGUE_TTL + 1)
+    refreshed = await async_get_zone_catalogue(hass)
+    assert refreshed is not catalogue
+    assert fake_api.config.requests["zones"] == 2
+
+
+async def test_failed_refresh_falls_back_and_backs_off(hass, fake_api, freezer) -> None:
+    """Without the API the bundled list is used, and the API is not retried for a while."""
+    MockConfigEntry(
+        domain=DOMAIN, data={CONF_ZONE: "SGR01"}, options={CONF_API_BASE_URL: fake_api.base_url}
+    ).add_to_hass(hass)
+    fake_api.config.error_rate = 1.0
+
+    catalogue = await async_get_zone_catalogue(hass)
+    assert catalogue.source == "bundled"
+    assert "WLY01" in catalogue
+    await async_get_zone_catalogue(hass)
+    assert fake_api.config.requests["zones"] == 1
+
+    fake_api.config.error_rate = 0.0
+    freezer.tick(ZONE_CATALOGUE_RETRY + 1)
+    assert (await async_get_zone_catalogue(hass)).source == "api"
+    assert fake_api.config.requests["zones"] == 2
+
+
+async def test_config_flow_resolves_typed_places(hass) -> None:
+    """A typed district name selects its zone; a name several zones share is rejected."""
+    catalogue = bundled_catalogue()
+    catalogue.refresh_at = float("inf")
+    hass.data[DATA_ZONE_CATALOGUE] = catalogue
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {CONF_ZONE: "kuala"})
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_ZONE: "ambiguous_zone"}
+
+    with patch("custom_components.solatsyncmy.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_ZONE: "Ipoh", CONF_ZONES: ["kuala lumpur", "PRK02"]}
+        )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_ZONE: "PRK02", CONF_ZONES: ["WLY01"]}
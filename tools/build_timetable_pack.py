@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Build the bundled timetable pack for Solat Sync MY
+
+Writes custom_components/solatsyncmy/timetable.pack with every JAKIM zone for
+the given years, either from the waktusolat.app API or from a local
+astronomical calculation (JAKIM parameters: Subuh 20°, Isyak 18°, Asar
+shadow factor 1, 2 minutes ihtiyat) at each zone's reference points.
+
+Calculated times are approximate (typically within 1-2 minutes of JAKIM);
+the integration replaces pack data with API data as soon as it can fetch.
+
+Usage:
+    python tools/build_timetable_pack.py --source calc
+    python tools/build_timetable_pack.py --source api --years 2026 2027
+"""
+
+import argparse
+import asyncio
+import calendar
+import json
+import math
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.solatsyncmy.const import API_BASE_URL, PRAYER_TIMES  # noqa: E402
+from custom_components.solatsyncmy.pack import (  # noqa: E402
+    PACK_FILE,
+    SOURCE_API,
+    SOURCE_CALCULATED,
+    write_pack,
+)
+from custom_components.solatsyncmy.zones import BUNDLED_ZONES  # noqa: E402
+
+BOUNDARIES_FILE = os.path.join(
+    os.path.dirname(PACK_FILE), "zone_boundaries.json"
+)
+
+FAJR_ANGLE = 20.0
+ISHA_ANGLE = 18.0
+HORIZON_ANGLE = 0.833  # Refraction and solar semi-diameter
+ASR_FACTOR = 1
+IHTIYAT_MINUTES = 2
+
+
+def _sun_position(julian_day: float) -> Tuple[float, float]:
+    """Return the sun's declination (degrees) and equation of time (hours)."""
+    days = julian_day - 2451545.0
+    anomaly = math.radians((357.529 + 0.98560028 * days) % 360)
+    mean_longitude = (280.459 + 0.98564736 * days) % 360
+    longitude = math.radians(mean_longitude + 1.915 * math.sin(anomaly) + 0.020 * math.sin(2 * anomaly))
+    obliquity = math.radians(23.439 - 0.00000036 * days)
+    right_ascension = math.degrees(math.atan2(math.cos(obliquity) * math.sin(longitude), math.cos(longitude))) / 15
+    equation = mean_longitude / 15 - right_ascension % 24
+    equation = (equation + 12) % 24 - 12
+    return math.degrees(math.asin(math.sin(obliquity) * math.sin(longitude))), equation
+
+
+def calculate_day(latitude: float, longitude: float, day: date) -> Dict[str, int]:
+    """Return the six prayer times of a day as Unix timestamps."""
+    julian_day = day.toordinal() + 1721424.5 - longitude / 360
+    lat = math.radians(latitude)
+
+    def solar(hour: float) -> Tuple[float, float]:
+        declination, equation = _sun_position(julian_day + hour / 24)
+        return math.radians(declination), 12 - equation
+
+    def hour_angle(angle: float, hour: float) -> Tuple[float, float]:
+        declination, noon = solar(hour)
+        cosine = (-math.sin(math.radians(angle)) - math.sin(declination) * math.sin(lat)) / (
+            math.cos(declination) * math.cos(lat)
+        )
+        return noon, math.degrees(math.acos(max(-1.0, min(1.0, cosine)))) / 15
+
+    def asr_angle(hour: float) -> float:
+        declination, _ = solar(hour)
+        return -math.degrees(math.atan(1 / (ASR_FACTOR + math.tan(abs(lat - declination)))))
+
+    noon, fajr = hour_angle(FAJR_ANGLE, 5)
+    hours = {"fajr": noon - fajr}
+    noon, sunrise = hour_angle(HORIZON_ANGLE, 6)
+    hours["syuruk"] = noon - sunrise
+    hours["dhuhr"] = solar(12)[1]
+    noon, asr = hour_angle(asr_angle(13), 13)
+    hours["asr"] = noon + asr
+    noon, sunset = hour_angle(HORIZON_ANGLE, 18)
+    hours["maghrib"] = noon + sunset
+    noon, isha = hour_angle(ISHA_ANGLE, 18)
+    hours["isha"] = noon + isha
+
+    midnight_utc = calendar.timegm(day.timetuple())
+    times = {}
+    for prayer, hour in hours.items():
+        # Local mean solar hours to UTC seconds, with ihtiyat rounded outward to the minute
+        seconds = midnight_utc + (hour - longitude / 15) * 3600
+        if prayer == "syuruk":
+            times[prayer] = int(math.floor(seconds / 60 - IHTIYAT_MINUTES) * 60)
+        else:
+            times[prayer] = int(math.ceil(seconds / 60 + IHTIYAT_MINUTES) * 60)
+    return times
+
+
+def _zone_points() -> Dict[str, Tuple[float, float]]:
+    """Return each zone's mean reference point."""
+    with open(BOUNDARIES_FILE, encoding="utf-8") as handle:
+        zones = json.load(handle)["zones"]
+    centres = {}
+    for zone, shape in zones.items():
+        points = shape.get("points") or [point for ring in shape.get("polygons", []) for point in ring]
+        if points:
+            centres[zone] = (
+                sum(point[0] for point in points) / len(points),
+                sum(point[1] for point in points) / len(points),
+            )
+    return centres
+
+
+async def _fetch_all(
+    base_url: str, zones: List[str], years: List[int], concurrency: int
+) -> Dict[Tuple[str, int, int], Dict[int, Dict[str, Any]]]:
+    """Fetch every zone-month from the API, keyed by day."""
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(concurrency)
+    months: Dict[Tuple[str, int, int], Dict[int, Dict[str, Any]]] = {}
+
+    async def fetch(session: aiohttp.ClientSession, zone: str, year: int, month: int) -> None:
+        async with semaphore:
+            async with session.get(
+                f"{base_url}/v2/solat/{zone}", params={"year": year, "month": month}
+            ) as response:
+                if response.status != 200:
+                    print(f"⚠️ {zone} {year}-{month:02d}: HTTP {response.status}")
+                    return
+                data = await response.json()
+        months[(zone, year, month)] = {entry["day"]: entry for entry in data.get("prayers", [])}
+
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*(
+            fetch(session, zone, year, month)
+            for zone in zones for year in years for month in range(1, 13)
+        ))
+    return months
+
+
+def main() -> None:
+    """Build the pack from the command line."""
+    this_year = datetime.now(timezone.utc).year
+    parser = argparse.ArgumentParser(description="Build the bundled Solat Sync MY timetable pack")
+    parser.add_argument("--source", choices=["api", "calc"], default="calc")
+    parser.add_argument("--years", type=int, nargs="+", default=[this_year, this_year + 1])
+    parser.add_argument("--api-base-url", default=API_BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", default=PACK_FILE)
+    args = parser.parse_args()
+
+    years = sorted(set(args.years))
+    if years != list(range(years[0], years[-1] + 1)):
+        parser.error("--years must be consecutive")
+    zones = [code for code, _ in BUNDLED_ZONES]
+
+    if args.source == "api":
+        months = asyncio.run(_fetch_all(args.api_base_url.rstrip("/"), zones, years, args.concurrency))
+
+        def get_day(zone: str, day: date) -> Optional[Dict[str, Any]]:
+            return months.get((zone, day.year, day.month), {}).get(day.day)
+
+        source = SOURCE_API
+    else:
+        centres = _zone_points()
+        missing = [zone for zone in zones if zone not in centres]
+        if missing:
+            parser.error(f"No reference points for zones: {', '.join(missing)}")
+
+        def get_day(zone: str, day: date) -> Optional[Dict[str, Any]]:
+            return calculate_day(*centres[zone], day)
+
+        source = SOURCE_CALCULATED
+
+    size = write_pack(args.output, zones, years[0], len(years), get_day, source, int(time.time()))
+    print(
+        f"✅ Wrote {args.output}: {len(zones)} zones, {years[0]}-{years[-1]}, "
+        f"{len(PRAYER_TIMES)} times per day, {size / 1024:.0f} KiB ({args.source})"
+    )
+
+
+if __name__ == "__main__":
+    main()